@@ -0,0 +1,1016 @@
+#!/usr/bin/env python3
+import gc
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, List
+
+
+# Mereni rychlosti datovych struktur.
+#
+# Spusteni bez argumentu provede vsechna mereni, jinak jen ta, jejichz
+# jmena jsou uvedena na prikazove radce, napr.:
+#     python3 benchmarks.py bloom_filter
+#
+# Velikosti vstupu jsou zvoleny tak, aby kazde mereni trvalo nejvyse
+# nekolik sekund. Pro vetsi vstupy upravte parametr 'n' prislusne funkce.
+
+
+def measure(function: Callable[[], object]) -> float:
+    """Vraci dobu behu funkce 'function' v sekundach. Pred merenim
+    uklidi odpad po predchozich merenich, aby neovlivnil vysledek.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def report(name: str, seconds: float, operations: int) -> None:
+    """Vypise dobu behu a propustnost jednoho mereni."""
+    print("  {:<40} {:8.3f} s {:12.0f} op/s"
+          .format(name, seconds, operations / seconds if seconds else 0))
+
+
+def bench_bloom_filter(n: int = 10000) -> None:
+    """Hledani v tabulce a ve strome, kdy 80 % hledanych klicu chybi.
+    Meri se pro n / 10, n a 10 n klicu: filtr se vyplati az pri delsich
+    cestach stromem (viz bloom_filter.py).
+    """
+    import binary_search_tree
+    import hash_table
+    from bloom_filter import BloomFilter
+
+    for count in n // 10, n, 10 * n:
+        print("bloom_filter (n = {}, 80 % neuspesnych hledani)"
+              .format(count))
+        keys = random.sample(range(10 * count), count)
+        present = set(keys)
+        absent = [k for k in range(10 * count) if k not in present]
+        queries = (random.sample(keys, count // 5) +
+                   random.sample(absent, count - count // 5))
+        random.shuffle(queries)
+
+        for bloom in None, BloomFilter(count, 0.01, counting=True):
+            table = hash_table.HashTable()
+            tree = binary_search_tree.BinarySearchTree()
+            hash_table.set_bloom_filter(table, bloom)
+            binary_search_tree.set_bloom_filter(
+                tree,
+                None if bloom is None else BloomFilter(count, 0.01, True))
+            for key in keys:
+                hash_table.insert_hashtable(table, key, key)
+                binary_search_tree.insert(tree, key)
+
+            label = "s filtrem" if bloom is not None else "bez filtru"
+            report("get_hashtable " + label, measure(
+                lambda: [hash_table.get_hashtable(table, k)
+                         for k in queries]), len(queries))
+            report("BST search {} (vyska {})".format(
+                label, binary_search_tree.height(tree)), measure(
+                lambda: [binary_search_tree.search(tree, k)
+                         for k in queries]), len(queries))
+
+
+def bench_int_hash_table(n: int = 200000) -> None:
+    """Hromadne operace IntHashTable proti smycce skalarnich volani."""
+    from array import array
+
+    import int_hash_table
+
+    print("int_hash_table (n = {}, numpy: {})"
+          .format(n, int_hash_table.numpy is not None))
+    keys = array('q', random.sample(range(1 << 40), n))
+    queries = array('q', random.sample(list(keys), n // 2) +
+                    random.sample(range(1 << 40), n - n // 2))
+
+    table = int_hash_table.IntHashTable()
+    report("insert (skalarni smycka)", measure(
+        lambda: [int_hash_table.insert(table, k, k) for k in keys]), n)
+    report("get (skalarni smycka)", measure(
+        lambda: [int_hash_table.get(table, k) for k in queries]), n)
+    report("contains (skalarni smycka)", measure(
+        lambda: [int_hash_table.contains(table, k) for k in queries]), n)
+
+    table = int_hash_table.IntHashTable()
+    report("insert_many", measure(
+        lambda: int_hash_table.insert_many(table, keys, keys)), n)
+    report("get_many", measure(
+        lambda: int_hash_table.get_many(table, queries)), n)
+    report("contains_many", measure(
+        lambda: int_hash_table.contains_many(table, queries)), n)
+    if int_hash_table.numpy is not None:
+        np_queries = int_hash_table.numpy.asarray(queries)
+        report("get_many (numpy vstup)", measure(
+            lambda: int_hash_table.get_many(table, np_queries)), n)
+
+
+def bench_treeify(n: int = 5000) -> None:
+    """Kolizni utok: vsechny klice padnou do jednoho policka tabulky."""
+    import hash_table
+
+    print("treeify (n = {}, vsechny klice v jednom policku)".format(n))
+    keys = [i * hash_table.SIZE for i in range(n)]
+    random.shuffle(keys)
+    queries = keys + [k + hash_table.SIZE * n for k in keys]
+
+    threshold = hash_table.TREEIFY_THRESHOLD
+    for label, limit in ("seznam", n + 1), ("strom", threshold):
+        hash_table.TREEIFY_THRESHOLD = limit
+        table = hash_table.HashTable()
+        report("insert_hashtable ({})".format(label), measure(
+            lambda: [hash_table.insert_hashtable(table, k, k) for k in keys]),
+            n)
+        report("get_hashtable ({})".format(label), measure(
+            lambda: [hash_table.get_hashtable(table, k) for k in queries]),
+            len(queries))
+    hash_table.TREEIFY_THRESHOLD = threshold
+
+
+def bench_bulk_load(n: int = 200000) -> None:
+    """Hromadne naplneni HashTable pri ruznem poctu procesu."""
+    import os
+
+    import hash_table
+    import hash_table_bulk
+
+    print("bulk_load (n = {}, procesoru: {})".format(n, os.cpu_count()))
+    pairs = [(random.randrange(1 << 40), i) for i in range(n)]
+
+    table = hash_table.HashTable()
+    base = measure(lambda: [hash_table.insert_hashtable(table, k, d)
+                            for k, d in pairs])
+    report("insert_hashtable (smycka)", base, n)
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        table = hash_table.HashTable()
+        seconds = measure(lambda: hash_table_bulk.bulk_load(
+            table, pairs, processes))
+        report("bulk_load, {} proc. (zrychleni {:.2f}x)"
+               .format(processes, base / seconds), seconds, n)
+        processes *= 2
+
+
+def bench_snapshot(n: int = 200000) -> None:
+    """Ulozeni a obnoveni struktur snimkem proti modulu pickle."""
+    import io
+    import pickle
+
+    import binary_heap
+    import hash_table
+    import red_black_tree
+    import snapshot
+
+    print("snapshot (n = {})".format(n))
+    keys = random.sample(range(1 << 40), n)
+    tree = red_black_tree.RedBlackTree()
+    table = hash_table.HashTable()
+    for key in keys:
+        red_black_tree.insert(tree, key)
+        hash_table.insert_hashtable(table, key, key)
+    heap = binary_heap.build_heap(list(keys))
+
+    for name, structure, dump, load in (
+            ("RedBlackTree", tree, snapshot.dump_rb_tree,
+             snapshot.load_rb_tree),
+            ("HashTable", table, snapshot.dump_hashtable,
+             snapshot.load_hashtable),
+            ("MinHeap", heap, snapshot.dump_heap, snapshot.load_heap)):
+        stream = io.BytesIO()
+        report(name + " dump", measure(lambda: dump(structure, stream)), n)
+        size = stream.tell()
+        stream.seek(0)
+        report(name + " load ({:.1f} MB)".format(size / 1e6),
+               measure(lambda: load(stream)), n)
+        try:
+            seconds = measure(lambda: pickle.dumps(structure))
+            data = pickle.dumps(structure)
+            report(name + " pickle.dumps", seconds, n)
+            report(name + " pickle.loads ({:.1f} MB)".format(len(data) / 1e6),
+                   measure(lambda: pickle.loads(data)), n)
+        except RecursionError:
+            print("  {:<40} RecursionError".format(name + " pickle"))
+
+
+def bench_shard_router(n: int = 100000, shards: int = 4) -> None:
+    """Propustnost routeru a cena presunu klicu pri zmene poctu shardu."""
+    import shard_router
+
+    print("shard_router (n = {}, shardu: {})".format(n, shards))
+    keys = random.sample(range(1 << 40), n)
+    router = shard_router.ShardRouter()
+    try:
+        for i in range(shards):
+            shard_router.add_shard(router, "shard{}".format(i))
+        report("insert_many", measure(lambda: shard_router.insert_many(
+            router, [(k, k) for k in keys])), n)
+        report("get_many", measure(
+            lambda: shard_router.get_many(router, keys)), n)
+        sample = keys[:n // 20]
+        report("get (jednotlive dotazy)", measure(
+            lambda: [shard_router.get(router, k) for k in sample]),
+            len(sample))
+
+        start = time.perf_counter()
+        moved = shard_router.add_shard(router, "shard{}".format(shards))
+        seconds = time.perf_counter() - start
+        modulo = sum(k % shards != k % (shards + 1) for k in keys)
+        report("add_shard: presun {:.1%} (key % N: {:.1%})"
+               .format(moved / n, modulo / n), seconds, moved)
+        start = time.perf_counter()
+        moved = shard_router.remove_shard(router, "shard0")
+        seconds = time.perf_counter() - start
+        report("remove_shard: presun {:.1%}".format(moved / n),
+               seconds, moved)
+    finally:
+        shard_router.close(router)
+
+
+def allocated(function: Callable[[], object]) -> int:
+    """Vraci pocet bajtu, ktere zustanou alokovany po zavolani funkce
+    'function' (dokud zije jeji vysledek).
+    """
+    import tracemalloc
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def bench_linked_list_index(n: int = 1000000, queries: int = 200) -> None:
+    """search a remove_value v seznamu s indexem hodnot a bez nej."""
+    import linked_list
+
+    print("linked_list index (n = {})".format(n))
+
+    def build(indexed: bool) -> linked_list.LinkedList:
+        lst = linked_list.LinkedList()
+        if indexed:
+            linked_list.enable_index(lst)
+        for value in range(n):
+            linked_list.insert(lst, value)
+        return lst
+
+    plain = allocated(lambda: build(False))
+    indexed = allocated(lambda: build(True))
+    print("  pamet bez indexu {:.1f} MB, s indexem {:.1f} MB "
+          "(+{:.0f} B na prvek)".format(plain / 1e6, indexed / 1e6,
+                                        (indexed - plain) / n))
+
+    values = random.sample(range(n), queries)
+    for label, lst in ("bez indexu", build(False)), ("s indexem", build(True)):
+        report("search " + label, measure(
+            lambda: [linked_list.search(lst, v) for v in values]), queries)
+        report("remove_value " + label, measure(
+            lambda: [linked_list.remove_value(lst, v) for v in values]),
+            queries)
+
+
+def bench_unrolled_linked_list(n: int = 1000000) -> None:
+    """Pruchod a pamet rozbaleneho seznamu proti LinkedList."""
+    import contextlib
+    import io
+
+    import linked_list
+    import unrolled_linked_list
+
+    print("unrolled_linked_list (n = {}, kapacita useku {})"
+          .format(n, unrolled_linked_list.CAPACITY))
+
+    def build_linked() -> linked_list.LinkedList:
+        lst = linked_list.LinkedList()
+        for value in range(n):
+            linked_list.insert(lst, value)
+        return lst
+
+    def build_unrolled() -> unrolled_linked_list.UnrolledLinkedList:
+        lst = unrolled_linked_list.UnrolledLinkedList()
+        for value in range(n):
+            unrolled_linked_list.append(lst, value)
+        return lst
+
+    for label, build, module in (
+            ("LinkedList", build_linked, linked_list),
+            ("UnrolledLinkedList", build_unrolled, unrolled_linked_list)):
+        print("  {}: {:.1f} B na prvek".format(
+            label, allocated(build) / n))
+        report(label + " insert/append", measure(build), n)
+        lst: Any = build()
+        report(label + " search (chybejici hodnota)", measure(
+            lambda: module.search(lst, -1)), n)
+        with contextlib.redirect_stdout(io.StringIO()):
+            seconds = measure(lambda: module.print_list(lst))
+        report(label + " print_list", seconds, n)
+
+
+def bench_skip_list(n: int = 100000) -> None:
+    """Skip list proti red_black_tree a binary_search_tree na nahodnych
+    a serazenych klicich.
+    """
+    import binary_search_tree
+    import red_black_tree
+    import skip_list
+
+    print("skip_list (n = {})".format(n))
+    structures: List[Any] = [
+        ("SkipList", skip_list.SkipList, skip_list.insert, skip_list.search),
+        ("RedBlackTree", red_black_tree.RedBlackTree, red_black_tree.insert,
+         red_black_tree.search),
+        ("BinarySearchTree", binary_search_tree.BinarySearchTree,
+         binary_search_tree.insert, binary_search_tree.search),
+    ]
+    random_keys = random.sample(range(1 << 40), n)
+    for order, keys in ("nahodne", random_keys), ("serazene",
+                                                 sorted(random_keys)):
+        for name, make, insert, search in structures:
+            label = "{} ({})".format(name, order)
+            if make is binary_search_tree.BinarySearchTree and \
+                    order == "serazene":
+                # degenerovany strom, vkladani O(n ** 2), viz bst_stress
+                print("  {:<40} vynechano".format(label))
+                continue
+            structure = make()
+            report(label + " insert", measure(
+                lambda: [insert(structure, k) for k in keys]), n)
+            report(label + " search", measure(
+                lambda: [search(structure, k) for k in random_keys]), n)
+
+
+def bench_pooled_linked_list(n: int = 1000000, queue: int = 1000) -> None:
+    """Fronta s dvojicemi insert/delete: LinkedList proti
+    PooledLinkedList.
+    """
+    import linked_list
+    import pooled_linked_list
+
+    print("pooled_linked_list (n = {} dvojic insert/delete)".format(n))
+
+    def churn_linked() -> None:
+        lst = linked_list.LinkedList()
+        for value in range(queue):
+            linked_list.insert(lst, value)
+        for value in range(n):
+            linked_list.insert(lst, value)
+            assert lst.first is not None
+            linked_list.delete(lst, lst.first)
+
+    def churn_pooled() -> None:
+        lst = pooled_linked_list.PooledLinkedList(queue + 1)
+        for value in range(queue):
+            pooled_linked_list.insert(lst, value)
+        for value in range(n):
+            pooled_linked_list.insert(lst, value)
+            pooled_linked_list.delete(lst, lst.first)
+
+    for label, churn in ("LinkedList", churn_linked), ("PooledLinkedList",
+                                                       churn_pooled):
+        collections = gc.get_stats()[0]['collections']
+        seconds = measure(churn)
+        collections = gc.get_stats()[0]['collections'] - collections
+        report("{} (gc kolekci: {})".format(label, collections), seconds, n)
+
+
+def bench_linked_list_bulk(n: int = 1000000) -> None:
+    """Hromadne operace LinkedList proti postupnemu zpracovani prvku."""
+    import contextlib
+    import io
+
+    import linked_list
+
+    print("linked_list bulk (n = {})".format(n))
+
+    def build() -> linked_list.LinkedList:
+        lst = linked_list.LinkedList()
+        linked_list.extend(lst, range(n))
+        return lst
+
+    lst = linked_list.LinkedList()
+    report("insert (smycka)", measure(
+        lambda: [linked_list.insert(lst, v) for v in range(n)]), n)
+    report("extend", measure(build), n)
+
+    def concat_by_insert() -> None:
+        node = other.first
+        while node:
+            linked_list.insert(lst, node.value)
+            node = node.next
+
+    lst, other = build(), build()
+    report("spojeni seznamu po prvcich", measure(concat_by_insert), n)
+    lst, other = build(), build()
+    report("concat", measure(lambda: linked_list.concat(lst, other)), n)
+    assert lst.first is not None
+    report("split_at", measure(
+        lambda: linked_list.split_at(lst, lst.first)), n)
+
+    lst = build()
+    report("iter_forward", measure(
+        lambda: sum(linked_list.iter_forward(lst))), n)
+
+    def print_each() -> None:
+        node = lst.first
+        while node:
+            print(node.value, end=" ")
+            node = node.next
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        seconds = measure(print_each)
+    report("print() po prvcich", seconds, n)
+    report("write_to", measure(
+        lambda: linked_list.write_to(lst, io.StringIO())), n)
+
+
+def bench_linked_list_sort(n: int = 1000000) -> None:
+    """Razeni LinkedList na miste proti kopii do pole a znovusestaveni."""
+    import linked_list
+
+    print("linked_list sort (n = {})".format(n))
+    values = [random.random() for _ in range(n)]
+
+    def build() -> linked_list.LinkedList:
+        lst = linked_list.LinkedList()
+        linked_list.extend(lst, values)
+        return lst
+
+    def copy_sort_rebuild() -> linked_list.LinkedList:
+        result = linked_list.LinkedList()
+        linked_list.extend(result, sorted(linked_list.iter_forward(lst)))
+        return result
+
+    lst = build()
+    report("kopie, sorted(), znovusestaveni", measure(copy_sort_rebuild), n)
+    print("  pamet navic: {:.1f} MB".format(allocated(copy_sort_rebuild) / 1e6))
+    lst = build()
+    report("sort na miste", measure(lambda: linked_list.sort(lst)), n)
+    lst = build()
+    print("  pamet navic: {:.1f} MB".format(
+        allocated(lambda: linked_list.sort(lst)) / 1e6))
+
+
+def bench_self_organizing_list(n: int = 1000, accesses: int = 100000,
+                               exponent: float = 1.0) -> None:
+    """Prumerna delka prohledavani samoorganizujiciho se seznamu na
+    dotazech se Zipfovym rozlozenim.
+    """
+    import self_organizing_list as sol
+
+    print("self_organizing_list (n = {}, {} dotazu, Zipf s = {})"
+          .format(n, accesses, exponent))
+    ranks = list(range(n))
+    random.shuffle(ranks)
+    weights = [1 / (rank + 1) ** exponent for rank in ranks]
+    trace = random.choices(range(n), weights, k=accesses)
+
+    for policy in None, sol.MOVE_TO_FRONT, sol.TRANSPOSE, sol.COUNT:
+        slist = sol.SelfOrganizingList(policy)
+        for value in range(n):
+            sol.insert(slist, value)
+        seconds = measure(lambda: [sol.search(slist, v) for v in trace])
+        report("{} (prumerne {:.1f} uzlu)".format(
+            policy or "bez preusporadani", sol.average_cost(slist)),
+            seconds, accesses)
+
+
+def bench_indexable_list(n: int = 100000, queries: int = 2000) -> None:
+    """Pristup, vkladani a mazani podle indexu v IndexableList proti
+    pruchodu LinkedList a vestavenemu poli.
+    """
+    import indexable_list
+    import linked_list
+
+    print("indexable_list (n = {}, {} operaci)".format(n, queries))
+    indexes = [random.randrange(n - queries) for _ in range(queries)]
+
+    def walk(lst: linked_list.LinkedList, index: int) -> Any:
+        node = lst.first
+        for _ in range(index):
+            node = node.next  # type: ignore[union-attr]
+        return node.value  # type: ignore[union-attr]
+
+    ilist = indexable_list.IndexableList()
+    report("IndexableList append", measure(
+        lambda: [indexable_list.append(ilist, v) for v in range(n)]), n)
+    report("IndexableList get", measure(
+        lambda: [indexable_list.get(ilist, i) for i in indexes]), queries)
+    report("IndexableList insert_at", measure(
+        lambda: [indexable_list.insert_at(ilist, i, i) for i in indexes]),
+        queries)
+    report("IndexableList delete_at", measure(
+        lambda: [indexable_list.delete_at(ilist, i) for i in indexes]),
+        queries)
+
+    lst = linked_list.LinkedList()
+    linked_list.extend(lst, range(n))
+    report("LinkedList get (pruchod od zacatku)", measure(
+        lambda: [walk(lst, i) for i in indexes]), queries)
+
+    array = list(range(n))
+    report("list get", measure(lambda: [array[i] for i in indexes]), queries)
+    report("list insert", measure(
+        lambda: [array.insert(i, i) for i in indexes]), queries)
+    report("list pop", measure(lambda: [array.pop(i) for i in indexes]),
+           queries)
+
+
+def bench_concurrent_queue(n: int = 200000) -> None:
+    """Propustnost ConcurrentQueue proti queue.Queue pri ruznem poctu
+    producentu a konzumentu.
+    """
+    import queue
+    import threading
+
+    import concurrent_queue as cq
+
+    print("concurrent_queue (n = {} prvku celkem)".format(n))
+
+    def run(producers: int, consumers: int, put: Callable[[Any], None],
+            get: Callable[[], List[Any]]) -> None:
+        per_producer = n // producers
+        remaining = [per_producer * producers]
+        lock = threading.Lock()
+
+        def produce() -> None:
+            for value in range(per_producer):
+                put(value)
+
+        def consume_until_stop() -> None:
+            while remaining[0] > 0:
+                try:
+                    batch = get()
+                except queue.Empty:
+                    continue
+                with lock:
+                    remaining[0] -= len(batch)
+
+        threads = [threading.Thread(target=produce)
+                   for _ in range(producers)]
+        threads += [threading.Thread(target=consume_until_stop)
+                    for _ in range(consumers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    for producers, consumers in (1, 1), (2, 2), (4, 4), (4, 1):
+        total = n // producers * producers
+        stdlib = queue.Queue()  # type: ignore[var-annotated]
+        report("queue.Queue {}P/{}K".format(producers, consumers), measure(
+            lambda: run(producers, consumers, stdlib.put,
+                        lambda: [stdlib.get(timeout=0.01)])), total)
+        cqueue = cq.ConcurrentQueue()
+        report("ConcurrentQueue pop {}P/{}K".format(producers, consumers),
+               measure(lambda: run(producers, consumers,
+                                   lambda v: cq.push(cqueue, v),
+                                   lambda: [cq.pop(cqueue, timeout=0.01)])),
+               total)
+        cqueue = cq.ConcurrentQueue()
+        report("ConcurrentQueue drain {}P/{}K".format(producers, consumers),
+               measure(lambda: run(
+                   producers, consumers, lambda v: cq.push(cqueue, v),
+                   lambda: cq.drain(cqueue, 256, True, 0.01))), total)
+
+
+def bench_bst_stress(n: int = 500000, sequential: int = 10000) -> None:
+    """Zatez binary_search_tree nahodnymi a rostoucimi klici. Rostouci
+    klice vytvori degenerovany strom (seznam), vkladani je pak O(n ** 2),
+    proto je jejich pocet mensi.
+    """
+    import binary_search_tree as bst
+
+    print("bst_stress (n = {} nahodnych, {} rostoucich klicu)"
+          .format(n, sequential))
+    for label, keys in (("nahodne", random.sample(range(1 << 40), n)),
+                        ("rostouci", list(range(sequential)))):
+        tree = bst.BinarySearchTree()
+        report("insert ({})".format(label), measure(
+            lambda: [bst.insert(tree, k) for k in keys]), len(keys))
+        report("search ({})".format(label), measure(
+            lambda: [bst.search(tree, k) for k in keys]), len(keys))
+        report("height = {} ({})".format(bst.height(tree), label),
+               measure(lambda: bst.height(tree)), len(keys))
+        report("is_correct_bst ({})".format(label),
+               measure(lambda: bst.is_correct_bst(tree)), len(keys))
+
+
+def bench_avl(n: int = 200000, sequential: int = 10000) -> None:
+    """Vyska a rychlost hledani AVL rezimu BinarySearchTree proti
+    nevyvazenemu BST a red_black_tree na nahodnych a rostoucich klicich.
+    """
+    import binary_search_tree as bst
+    import red_black_tree
+
+    print("avl (n = {} nahodnych, {} rostoucich klicu)".format(n, sequential))
+
+    def rb_height(tree: red_black_tree.RedBlackTree) -> int:
+        result = -1
+        level = [tree.root] if tree.root is not None else []
+        while level:
+            result += 1
+            level = [c for node in level for c in (node.left, node.right)
+                     if c is not None]
+        return result
+
+    for order, keys in (("nahodne", random.sample(range(1 << 40), n)),
+                        ("rostouci", list(range(sequential)))):
+        queries = random.sample(keys, len(keys))
+        for name, make, insert, search, tree_height in (
+                ("BST", bst.BinarySearchTree, bst.insert, bst.search,
+                 bst.height),
+                ("AVL", lambda: bst.BinarySearchTree(avl=True), bst.insert,
+                 bst.search, bst.height),
+                ("RedBlackTree", red_black_tree.RedBlackTree,
+                 red_black_tree.insert, red_black_tree.search, rb_height)):
+            tree = make()
+            label = "{} ({})".format(name, order)
+            report(label + " insert", measure(
+                lambda: [insert(tree, k) for k in keys]), len(keys))
+            report("{} search, vyska {}".format(label, tree_height(tree)),
+                   measure(lambda: [search(tree, k) for k in queries]),
+                   len(keys))
+
+
+def bench_treap(n: int = 100000) -> None:
+    """Hromadne mnozinove operace treapu (split/join) proti vkladani
+    a mazani klicu po jednom a proti vestavenemu set.
+    """
+    import treap
+
+    print("treap (2 mnoziny po {} klicich)".format(n))
+    a_keys = random.sample(range(4 * n), n)
+    b_keys = random.sample(range(4 * n), n)
+    low, high = n, 3 * n
+    in_range = [k for k in a_keys if low <= k < high]
+
+    report("from_keys (insert po jednom)", measure(
+        lambda: treap.from_keys(a_keys)), n)
+
+    a, b = treap.from_keys(a_keys), treap.from_keys(b_keys)
+    report("union", measure(lambda: treap.union(a, b)), 2 * n)
+    a = treap.from_keys(a_keys)
+    report("union (insert po jednom)", measure(
+        lambda: [treap.insert(a, k) for k in b_keys]), 2 * n)
+
+    a, b = treap.from_keys(a_keys), treap.from_keys(b_keys)
+    report("difference", measure(lambda: treap.difference(a, b)), 2 * n)
+    a = treap.from_keys(a_keys)
+
+    def remove_each() -> None:
+        for key in b_keys:
+            node = treap.search(a, key)
+            if node is not None:
+                treap.delete(a, node)
+    report("difference (search + delete po jednom)", measure(remove_each),
+           2 * n)
+
+    a = treap.from_keys(a_keys)
+    report("delete_range ({} klicu)".format(len(in_range)), measure(
+        lambda: treap.delete_range(a, low, high)), len(in_range))
+    a = treap.from_keys(a_keys)
+    report("delete_range (po jednom)", measure(lambda: [
+        treap.delete(a, treap.search(a, k)) for k in in_range]),
+        len(in_range))
+
+    a_set, b_set = set(a_keys), set(b_keys)
+    report("set union", measure(lambda: a_set | b_set), 2 * n)
+    report("set difference", measure(lambda: a_set - b_set), 2 * n)
+
+
+def bench_from_sorted(n: int = 500000) -> None:
+    """Postaveni stromu z serazenych klicu funkci from_sorted() proti
+    postupnemu vkladani.
+    """
+    import binary_search_tree as bst
+    import red_black_tree
+
+    print("from_sorted (n = {})".format(n))
+    keys = range(n)
+    shuffled = random.sample(keys, n)
+
+    def insert_all(tree: Any, insert: Callable[[Any, Any], Any],
+                   order: Any) -> Any:
+        for key in order:
+            insert(tree, key)
+        return tree
+
+    for label, build in (
+            ("BST insert (nahodne poradi)", lambda: insert_all(
+                bst.BinarySearchTree(), bst.insert, shuffled)),
+            ("BST insert AVL (serazene)", lambda: insert_all(
+                bst.BinarySearchTree(avl=True), bst.insert, keys)),
+            ("BST from_sorted (range)", lambda: bst.from_sorted(keys)),
+            ("BST from_sorted (generator)",
+             lambda: bst.from_sorted(k for k in keys)),
+            ("RedBlackTree insert (serazene)", lambda: insert_all(
+                red_black_tree.RedBlackTree(), red_black_tree.insert, keys)),
+            ("RedBlackTree from_sorted (range)",
+             lambda: red_black_tree.from_sorted(keys)),
+            ("RedBlackTree from_sorted (generator)",
+             lambda: red_black_tree.from_sorted(k for k in keys))):
+        report(label, measure(build), n)
+
+
+def bench_order_statistics(n: int = 200000, window: int = 10000,
+                           naive: int = 200) -> None:
+    """Klouzavy percentil: do okna poslednich 'window' hodnot se vklada
+    nova hodnota, nejstarsi se maze a cte se median a 99. percentil.
+    AVL strom se select() proti serazenemu poli s bisect a proti pruchodu
+    stromu v poradi klicu (ten jen pro 'naive' kroku).
+    """
+    import bisect
+    import binary_search_tree as bst
+
+    print("order_statistics (n = {}, okno {})".format(n, window))
+    values = [random.random() for _ in range(n + window)]
+    ranks = window // 2, window * 99 // 100
+
+    def walk_select(tree: bst.BinarySearchTree, k: int) -> Any:
+        stack: List[Any] = []
+        node = tree.root
+        while True:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            if k == 0:
+                return node
+            k -= 1
+            node = node.right
+
+    def rolling_tree(tree: bst.BinarySearchTree, steps: int,
+                     select: Callable[[Any, int], Any]) -> None:
+        for old, new in zip(values[:steps], values[window:window + steps]):
+            bst.insert(tree, new)
+            node = bst.search(tree, old)
+            assert node is not None
+            bst.delete(tree, node)
+            for k in ranks:
+                select(tree, k)
+
+    def rolling_list(ordered: List[float]) -> None:
+        for old, new in zip(values[:n], values[window:]):
+            bisect.insort(ordered, new)
+            del ordered[bisect.bisect_left(ordered, old)]
+            for k in ranks:
+                ordered[k]
+
+    for label, steps, select in (
+            ("AVL + select", n, bst.select),
+            ("AVL + pruchod v poradi", naive, walk_select)):
+        tree = bst.BinarySearchTree(avl=True)
+        for value in values[:window]:
+            bst.insert(tree, value)
+        report(label, measure(lambda: rolling_tree(tree, steps, select)),
+               steps)
+    ordered = sorted(values[:window])
+    report("serazene pole + bisect", measure(lambda: rolling_list(ordered)), n)
+
+
+def bench_tree_iteration(n: int = 200000, ranges: int = 1000,
+                         width: int = 100) -> None:
+    """Pruchod stromem a rozsahove dotazy iteratory iter_forward()
+    a iter_range() proti rekurzivnimu pruchodu celym stromem.
+    """
+    import binary_search_tree as bst
+    import red_black_tree
+
+    print("tree_iteration (n = {}, {} rozsahu po {} klicich)"
+          .format(n, ranges, width))
+    keys = random.sample(range(n), n)
+    lows = [random.randrange(n - width) for _ in range(ranges)]
+
+    def walk(node: Any, result: List[Any]) -> List[Any]:
+        if node is not None:
+            walk(node.left, result)
+            result.append(node.key)
+            walk(node.right, result)
+        return result
+
+    avl = bst.BinarySearchTree(avl=True)
+    rb = red_black_tree.RedBlackTree()
+    for key in keys:
+        bst.insert(avl, key)
+        red_black_tree.insert(rb, key)
+
+    for name, tree, module in ("AVL", avl, bst), ("RB", rb, red_black_tree):
+        report(name + " rekurzivni pruchod", measure(
+            lambda: walk(tree.root, [])), n)
+        report(name + " iter_forward", measure(
+            lambda: [node.key for node in module.iter_forward(tree)]), n)
+        report(name + " iter_backward", measure(
+            lambda: [node.key for node in module.iter_backward(tree)]), n)
+        report(name + " rozsahy iter_range", measure(
+            lambda: [[node.key for node in
+                      module.iter_range(tree, low, low + width)]
+                     for low in lows]), ranges)
+        report(name + " rozsahy pruchodem (10 dotazu)", measure(
+            lambda: [[key for key in walk(tree.root, [])
+                      if low <= key < low + width]
+                     for low in lows[:10]]), 10)
+
+
+def bench_scapegoat(n: int = 100000, plain: int = 5000) -> None:
+    """Vkladani a hledani v scapegoat rezimu BinarySearchTree proti AVL,
+    red_black_tree a nevyvazenemu BST (ten jen pro 'plain' klicu) na
+    nepriznivych poradich klicu.
+    """
+    import binary_search_tree as bst
+    import red_black_tree
+
+    print("scapegoat (n = {}, nevyvazeny BST n = {})".format(n, plain))
+
+    def zigzag(count: int) -> List[int]:
+        return [k // 2 if k % 2 == 0 else count - 1 - k // 2
+                for k in range(count)]
+
+    def sawtooth(count: int) -> List[int]:
+        block = max(1, count // 100)
+        return [start + k for start in range(count - block, -1, -block)
+                for k in range(block)]
+
+    for order, make_keys in (("rostouci", lambda c: list(range(c))),
+                             ("klesajici", lambda c: list(range(c))[::-1]),
+                             ("cik-cak", zigzag),
+                             ("pila", sawtooth)):
+        for name, count, make in (
+                ("BST", plain, bst.BinarySearchTree),
+                ("scapegoat", n,
+                 lambda: bst.BinarySearchTree(scapegoat=True)),
+                ("AVL", n, lambda: bst.BinarySearchTree(avl=True))):
+            keys = make_keys(count)
+            tree = make()
+            label = "{} ({})".format(name, order)
+            report(label + " insert", measure(
+                lambda: [bst.insert(tree, k) for k in keys]), count)
+            report("{} search, vyska {}".format(label, bst.height(tree)),
+                   measure(lambda: [bst.search(tree, k) for k in keys]),
+                   count)
+        keys = make_keys(n)
+        rb = red_black_tree.RedBlackTree()
+        report("RedBlackTree ({}) insert".format(order), measure(
+            lambda: [red_black_tree.insert(rb, k) for k in keys]), n)
+
+
+def bench_search_many(n: int = 200000) -> None:
+    """Hromadne hledani serazenych davek klicu funkci search_many() proti
+    samostatnemu hledani kazdeho klice od korene pro ruzne velikosti
+    davek.
+    """
+    import binary_search_tree as bst
+    import red_black_tree
+
+    print("search_many (n = {})".format(n))
+    keys = random.sample(range(2 * n), n)
+    avl = bst.BinarySearchTree(avl=True)
+    rb = red_black_tree.RedBlackTree()
+    for key in keys:
+        bst.insert(avl, key)
+        red_black_tree.insert(rb, key)
+
+    for batch in 100, 1000, 10000, 100000, 400000:
+        queries = sorted(random.sample(range(2 * n), min(batch, 2 * n)))
+        rounds = max(1, 100000 // len(queries))
+        for name, tree, module in ("AVL", avl, bst), \
+                ("RB", rb, red_black_tree):
+            label = "{} davka {}".format(name, len(queries))
+            report(label + " search", measure(
+                lambda: [[module.search(tree, k) for k in queries]
+                         for _ in range(rounds)]),
+                rounds * len(queries))
+            report(label + " search_many", measure(
+                lambda: [module.search_many(tree, queries)
+                         for _ in range(rounds)]),
+                rounds * len(queries))
+
+
+def bench_pooled_tree(n: int = 200000) -> None:
+    """Pamet na klic a rychlost insert/search/delete: PooledTree proti
+    stromum z objektovych uzlu (BinarySearchTree a RedBlackTree).
+    """
+    import binary_search_tree as bst
+    import pooled_tree
+    import red_black_tree
+
+    print("pooled_tree (n = {})".format(n))
+    keys = random.sample(range(1 << 40), n)
+    queries = random.sample(keys, n)
+
+    def build(make: Callable[[], Any],
+              insert: Callable[[Any, int], Any]) -> Any:
+        tree = make()
+        for key in keys:
+            insert(tree, key)
+        return tree
+
+    def delete_all(tree: Any, search: Callable[[Any, int], Any],
+                   delete: Callable[[Any, Any], None]) -> None:
+        for key in queries:
+            delete(tree, search(tree, key))
+
+    for name, make, insert, search, delete in (
+            ("BinarySearchTree", bst.BinarySearchTree, bst.insert,
+             bst.search, bst.delete),
+            ("RedBlackTree", red_black_tree.RedBlackTree,
+             red_black_tree.insert, red_black_tree.search,
+             red_black_tree.delete),
+            ("PooledTree BST", lambda: pooled_tree.PooledTree(False),
+             pooled_tree.insert, pooled_tree.search, pooled_tree.delete),
+            ("PooledTree RB", pooled_tree.PooledTree, pooled_tree.insert,
+             pooled_tree.search, pooled_tree.delete)):
+        print("  {:<40} {:8.1f} B/klic".format(
+            name + " pamet", allocated(lambda: build(make, insert)) / n))
+        tree = make()
+        report(name + " insert", measure(
+            lambda: [insert(tree, k) for k in keys]), n)
+        report(name + " search", measure(
+            lambda: [search(tree, k) for k in queries]), n)
+        report(name + " delete", measure(
+            lambda: delete_all(tree, search, delete)), n)
+
+
+def bench_bplus_tree(n: int = 200000, queries: int = 200000,
+                     ranges: int = 2000, width: int = 1000) -> None:
+    """B+strom proti AVL rezimu BinarySearchTree a red_black_tree:
+    postaveni (vkladani i z serazenych klicu), hledani a rozsahove
+    dotazy.
+    """
+    import binary_search_tree as bst
+    import bplus_tree
+    import red_black_tree
+
+    print("bplus_tree (n = {}, {} rozsahu po {} klicich)"
+          .format(n, ranges, width))
+    keys = random.sample(range(2 * n), n)
+    ordered = sorted(keys)
+    lookups = random.sample(range(2 * n), queries)
+    lows = [random.randrange(2 * n - 2 * width) for _ in range(ranges)]
+
+    def insert_all(tree: Any, insert: Callable[[Any, Any], Any]) -> Any:
+        for key in keys:
+            insert(tree, key)
+        return tree
+
+    trees = []
+    for name, make, module in (
+            ("AVL", lambda: bst.BinarySearchTree(avl=True), bst),
+            ("RedBlackTree", red_black_tree.RedBlackTree, red_black_tree),
+            ("BPlusTree", bplus_tree.BPlusTree, bplus_tree)):
+        tree = make()
+        report(name + " insert", measure(
+            lambda: insert_all(tree, module.insert)), n)
+        report(name + " from_sorted", measure(
+            lambda: module.from_sorted(ordered)), n)
+        trees.append((name, tree, module))
+
+    for name, tree, module in trees:
+        report(name + " search", measure(
+            lambda: [module.search(tree, k) for k in lookups]), queries)
+        report(name + " iter_range", measure(
+            lambda: [sum(1 for _ in module.iter_range(tree, low,
+                                                      low + 2 * width))
+                     for low in lows]), ranges)
+    for fanout in 16, 64, 256:
+        tree = bplus_tree.from_sorted(ordered, fanout=fanout)
+        report("BPlusTree fanout {} search, vyska {}".format(
+            fanout, bplus_tree.height(tree)), measure(
+            lambda: [bplus_tree.search(tree, k) for k in lookups]), queries)
+
+
+BENCHMARKS: Dict[str, Callable[[], None]] = {
+    'bloom_filter': bench_bloom_filter,
+    'int_hash_table': bench_int_hash_table,
+    'treeify': bench_treeify,
+    'bulk_load': bench_bulk_load,
+    'snapshot': bench_snapshot,
+    'shard_router': bench_shard_router,
+    'linked_list_index': bench_linked_list_index,
+    'unrolled_linked_list': bench_unrolled_linked_list,
+    'skip_list': bench_skip_list,
+    'pooled_linked_list': bench_pooled_linked_list,
+    'linked_list_bulk': bench_linked_list_bulk,
+    'linked_list_sort': bench_linked_list_sort,
+    'self_organizing_list': bench_self_organizing_list,
+    'indexable_list': bench_indexable_list,
+    'concurrent_queue': bench_concurrent_queue,
+    'bst_stress': bench_bst_stress,
+    'avl': bench_avl,
+    'treap': bench_treap,
+    'from_sorted': bench_from_sorted,
+    'order_statistics': bench_order_statistics,
+    'tree_iteration': bench_tree_iteration,
+    'scapegoat': bench_scapegoat,
+    'search_many': bench_search_many,
+    'pooled_tree': bench_pooled_tree,
+    'bplus_tree': bench_bplus_tree,
+}
+
+
+if __name__ == '__main__':
+    names: List[str] = sys.argv[1:] or list(BENCHMARKS)
+    for name in names:
+        BENCHMARKS[name]()
+        print()
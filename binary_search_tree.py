@@ -1,6 +1,11 @@
 #!/usr/bin/env python3
 import math
-from typing import Any, Optional, TextIO
+from itertools import islice
+from typing import (Any, Callable, Iterable, Iterator, List, Optional,
+                    Sized, TextIO, Tuple)
+
+import bloom_filter
+from bloom_filter import BloomFilter
 
 
 class Node:
@@ -11,6 +16,9 @@ class Node:
         parent  reference na rodice uzlu (None, pokud neexistuje)
         left    reference na leveho potomka (None, pokud neexistuje)
         right   reference na praveho potomka (None, pokud neexistuje)
+        height  vyska podstromu s korenem v uzlu (udrzuje se jen ve strome
+                v rezimu AVL)
+        size    pocet uzlu podstromu s korenem v uzlu (vcetne uzlu)
     """
 
     def __init__(self, key: Optional[Any] = None) -> None:
@@ -18,6 +26,8 @@ class Node:
         self.parent: Optional[Node] = None
         self.right: Optional[Node] = None
         self.left: Optional[Node] = None
+        self.height: int = 0
+        self.size: int = 1
 
 
 class BinarySearchTree:
@@ -26,48 +36,286 @@ class BinarySearchTree:
 
     Atributy:
         root    reference na korenovy uzel typu Node
+        bloom   volitelny Bloomuv filtr, ktery odfiltruje hledani
+                klicu, jez ve strome urcite nejsou (None = bez filtru)
+        avl     True, pokud se strom vyvazuje jako AVL strom: kazdy uzel
+                si pamatuje vysku sveho podstromu a vysky podstromu
+                potomku se lisi nejvyse o 1, takze vyska stromu je
+                O(log n)
+        scapegoat   True, pokud se strom vyvazuje jako scapegoat strom:
+                    prilis hluboko vlozeny uzel zpusobi prestavbu
+                    nevyvazeneho podstromu, vyska je O(log n) a vkladani
+                    i mazani trva amortizovane O(log n)
+        alpha       parametr vyvazeni scapegoat stromu (0.5 < alpha < 1),
+                    podstrom potomka smi mit nejvyse alpha nasobek uzlu
+                    podstromu rodice
+        max_size    nejvetsi pocet uzlu od posledni prestavby celeho
+                    scapegoat stromu
     """
 
-    def __init__(self) -> None:
+    def __init__(self, avl: bool = False, scapegoat: bool = False,
+                 alpha: float = 2 / 3) -> None:
+        if avl and scapegoat:
+            raise ValueError("strom nemuze byt AVL a scapegoat zaroven")
+        if not 0.5 < alpha < 1:
+            raise ValueError("alpha {} neni v intervalu (0.5, 1)"
+                             .format(alpha))
         self.root: Optional[Node] = None
+        self.bloom: Optional[BloomFilter] = None
+        self.avl: bool = avl
+        self.scapegoat: bool = scapegoat
+        self.alpha: float = alpha
+        self.max_size: int = 0
+
+
+def _node_height(node: Optional[Node]) -> int:
+    return node.height if node is not None else -1
+
+
+def update_height(node: Node) -> None:
+    node.height = 1 + max(_node_height(node.left), _node_height(node.right))
+
+
+def _node_size(node: Optional[Node]) -> int:
+    return node.size if node is not None else 0
 
 
-def _insert(prev: Optional[Node], node: Optional[Node], key: Any) -> None:
-    if not node:
-        if prev.key < key:
-            prev.right = Node(key)
+def update_size(node: Node) -> None:
+    node.size = 1 + _node_size(node.left) + _node_size(node.right)
+
+
+def rotate_left(tree: BinarySearchTree, rotation_root: Node) -> Node:
+    """Vykona rotaci doleva kolem uzlu 'rotation_root' a prepocita vysky
+    dotcenych uzlu. Vraci novy koren podstromu.
+    """
+    right_child = rotation_root.right
+    assert right_child is not None
+
+    rotation_root.right = right_child.left
+    if right_child.left is not None:
+        right_child.left.parent = rotation_root
+    transplant(tree, rotation_root, right_child)
+    right_child.left = rotation_root
+    rotation_root.parent = right_child
+
+    update_height(rotation_root)
+    update_height(right_child)
+    update_size(rotation_root)
+    update_size(right_child)
+    return right_child
+
+
+def rotate_right(tree: BinarySearchTree, rotation_root: Node) -> Node:
+    """Vykona rotaci doprava kolem uzlu 'rotation_root' a prepocita vysky
+    dotcenych uzlu. Vraci novy koren podstromu.
+    """
+    left_child = rotation_root.left
+    assert left_child is not None
+
+    rotation_root.left = left_child.right
+    if left_child.right is not None:
+        left_child.right.parent = rotation_root
+    transplant(tree, rotation_root, left_child)
+    left_child.right = rotation_root
+    rotation_root.parent = left_child
+
+    update_height(rotation_root)
+    update_height(left_child)
+    update_size(rotation_root)
+    update_size(left_child)
+    return left_child
+
+
+def _rebalance(tree: BinarySearchTree, node: Optional[Node]) -> None:
+    """Prepocita vysky od uzlu 'node' ke koreni a rotacemi obnovi
+    vyvazenost AVL. Skonci drive, pokud se vyska vyvazeneho uzlu
+    nezmenila, protoze se pak nezmeni ani u jeho predku.
+    """
+    while node is not None:
+        old_height = node.height
+        update_height(node)
+        balance = _node_height(node.left) - _node_height(node.right)
+        if balance > 1:
+            assert node.left is not None
+            if _node_height(node.left.left) < _node_height(node.left.right):
+                rotate_left(tree, node.left)
+            node = rotate_right(tree, node)
+        elif balance < -1:
+            assert node.right is not None
+            if _node_height(node.right.right) < _node_height(node.right.left):
+                rotate_right(tree, node.right)
+            node = rotate_left(tree, node)
+        elif node.height == old_height:
             return
-        prev.left = Node(key)
-        return
-    if node.key < key:
-        _insert(node, node.right, key)
-        return
-    _insert(node, node.left, key)
+        node = node.parent
+
+
+def _insert(node: Node, key: Any) -> Node:
+    """Vlozi novy uzel s klicem 'key' do neprazdneho podstromu s korenem
+    'node' a zvetsi velikosti podstromu na ceste. Vraci nove vlozeny uzel.
+    """
+    while True:
+        node.size += 1
+        if node.key < key:
+            if node.right is None:
+                node.right = Node(key)
+                node.right.parent = node
+                return node.right
+            node = node.right
+        else:
+            if node.left is None:
+                node.left = Node(key)
+                node.left.parent = node
+                return node.left
+            node = node.left
 
 
 def insert(tree: BinarySearchTree, key: Any) -> None:
     """Vlozi novy uzel s klicem 'key' do stromu 'tree'."""
+    if tree.bloom is not None:
+        bloom_filter.insert(tree.bloom, key)
     if not tree.root:
         tree.root = Node(key)
+        tree.max_size = max(tree.max_size, 1)
         return
-    _insert(tree.root, tree.root, key)
+    node = _insert(tree.root, key)
+    if tree.avl:
+        _rebalance(tree, node.parent)
+    elif tree.scapegoat:
+        _scapegoat_insert(tree, node)
 
 
 def _search(node: Optional[Node], key: Any) -> Optional[Node]:
-    if not node or node.key == key:
-        return node
-    if node.key < key:
-        return _search(node.right, key)
-    return _search(node.left, key)
+    while node is not None and node.key != key:
+        node = node.right if node.key < key else node.left
+    return node
 
 
 def search(tree: BinarySearchTree, key: Any) -> Optional[Node]:
     """Vyhleda uzel s klicem 'key' ve strome 'tree'. Vrati uzel s hledanym
     klicem. Pokud se klic 'key' ve strome nenachazi, vraci None.
     """
+    if tree.bloom is not None and not bloom_filter.contains(tree.bloom, key):
+        return None
     return _search(tree.root, key)
 
 
+def _check_sorted(keys: List[Any]) -> None:
+    for previous, key in zip(keys, keys[1:]):
+        if key < previous:
+            raise ValueError("klice nejsou serazene ({} po {})"
+                             .format(key, previous))
+
+
+def _finger_search(root: Any, keys: List[Any]) -> List[Optional[Any]]:
+    """Hleda rostouci klice 'keys' od mista, kde skoncilo predchozi
+    hledani (prst). Na zasobniku jsou uzly predchozi cesty, v nichz
+    sestup pokracoval doleva; jejich klice shora omezuji podstrom prstu.
+    Uzly s klicem <= key se odeberou a sestup pokracuje od nejvyssiho
+    z nich (tam se cesty rozchazeji), jinak od konce predchozi cesty.
+    Pro k klicu v n uzlech trva O(k log(n / k)).
+    """
+    result: List[Optional[Any]] = []
+    stack: List[Any] = []
+    push, pop = stack.append, stack.pop
+    node = root
+    for key in keys:
+        while stack and not key < stack[-1].key:
+            node = pop()
+        while True:
+            node_key = node.key
+            if node_key == key:
+                result.append(node)
+                break
+            if node_key < key:
+                child = node.right
+            else:
+                push(node)
+                child = node.left
+            if child is None:
+                result.append(None)
+                break
+            node = child
+    return result
+
+
+def _merge_search(root: Any, keys: List[Any]) -> List[Optional[Any]]:
+    """Hleda rostouci klice 'keys' jednim pruchodem stromu v poradi
+    klicu soubezne s posloupnosti klicu v case O(n + k).
+    """
+    result: List[Optional[Any]] = []
+    nodes = _walk(minimal(root), successor)
+    node = next(nodes, None)
+    for key in keys:
+        while node is not None and node.key < key:
+            node = next(nodes, None)
+        result.append(node if node is not None and node.key == key else None)
+    return result
+
+
+def search_sorted(root: Any, keys: Iterable[Any],
+                  count: int) -> List[Optional[Any]]:
+    """Vyhleda vsechny klice neklesajici posloupnosti 'keys' v podstromu
+    s korenem 'root', ktery ma 'count' uzlu, a vrati pole nalezenych
+    uzlu (None pro chybejici klice) ve stejnem poradi. Staci uzly
+    s atributy key, parent, left a right. Pokud klice nejsou serazene,
+    vyvola ValueError.
+
+    Podle velikosti davky k vybere jeden ze tri postupu (meze odpovidaji
+    mereni v benchmarks.py, v Pythonu je krok pruchodu drazsi nez krok
+    sestupu):
+        k < sqrt(n)         kazdy klic samostatne od korene
+        k < n / 4           hledani od prstu, O(k log(n / k))
+        jinak               slevani s pruchodem stromu, O(n + k)
+    """
+    keys = list(keys)
+    _check_sorted(keys)
+    if root is None or not keys:
+        return [None] * len(keys)
+    if len(keys) * len(keys) < count:
+        return [_search(root, key) for key in keys]
+    if 4 * len(keys) < count:
+        return _finger_search(root, keys)
+    return _merge_search(root, keys)
+
+
+def search_many(tree: BinarySearchTree,
+                keys: Iterable[Any]) -> List[Optional[Node]]:
+    """Vyhleda najednou vsechny klice neklesajici posloupnosti 'keys'
+    a vrati pole nalezenych uzlu (None pro klice, ktere ve strome
+    nejsou) ve stejnem poradi jako klice. Velke davky
+    netrvaji O(k log n) jako k hledani od korene, ale O(k log(n / k)),
+    resp. O(n + k) (viz search_sorted()).
+    """
+    keys = list(keys)
+    if tree.bloom is None:
+        return search_sorted(tree.root, keys, size(tree))
+    _check_sorted(keys)
+    bloom = tree.bloom
+    present = [bloom_filter.contains(bloom, key) for key in keys]
+    found = iter(search_sorted(tree.root, [key for key, maybe in
+                                           zip(keys, present) if maybe],
+                               size(tree)))
+    return [next(found) if maybe else None for maybe in present]
+
+
+def set_bloom_filter(tree: BinarySearchTree,
+                     bloom: Optional[BloomFilter]) -> None:
+    """Nastavi stromu 'tree' Bloomuv filtr 'bloom' a vlozi do nej klice,
+    ktere uz strom obsahuje. Hodnota None filtr vypne.
+    """
+    tree.bloom = bloom
+    if bloom is None:
+        return
+    stack = [tree.root] if tree.root is not None else []
+    while stack:
+        node = stack.pop()
+        bloom_filter.insert(bloom, node.key)
+        for child in node.left, node.right:
+            if child is not None:
+                stack.append(child)
+
+
 def transplant(tree: BinarySearchTree, u: Node, v: Optional[Node]) -> None:
     if u.parent is None:
         tree.root = v
@@ -91,39 +339,362 @@ def delete(tree: BinarySearchTree, node: Node) -> None:
     """Smaze uzel 'node' ze stromu 'tree' a obnovi vlastnost vyhledavaciho
     stromu.
     """
+    if tree.bloom is not None:
+        bloom_filter.remove(tree.bloom, node.key)
+    # nejnizsi uzel, jehoz podstrom se zmenil (odtud se vyvazuje AVL)
+    changed = node.parent
     if node.left is None:
         transplant(tree, node, node.right)
     elif node.right is None:
         transplant(tree, node, node.left)
     else:
         y = minimal(node.right)
+        changed = y
         if y.parent != node:
+            changed = y.parent
             transplant(tree, y, y.right)
             y.right = node.right
             node.right.parent = y
         transplant(tree, node, y)
         y.left = node.left
         node.left.parent = y
+        y.height = node.height
+        y.size = node.size
+    ancestor = changed
+    while ancestor is not None:
+        ancestor.size -= 1
+        ancestor = ancestor.parent
+    if tree.avl:
+        _rebalance(tree, changed)
+    elif tree.scapegoat and size(tree) < tree.alpha * tree.max_size:
+        if tree.root is not None:
+            rebuild(tree, tree.root)
+        tree.max_size = size(tree)
+
+
+def rebuild(tree: BinarySearchTree, node: Node) -> Node:
+    """Prestavi podstrom s korenem 'node' na dokonale vyvazeny v case
+    O(k) pro k uzlu podstromu a vrati jeho novy koren. Uzly (a reference
+    na ne) zustavaji zachovany, meni se jen jejich propojeni.
+    """
+    parent = node.parent
+    is_left = parent is not None and parent.left is node
+    first = minimal(node)
+    assert first is not None
+    nodes = list(islice(_walk(first, successor), node.size))
+
+    def relink(old: Node, depth: int, count: int) -> Node:
+        old.left = old.right = None
+        old.size = count
+        return old
+
+    root = build_balanced(iter(nodes), len(nodes), relink)
+    assert root is not None
+    root.parent = parent
+    if parent is None:
+        tree.root = root
+    elif is_left:
+        parent.left = root
+    else:
+        parent.right = root
+    return root
 
 
-def _height(node: Optional[Node]) -> int:
+def _scapegoat_insert(tree: BinarySearchTree, node: Node) -> None:
+    """Po vlozeni uzlu 'node' do scapegoat stromu: je-li uzel hloubeji
+    nez log_(1/alpha) n, najde na ceste ke koreni prvniho predka, jehoz
+    potomek ma vic nez alpha nasobek jeho uzlu (scapegoat), a jeho
+    podstrom prestavi.
+    """
+    assert tree.root is not None
+    tree.max_size = max(tree.max_size, tree.root.size)
+    depth = 0
+    ancestor = node
+    while ancestor.parent is not None:
+        depth += 1
+        ancestor = ancestor.parent
+    if depth <= math.log(tree.root.size, 1 / tree.alpha):
+        return
+    child, ancestor = node, node.parent
+    while ancestor.parent is not None and \
+            child.size <= tree.alpha * ancestor.size:
+        child, ancestor = ancestor, ancestor.parent
+    rebuild(tree, ancestor)
+
+
+# Pruchod stromem v poradi klicu. Funkce vyuzivaji jen atributy key,
+# parent, left a right, takze funguji i pro uzly modulu red_black_tree
+# a treap. Dalsi uzel se hleda po rodicich bez zasobniku: jeden krok
+# muze trvat O(h), ale pruchod celym stromem projde kazdou hranu
+# nejvyse dvakrat, tedy O(1) amortizovane na krok. Generatory si dalsi
+# uzel zjisti pred vydanim aktualniho, takze prave vydany uzel lze
+# smazat funkci delete(); jine zmeny stromu behem pruchodu nejsou
+# dovoleny.
+
+
+def maximal(node: Optional[Node]) -> Optional[Node]:
     if node is None:
-        return -1
-    return 1 + max(_height(node.left), _height(node.right))
+        return None
+    while node.right is not None:
+        node = node.right
+    return node
+
+
+def successor(node: Node) -> Optional[Node]:
+    """Vraci uzel s nejblizsim vetsim klicem (None pro posledni uzel)."""
+    if node.right is not None:
+        return minimal(node.right)
+    parent = node.parent
+    while parent is not None and node is parent.right:
+        node, parent = parent, parent.parent
+    return parent
+
+
+def predecessor(node: Node) -> Optional[Node]:
+    """Vraci uzel s nejblizsim mensim klicem (None pro prvni uzel)."""
+    if node.left is not None:
+        return maximal(node.left)
+    parent = node.parent
+    while parent is not None and node is parent.left:
+        node, parent = parent, parent.parent
+    return parent
+
+
+def lower_bound(tree: BinarySearchTree, key: Any) -> Optional[Node]:
+    """Vraci uzel s nejmensim klicem >= 'key' v case O(h) (None, pokud
+    takovy neexistuje).
+    """
+    result = None
+    node = tree.root
+    while node is not None:
+        if node.key < key:
+            node = node.right
+        else:
+            result, node = node, node.left
+    return result
+
+
+def _walk(node: Optional[Node],
+          step: Callable[[Node], Optional[Node]]) -> Iterator[Node]:
+    while node is not None:
+        following = step(node)
+        yield node
+        node = following
+
+
+def iter_forward(tree: BinarySearchTree) -> Iterator[Node]:
+    """Postupne vraci uzly stromu od nejmensiho klice k nejvetsimu."""
+    return _walk(minimal(tree.root), successor)
+
+
+def iter_backward(tree: BinarySearchTree) -> Iterator[Node]:
+    """Postupne vraci uzly stromu od nejvetsiho klice k nejmensimu."""
+    return _walk(maximal(tree.root), predecessor)
+
+
+def iter_range(tree: BinarySearchTree, low: Any, high: Any) -> Iterator[Node]:
+    """Postupne vraci uzly s klici low <= klic < high v rostoucim poradi.
+    Prvni uzel najde v case O(h), dalsi uz jen prochazi naslednikem, takze
+    k klicu rozsahu trva O(h + k) bez ohledu na velikost stromu.
+    """
+    for node in _walk(lower_bound(tree, low), successor):
+        if not node.key < high:
+            return
+        yield node
+
+
+def build_sorted(keys: Iterable[Any],
+                 make_node: Callable[[Any, int], Any]) -> \
+        Tuple[List[Tuple[Any, int]], int]:
+    """Postavi z rostouci posloupnosti klicu 'keys' strom minimalni vysky
+    v case O(n), bez porovnavani klicu a bez ulozeni posloupnosti do pole.
+    Uzly vytvari funkce 'make_node(key, size)', staci, aby mely atributy
+    key, parent, left a right; size je pocet uzlu podstromu uzlu (plati
+    pro vsechny uzly krome uzlu prave hrany).
+
+    Klic s poradim i (od 1) lezi v myslenem dokonalem strome ve vysce
+    h = pocet nul na konci binarniho zapisu i. Jeho levy potomek je
+    posledni uzel vysky h - 1 a pokud je sam pravym potomkem, jeho rodic
+    je posledni uzel vysky h + 1, proto staci pamatovat si posledni uzel
+    kazde vysky. Neuplnou zustane jen prava hrana stromu: jeji uzly
+    x_1, x_2, ..., x_k (s klesajici vyskou) maji za leveho potomka
+    dokonaly strom, ale x_j.right jeste nemusi ukazovat na x_(j + 1).
+
+    Vraci dvojici (prava hrana jako pole dvojic (uzel, vyska) od korene,
+    pocet klicu).
+    """
+    last: List[Any] = []        # posledni uzel kazde vysky
+    positions: List[int] = []   # jeho poradi
+    count = 0
+    for key in keys:
+        count += 1
+        level = (count & -count).bit_length() - 1
+        node = make_node(key, (2 << level) - 1)
+        if level > 0:
+            node.left = last[level - 1]
+            node.left.parent = node
+        if (count >> (level + 1)) & 1:
+            node.parent = last[level + 1]
+            node.parent.right = node
+        if level == len(last):
+            last.append(node)
+            positions.append(count)
+        else:
+            last[level] = node
+            positions[level] = count
+
+    spine: List[Tuple[Any, int]] = []
+    for level in range(len(last) - 1, -1, -1):
+        if not spine or positions[level] > positions[spine[-1][1]]:
+            spine.append((last[level], level))
+    return spine, count
+
+
+def build_balanced(keys: Iterator[Any], size: int,
+                   make_node: Callable[[Any, int, int], Any]) -> Optional[Any]:
+    """Postavi z prvnich 'size' klicu rostouciho iteratoru 'keys' dokonale
+    vyvazeny strom (velikosti podstromu kazdeho uzlu se lisi nejvyse
+    o 1) v case O(n) a vrati jeho koren. Uzly vytvari funkce
+    'make_node(key, depth, size)', kde depth je hloubka uzlu a size pocet
+    uzlu jeho podstromu. Vsechny listy
+    lezi v hloubce floor(log2 size) nebo o 1 mensi. Rekurze je hluboka
+    jen O(log n). Pokud iterator skonci drive, vyvola ValueError.
+    """
+    def build(count: int, depth: int) -> Optional[Any]:
+        if count == 0:
+            return None
+        left = build(count // 2, depth + 1)
+        try:
+            node = make_node(next(keys), depth, count)
+        except StopIteration:
+            raise ValueError("posloupnost je kratsi nez {}".format(size))
+        right = build(count - 1 - count // 2, depth + 1)
+        node.left, node.right = left, right
+        for child in left, right:
+            if child is not None:
+                child.parent = node
+        return node
+
+    return build(size, 0)
+
+
+def _sized(key: Any, size: int) -> Node:
+    node = Node(key)
+    node.size = size
+    return node
+
+
+def sorted_size(keys: Iterable[Any], size: Optional[int]) -> Optional[int]:
+    """Vraci pocet klicu posloupnosti 'keys', pokud je znamy (parametr
+    'size' nebo len()), jinak None.
+    """
+    if size is None and isinstance(keys, Sized):
+        size = len(keys)
+    return size
+
+
+def from_sorted(keys: Iterable[Any],
+                size: Optional[int] = None) -> BinarySearchTree:
+    """Vytvori binarni vyhledavaci strom z rostouci posloupnosti klicu
+    'keys' v case O(n), bez porovnavani klicu a bez ukladani posloupnosti
+    do pole. Je-li znamy pocet klicu (parametr 'size' nebo len(keys)),
+    je strom dokonale vyvazeny, jinak (obecny iterator) ma aspon
+    minimalni moznou vysku floor(log2 n).
+    """
+    tree = BinarySearchTree()
+    size = sorted_size(keys, size)
+    if size is not None:
+        tree.root = build_balanced(iter(keys), size,
+                                   lambda key, depth, count: _sized(key, count))
+        return tree
+
+    spine, _ = build_sorted(keys, _sized)
+    for (node, _), (following, _) in zip(spine, spine[1:]):
+        node.right = following
+        following.parent = node
+    for node, _ in reversed(spine):
+        update_size(node)
+    tree.root = spine[0][0] if spine else None
+    return tree
+
+
+def size(tree: BinarySearchTree) -> int:
+    """Vraci pocet klicu ve strome 'tree' v case O(1)."""
+    return _node_size(tree.root)
+
+
+def select(tree: BinarySearchTree, k: int) -> Node:
+    """Vraci uzel s k-tym nejmensim klicem (k od 0) v case O(h). Pro
+    k mimo rozsah 0 <= k < size(tree) vyvola IndexError.
+    """
+    if not 0 <= k < size(tree):
+        raise IndexError("poradi {} mimo rozsah stromu".format(k))
+    node = tree.root
+    while True:
+        assert node is not None
+        left = _node_size(node.left)
+        if k < left:
+            node = node.left
+        elif k == left:
+            return node
+        else:
+            k -= left + 1
+            node = node.right
+
+
+def rank(tree: BinarySearchTree, key: Any) -> int:
+    """Vraci pocet klicu stromu mensich nez 'key' v case O(h). Klic
+    'key' ve strome byt nemusi.
+    """
+    result = 0
+    node = tree.root
+    while node is not None:
+        if node.key < key:
+            result += _node_size(node.left) + 1
+            node = node.right
+        else:
+            node = node.left
+    return result
+
+
+def count_range(tree: BinarySearchTree, low: Any, high: Any) -> int:
+    """Vraci pocet klicu low <= klic < high v case O(h)."""
+    if not low < high:
+        return 0
+    return rank(tree, high) - rank(tree, low)
+
+
+def _height(node: Optional[Node]) -> int:
+    """Vraci vysku podstromu s korenem 'node' pruchodem po patrech."""
+    result = -1
+    level = [node] if node is not None else []
+    while level:
+        result += 1
+        level = [child for parent in level
+                 for child in (parent.left, parent.right) if child is not None]
+    return result
 
 
 def height(tree: BinarySearchTree) -> int:
-    """Vraci vysku stromu 'tree'."""
+    """Vraci vysku stromu 'tree'. Ve strome v rezimu AVL ji precte
+    z korene v case O(1).
+    """
+    if tree.avl:
+        return _node_height(tree.root)
     return _height(tree.root)
 
 
 def _is_correct(node: Optional[Node], min_val: Any, max_val: Any) -> bool:
-    if node is None:
-        return True
-    if node.key < min_val or node.key > max_val:
-        return False
-    return (_is_correct(node.left, min_val, node.key) and
-            _is_correct(node.right, node.key, max_val))
+    stack = [(node, min_val, max_val)]
+    while stack:
+        node, min_val, max_val = stack.pop()
+        if node is None:
+            continue
+        if node.key < min_val or node.key > max_val:
+            return False
+        stack.append((node.right, node.key, max_val))
+        stack.append((node.left, min_val, node.key))
+    return True
 
 
 def is_correct_bst(tree: BinarySearchTree) -> bool:
@@ -147,15 +718,20 @@ def make_graphviz(node: Optional[Node], dot_file: TextIO) -> None:
     if node is None:
         return
 
-    dot_file.write('"{}" [label="{}"]\n'.format(id(node), node.key))
-
-    for child, side in (node.left, 'L'), (node.right, 'R'):
-        if child is not None:
-            dot_file.write('"{}" -> "{}"\n'.format(id(node), id(child)))
-            make_graphviz(child, dot_file)
-        else:
+    # zasobnik trojic (rodic, potomek, strana) v poradi pruchodu preorder
+    stack: List[Tuple[Optional[Node], Optional[Node], str]] = [
+        (None, node, '')]
+    while stack:
+        parent, child, side = stack.pop()
+        if child is None:
             dot_file.write('{nil} [label="",color=white]\n{node} -> {nil}\n'
-                           .format(node=id(node), nil=side + str(id(node))))
+                           .format(node=id(parent), nil=side + str(id(parent))))
+            continue
+        if parent is not None:
+            dot_file.write('"{}" -> "{}"\n'.format(id(parent), id(child)))
+        dot_file.write('"{}" [label="{}"]\n'.format(id(child), child.key))
+        stack.append((child, child.right, 'R'))
+        stack.append((child, child.left, 'L'))
 
 
 def make_graph(tree: BinarySearchTree, filename: str) -> None:
@@ -377,9 +953,351 @@ def test_is_correct_bst() -> None:
         make_graph(tree, "correct.dot")
 
 
+def helper_test_bloom_filter(tree: BinarySearchTree) -> bool:
+    set_bloom_filter(tree, BloomFilter(100, 0.01, counting=True))
+
+    for key in range(7):
+        node = search(tree, key)
+        if node is None or node.key != key:
+            print("NOK - klic {} nebyl s filtrem nalezen".format(key))
+            return False
+
+    if search(tree, 7) is not None:
+        print("NOK - hledani prvku, ktery se ve strome nevyskytuje")
+        return False
+
+    insert(tree, 7)
+    node = search(tree, 7)
+    if node is None or node.key != 7:
+        print("NOK - vlozeny klic 7 nebyl s filtrem nalezen")
+        return False
+
+    node = search(tree, 2)
+    assert node is not None and tree.bloom is not None
+    delete(tree, node)
+    if search(tree, 2) is not None or bloom_filter.contains(tree.bloom, 2):
+        print("NOK - smazany klic 2 zustal ve filtru")
+        return False
+
+    print("OK")
+    return True
+
+
+def test_bloom_filter() -> None:
+    print("Test 6. bloom filter: ", end='')
+    tree = init_test_tree()
+
+    if not helper_test_bloom_filter(tree):
+        make_graph(tree, "bloom.dot")
+
+
+def helper_test_degenerate(tree: BinarySearchTree) -> bool:
+    count = 5000
+    for key in range(count):
+        insert(tree, key)
+
+    if height(tree) != count - 1 or not is_correct_bst(tree):
+        print("NOK - chybna vyska nebo tvar degenerovaneho stromu")
+        return False
+
+    node = search(tree, count - 1)
+    if node is None or node.parent is None or node.parent.key != count - 2:
+        print("NOK - vlozeny uzel nema nastaveneho rodice")
+        return False
+
+    for key in range(0, count, 2):
+        node = search(tree, key)
+        assert node is not None
+        delete(tree, node)
+
+    if (search(tree, 0) is not None or search(tree, 1) is None or
+            height(tree) != count // 2 - 1 or not is_correct_bst(tree)):
+        print("NOK - chybne mazani vlozenych uzlu")
+        return False
+
+    print("OK")
+    return True
+
+
+def test_degenerate() -> None:
+    print("Test 7. degenerovany strom bez rekurze: ", end='')
+    tree = BinarySearchTree()
+
+    if not helper_test_degenerate(tree):
+        make_graph(tree, "degenerate.dot")
+
+
+def is_avl_balanced(tree: BinarySearchTree) -> bool:
+    """Overi, zdali ma kazdy uzel stromu 'tree' spravne ulozenou vysku
+    a zdali se vysky jeho podstromu lisi nejvyse o 1.
+    """
+    stack = [tree.root] if tree.root is not None else []
+    order = []
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(c for c in (node.left, node.right) if c is not None)
+    for node in reversed(order):
+        left, right = _node_height(node.left), _node_height(node.right)
+        if node.height != 1 + max(left, right) or abs(left - right) > 1:
+            return False
+    return True
+
+
+def helper_test_avl(tree: BinarySearchTree) -> bool:
+    count = 1000
+    for key in range(count):
+        insert(tree, key)
+
+    if (not is_correct_bst(tree) or not is_avl_balanced(tree) or
+            height(tree) != _height(tree.root) or height(tree) > 14):
+        print("NOK - chybne vyvazovani pri vkladani")
+        return False
+
+    for key in range(0, count, 3):
+        node = search(tree, key)
+        assert node is not None
+        delete(tree, node)
+    while tree.root is not None and tree.root.key < count // 2:
+        delete(tree, tree.root)
+
+    if (not is_correct_bst(tree) or not is_avl_balanced(tree) or
+            search(tree, 3) is not None or search(tree, count - 2) is None):
+        print("NOK - chybne vyvazovani pri mazani")
+        return False
+
+    print("OK")
+    return True
+
+
+def test_avl() -> None:
+    print("Test 8. vyvazovani AVL: ", end='')
+    tree = BinarySearchTree(avl=True)
+
+    if not helper_test_avl(tree):
+        make_graph(tree, "avl.dot")
+
+
+def helper_test_from_sorted() -> bool:
+    for count in range(100):
+        for keys in iter(range(count)), range(count):
+            tree = from_sorted(keys)
+            if (not is_correct_bst(tree) or
+                    height(tree) != count.bit_length() - 1):
+                print("NOK - chybny tvar stromu z {} klicu".format(count))
+                return False
+            for key in range(count):
+                node = search(tree, key)
+                if node is None or \
+                        (node.parent is None) != (node is tree.root):
+                    print("NOK - klic {} chybi nebo nema rodice".format(key))
+                    return False
+
+    print("OK")
+    return True
+
+
+def test_from_sorted() -> None:
+    print("Test 9. from_sorted: ", end='')
+
+    helper_test_from_sorted()
+
+
+def has_correct_sizes(tree: BinarySearchTree) -> bool:
+    """Overi, zdali ma kazdy uzel stromu 'tree' spravne ulozenou velikost
+    podstromu.
+    """
+    stack = [tree.root] if tree.root is not None else []
+    order = []
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        stack.extend(c for c in (node.left, node.right) if c is not None)
+    for node in reversed(order):
+        if node.size != 1 + _node_size(node.left) + _node_size(node.right):
+            return False
+    return True
+
+
+def helper_test_order_statistics() -> bool:
+    keys = [(key * 37) % 101 for key in range(101)]
+    for tree in BinarySearchTree(), BinarySearchTree(avl=True):
+        for key in keys:
+            insert(tree, key * 2)
+        for key in keys[::3]:
+            node = search(tree, key * 2)
+            assert node is not None
+            delete(tree, node)
+        expected = sorted(key * 2 for key in set(keys) - set(keys[::3]))
+
+        if not has_correct_sizes(tree) or size(tree) != len(expected):
+            print("NOK - chybne udrzovane velikosti podstromu")
+            return False
+        if [select(tree, k).key for k in range(len(expected))] != expected:
+            print("NOK - chybny select")
+            return False
+        if (any(rank(tree, key) != k for k, key in enumerate(expected)) or
+                rank(tree, 7) != sum(key < 7 for key in expected) or
+                count_range(tree, 10, 101) !=
+                sum(10 <= key < 101 for key in expected) or
+                count_range(tree, 50, 10) != 0):
+            print("NOK - chybny rank nebo count_range")
+            return False
+
+    for keys_iter in iter(range(50)), range(50):
+        if not has_correct_sizes(from_sorted(keys_iter)):
+            print("NOK - chybne velikosti po from_sorted")
+            return False
+
+    try:
+        select(tree, len(expected))
+    except IndexError:
+        print("OK")
+        return True
+    print("NOK - select mimo rozsah nevyvolal IndexError")
+    return False
+
+
+def test_order_statistics() -> None:
+    print("Test 10. select, rank a count_range: ", end='')
+
+    helper_test_order_statistics()
+
+
+def helper_test_iterators(tree: BinarySearchTree) -> bool:
+    keys = [(key * 37) % 101 * 2 for key in range(101)]
+    for key in keys:
+        insert(tree, key)
+    expected = sorted(keys)
+
+    if ([node.key for node in iter_forward(tree)] != expected or
+            [node.key for node in iter_backward(tree)] != expected[::-1]):
+        print("NOK - chybny pruchod v poradi klicu")
+        return False
+
+    for low, high in (-5, 300), (10, 21), (11, 12), (50, 50), (199, 250):
+        if ([node.key for node in iter_range(tree, low, high)] !=
+                [key for key in expected if low <= key < high]):
+            print("NOK - chybny rozsah <{}, {})".format(low, high))
+            return False
+
+    node = search(tree, 100)
+    assert node is not None
+    after, before = successor(node), predecessor(node)
+    if (after is None or after.key != 102 or before is None or
+            before.key != 98 or predecessor(minimal(tree.root)) is not None or
+            successor(maximal(tree.root)) is not None):
+        print("NOK - chybny naslednik nebo predchudce")
+        return False
+
+    for node in iter_range(tree, 20, 60):
+        delete(tree, node)
+    if [node.key for node in iter_forward(tree)] != \
+            [key for key in expected if not 20 <= key < 60]:
+        print("NOK - chybne mazani behem pruchodu")
+        return False
+
+    print("OK")
+    return True
+
+
+def test_iterators() -> None:
+    print("Test 11. iteratory a rozsahy: ", end='')
+    tree = BinarySearchTree(avl=True)
+
+    if not helper_test_iterators(tree):
+        make_graph(tree, "iterators.dot")
+
+
+def helper_test_scapegoat(tree: BinarySearchTree) -> bool:
+    count = 1000
+    for key in range(count):
+        insert(tree, key)
+        if height(tree) > math.log(size(tree), 1 / tree.alpha) + 1:
+            print("NOK - prilis vysoky strom po vlozeni {}".format(key))
+            return False
+
+    if (not is_correct_bst(tree) or not has_correct_sizes(tree) or
+            [node.key for node in iter_forward(tree)] != list(range(count))):
+        print("NOK - chybna prestavba pri vkladani")
+        return False
+
+    for key in range(0, count, 4):
+        node = search(tree, key)
+        assert node is not None
+        delete(tree, node)
+    for node in iter_range(tree, 0, count * 3 // 4):
+        delete(tree, node)
+
+    if (not is_correct_bst(tree) or not has_correct_sizes(tree) or
+            tree.max_size >= count or
+            height(tree) > math.log(tree.max_size, 1 / tree.alpha) + 1 or
+            [node.key for node in iter_forward(tree)] !=
+            [key for key in range(count * 3 // 4, count) if key % 4]):
+        print("NOK - chybna prestavba pri mazani")
+        return False
+
+    try:
+        BinarySearchTree(avl=True, scapegoat=True)
+    except ValueError:
+        print("OK")
+        return True
+    print("NOK - AVL a scapegoat zaroven nevyvolalo ValueError")
+    return False
+
+
+def test_scapegoat() -> None:
+    print("Test 12. scapegoat strom: ", end='')
+    tree = BinarySearchTree(scapegoat=True)
+
+    if not helper_test_scapegoat(tree):
+        make_graph(tree, "scapegoat.dot")
+
+
+def helper_test_search_many(tree: BinarySearchTree) -> bool:
+    for key in range(1000):
+        insert(tree, (key * 37) % 1000 * 3)
+
+    for keys in ([], [-1, 0, 3, 4, 2997, 3000], list(range(-10, 3010, 31)),
+                 list(range(-10, 3010, 7))):
+        for bloom in None, BloomFilter(1000, 0.01):
+            set_bloom_filter(tree, bloom)
+            nodes = search_many(tree, keys)
+            if [None if node is None else node.key for node in nodes] != \
+                    [key if 0 <= key < 3000 and key % 3 == 0 else None
+                     for key in keys]:
+                print("NOK - chybne hromadne hledani {} klicu"
+                      .format(len(keys)))
+                return False
+
+    try:
+        search_many(tree, [6, 3])
+    except ValueError:
+        print("OK")
+        return True
+    print("NOK - neserazene klice nevyvolaly ValueError")
+    return False
+
+
+def test_search_many() -> None:
+    print("Test 13. search_many: ", end='')
+    tree = BinarySearchTree()
+
+    if not helper_test_search_many(tree):
+        make_graph(tree, "search_many.dot")
+
+
 if __name__ == '__main__':
     test_insert()
     test_delete()
     test_search()
     test_height()
     test_is_correct_bst()
+    test_bloom_filter()
+    test_degenerate()
+    test_avl()
+    test_from_sorted()
+    test_order_statistics()
+    test_iterators()
+    test_scapegoat()
+    test_search_many()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+import math
+from typing import Any, Iterator, Optional
+
+
+MASK = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15   # 2^64 / zlaty rez, multiplikativni hasovani
+MAX_COUNT = 255   # saturace citace v pocitacim Bloomove filtru
+
+# Kdy se filtr vyplati: contains() (jeden hash a u chybejiciho klice
+# v prumeru dve testovane pozice) stoji zhruba tolik jako 10-20 kroku
+# sestupu stromem. Pri 80 % neuspesnych hledani (benchmarks.py
+# bloom_filter) je filtr pro 1000 klicu asi 2x pomalejsi, pro 10000
+# klicu (policka HashTable s 1000 klici, BST vysky ~30) vychazi nastejno
+# a pro 100000 klicu zrychli get_hashtable asi 1.3x a hledani v BST
+# 1.7x. Filtr ma tedy smysl u velkych ci degenerovanych stromu, dlouhych
+# retezcu a klicu s drahym porovnanim, ne u malych struktur.
+
+
+class BloomFilter:
+    """Trida BloomFilter reprezentuje pravdepodobnostni mnozinu, ktera
+    umi rychle odpovedet, ze se klic v mnozine urcite nenachazi.
+    Odpoved "mozna se nachazi" muze byt s pravdepodobnosti 'error_rate'
+    chybna (false positive).
+
+    Atributy:
+        size        pocet pozic (bitu, resp. citacu) filtru, mocnina dvou
+        hash_count  pocet hasovacich funkci
+        bits        bitove pole filtru (None u pocitaciho filtru)
+        counters    pole citacu (None u obycejneho filtru), umoznuje
+                    odebirani klicu
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01,
+                 counting: bool = False) -> None:
+        capacity = max(1, capacity)
+        size = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        # pozice se pak vybiraji maskou misto deleni modulo; vetsi filtr
+        # ma jen nizsi miru falesne pozitivnich odpovedi
+        self.size: int = 1 << (max(8, size) - 1).bit_length()
+        self.hash_count: int = max(1, round(size / capacity * math.log(2)))
+        self.bits: Optional[bytearray] = None
+        self.counters: Optional[bytearray] = None
+        if counting:
+            self.counters = bytearray(self.size)
+        else:
+            self.bits = bytearray((self.size + 7) // 8)
+
+
+def _positions(bloom: BloomFilter, key: Any) -> Iterator[int]:
+    """Vraci 'hash_count' pozic klice 'key' ve filtru 'bloom'. Pouziva
+    dvojite hasovani h1 + i * h2 z jedineho multiplikativniho hashe;
+    contains() pocita tytez pozice primo ve smycce.
+    """
+    h = hash(key) * GOLDEN & MASK
+    h ^= h >> 32
+    step = h >> 32 | 1
+    mask = bloom.size - 1
+    for _ in range(bloom.hash_count):
+        yield h & mask
+        h += step
+
+
+def insert(bloom: BloomFilter, key: Any) -> None:
+    """Vlozi klic 'key' do filtru 'bloom'."""
+    if bloom.counters is not None:
+        for pos in _positions(bloom, key):
+            if bloom.counters[pos] < MAX_COUNT:
+                bloom.counters[pos] += 1
+        return
+    assert bloom.bits is not None
+    for pos in _positions(bloom, key):
+        bloom.bits[pos >> 3] |= 1 << (pos & 7)
+
+
+def contains(bloom: BloomFilter, key: Any) -> bool:
+    """Vraci False, pokud se klic 'key' ve filtru 'bloom' urcite
+    nenachazi. True znamena, ze se klic ve filtru mozna nachazi.
+    """
+    # stejne pozice jako _positions(), bez generatoru: u chybejicich
+    # klicu konci smycka obvykle po prvnich dvou pozicich
+    h = hash(key) * GOLDEN & MASK
+    h ^= h >> 32
+    step = h >> 32 | 1
+    mask = bloom.size - 1
+    counters = bloom.counters
+    if counters is not None:
+        for _ in range(bloom.hash_count):
+            if not counters[h & mask]:
+                return False
+            h += step
+        return True
+    bits = bloom.bits
+    assert bits is not None
+    for _ in range(bloom.hash_count):
+        pos = h & mask
+        if not bits[pos >> 3] >> (pos & 7) & 1:
+            return False
+        h += step
+    return True
+
+
+def remove(bloom: BloomFilter, key: Any) -> None:
+    """Odebere jeden vyskyt klice 'key' z pocitaciho filtru 'bloom'.
+    Obycejny filtr odebirani neumi, zustane proto beze zmeny (odpovedi
+    jsou dale korektni, jen roste pocet falesne pozitivnich).
+    Saturovane citace se nesnizuji, nevime kolik vlozeni zaznamenaly.
+    """
+    if bloom.counters is None or not contains(bloom, key):
+        return
+    for pos in _positions(bloom, key):
+        if 0 < bloom.counters[pos] < MAX_COUNT:
+            bloom.counters[pos] -= 1
+
+
+# Testy implementace
+
+def test_insert_contains() -> None:
+    print("Test 1. vkladani a hledani (insert, contains): ", end="")
+    for counting in False, True:
+        bloom = BloomFilter(1000, 0.01, counting)
+        for key in range(0, 2000, 2):
+            insert(bloom, key)
+        for key in range(0, 2000, 2):
+            if not contains(bloom, key):
+                print("NOK - vlozeny klic {} nebyl nalezen".format(key))
+                return
+    print("OK")
+
+
+def test_error_rate() -> None:
+    print("Test 2. mira falesne pozitivnich odpovedi: ", end="")
+    bloom = BloomFilter(10000, 0.01)
+    for key in range(10000):
+        insert(bloom, key)
+    false_positives = sum(contains(bloom, key)
+                          for key in range(10000, 110000))
+    rate = false_positives / 100000
+    if rate > 0.02:
+        print("NOK - mira {} je vyrazne vyssi nez 0.01".format(rate))
+        return
+    print("OK")
+
+
+def test_remove() -> None:
+    print("Test 3. odebirani z pocitaciho filtru (remove): ", end="")
+    bloom = BloomFilter(100, 0.001, counting=True)
+    insert(bloom, 'A')
+    insert(bloom, 'B')
+    insert(bloom, 'B')
+    remove(bloom, 'A')
+    if contains(bloom, 'A'):
+        print("NOK - odebrany klic 'A' je stale ve filtru")
+        return
+    remove(bloom, 'B')
+    if not contains(bloom, 'B'):
+        print("NOK - klic 'B' byl vlozen dvakrat, odebran jednou")
+        return
+    remove(bloom, 'B')
+    if contains(bloom, 'B'):
+        print("NOK - odebrany klic 'B' je stale ve filtru")
+        return
+    print("OK")
+
+
+if __name__ == '__main__':
+    test_insert_contains()
+    test_error_rate()
+    test_remove()
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+import random
+from bisect import bisect_left, bisect_right
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+
+# B+strom: vyhledavaci strom s vysokym vetvenim (fanout). Vnitrni uzly
+# obsahuji jen oddelovaci klice a odkazy na potomky, vsechny klice
+# a hodnoty lezi v listech, ktere jsou navic zretezene zleva doprava.
+# Jeden uzel nese az 'fanout' klicu v poli, takze misto jednoho skoku po
+# referenci na kazde porovnani (jako v binarnim strome) se hleda puleni
+# intervalu (bisect) v souvislem poli a strom ma vysku jen
+# log_fanout(n). Rozsahovy dotaz najde prvni list a dal jen prochazi
+# zretezene listy.
+#
+# Potomek children[i] vnitrniho uzlu obsahuje klice k, pro ktere plati
+# keys[i - 1] <= k < keys[i]. Kazdy uzel krome korene je aspon z poloviny
+# plny, pri preteceni se rozdeli, pri podteceni si pujci od souseda nebo
+# se s nim slouci.
+#
+# B+strom je mapovani: kazdy klic je ve strome nejvyse jednou a muze mit
+# prirazenou hodnotu (data). Funkce maji stejna jmena jako v modulech
+# binary_search_tree a red_black_tree, jen delete() bere klic misto uzlu
+# a iteratory vraci dvojice (klic, hodnota).
+
+
+DEFAULT_FANOUT = 64
+
+
+class Leaf:
+    """Trida Leaf reprezentuje list B+stromu.
+
+    Atributy:
+        keys    serazene klice listu
+        values  hodnoty prirazene klicum (na stejnych pozicich)
+        next    reference na nasledujici list (None u posledniho)
+    """
+
+    def __init__(self, keys: Optional[List[Any]] = None,
+                 values: Optional[List[Any]] = None) -> None:
+        self.keys: List[Any] = keys if keys is not None else []
+        self.values: List[Any] = values if values is not None else []
+        self.next: Optional[Leaf] = None
+
+
+class Internal:
+    """Trida Internal reprezentuje vnitrni uzel B+stromu.
+
+    Atributy:
+        keys        oddelovaci klice, len(keys) == len(children) - 1
+        children    potomci (typu Leaf nebo Internal)
+    """
+
+    def __init__(self, keys: List[Any], children: List[Any]) -> None:
+        self.keys: List[Any] = keys
+        self.children: List[Any] = children
+
+
+class BPlusTree:
+    """Trida BPlusTree reprezentuje B+strom.
+
+    Atributy:
+        root    korenovy uzel (list, dokud se nevejde do jednoho listu)
+        fanout  nejvetsi pocet klicu listu a potomku vnitrniho uzlu
+        size    pocet klicu ve strome
+    """
+
+    def __init__(self, fanout: int = DEFAULT_FANOUT) -> None:
+        if fanout < 3:
+            raise ValueError("fanout {} je mensi nez 3".format(fanout))
+        self.root: Union[Leaf, Internal] = Leaf()
+        self.fanout: int = fanout
+        self.size: int = 0
+
+
+def _find_leaf(tree: BPlusTree, key: Any) -> Leaf:
+    node = tree.root
+    while isinstance(node, Internal):
+        node = node.children[bisect_right(node.keys, key)]
+    return node
+
+
+def _path(tree: BPlusTree, key: Any) -> Tuple[Leaf, List[Tuple[Internal, int]]]:
+    """Vraci list, kam patri klic 'key', a cestu k nemu jako pole dvojic
+    (vnitrni uzel, index potomka) od korene.
+    """
+    path = []
+    node = tree.root
+    while isinstance(node, Internal):
+        index = bisect_right(node.keys, key)
+        path.append((node, index))
+        node = node.children[index]
+    return node, path
+
+
+def search(tree: BPlusTree, key: Any) -> Optional[Leaf]:
+    """Vyhleda list s klicem 'key'. Pokud se klic ve strome nenachazi,
+    vraci None.
+    """
+    leaf = _find_leaf(tree, key)
+    index = bisect_left(leaf.keys, key)
+    if index < len(leaf.keys) and leaf.keys[index] == key:
+        return leaf
+    return None
+
+
+def get(tree: BPlusTree, key: Any, default: Any = None) -> Any:
+    """Vraci hodnotu prirazenou klici 'key', pripadne 'default'."""
+    leaf = _find_leaf(tree, key)
+    index = bisect_left(leaf.keys, key)
+    if index < len(leaf.keys) and leaf.keys[index] == key:
+        return leaf.values[index]
+    return default
+
+
+def _split(node: Any) -> Tuple[Any, Any]:
+    """Rozdeli preplneny uzel na dva, vraci (oddelovaci klic, pravy uzel)."""
+    if isinstance(node, Leaf):
+        middle = len(node.keys) // 2
+        leaf = Leaf(node.keys[middle:], node.values[middle:])
+        del node.keys[middle:], node.values[middle:]
+        leaf.next, node.next = node.next, leaf
+        return leaf.keys[0], leaf
+
+    middle = len(node.children) // 2
+    separator = node.keys[middle - 1]
+    right = Internal(node.keys[middle:], node.children[middle:])
+    del node.keys[middle - 1:], node.children[middle:]
+    return separator, right
+
+
+def insert(tree: BPlusTree, key: Any, value: Any = None) -> None:
+    """Vlozi klic 'key' s hodnotou 'value' do stromu 'tree'. Pokud klic
+    ve strome uz je, jen prepise jeho hodnotu.
+    """
+    leaf, path = _path(tree, key)
+    index = bisect_left(leaf.keys, key)
+    if index < len(leaf.keys) and leaf.keys[index] == key:
+        leaf.values[index] = value
+        return
+    leaf.keys.insert(index, key)
+    leaf.values.insert(index, value)
+    tree.size += 1
+    if len(leaf.keys) <= tree.fanout:
+        return
+
+    separator, right = _split(leaf)
+    while path:
+        parent, index = path.pop()
+        parent.keys.insert(index, separator)
+        parent.children.insert(index + 1, right)
+        if len(parent.children) <= tree.fanout:
+            return
+        separator, right = _split(parent)
+    tree.root = Internal([separator], [tree.root, right])
+
+
+def _entries(node: Any) -> int:
+    return len(node.keys) if isinstance(node, Leaf) else len(node.children)
+
+
+def _fix_underflow(tree: BPlusTree, node: Any,
+                   path: List[Tuple[Internal, int]]) -> None:
+    """Doplni podteceny uzel 'node' pujckou od souseda, nebo ho se
+    sousedem slouci a pokracuje v rodici.
+    """
+    minimum = (tree.fanout + 1) // 2
+    while path:
+        if isinstance(node, Leaf):
+            minimum = tree.fanout // 2
+        if _entries(node) >= minimum:
+            return
+        parent, index = path.pop()
+        left = parent.children[index - 1] if index > 0 else None
+        right = parent.children[index + 1] \
+            if index + 1 < len(parent.children) else None
+
+        if left is not None and _entries(left) > minimum:
+            if isinstance(node, Leaf):
+                node.keys.insert(0, left.keys.pop())
+                node.values.insert(0, left.values.pop())
+                parent.keys[index - 1] = node.keys[0]
+            else:
+                node.children.insert(0, left.children.pop())
+                node.keys.insert(0, parent.keys[index - 1])
+                parent.keys[index - 1] = left.keys.pop()
+            return
+        if right is not None and _entries(right) > minimum:
+            if isinstance(node, Leaf):
+                node.keys.append(right.keys.pop(0))
+                node.values.append(right.values.pop(0))
+                parent.keys[index] = right.keys[0]
+            else:
+                node.children.append(right.children.pop(0))
+                node.keys.append(parent.keys[index])
+                parent.keys[index] = right.keys.pop(0)
+            return
+
+        if left is None:
+            # slouceni s pravym sousedem = slouceni praveho souseda do uzlu
+            left, node, index = node, right, index + 1
+        if isinstance(node, Leaf):
+            left.keys += node.keys
+            left.values += node.values
+            left.next = node.next
+        else:
+            left.keys.append(parent.keys[index - 1])
+            left.keys += node.keys
+            left.children += node.children
+        del parent.keys[index - 1], parent.children[index]
+        node = parent
+        minimum = (tree.fanout + 1) // 2
+
+    if isinstance(node, Internal) and len(node.children) == 1:
+        tree.root = node.children[0]
+
+
+def delete(tree: BPlusTree, key: Any) -> bool:
+    """Smaze klic 'key' (a jeho hodnotu) ze stromu 'tree'. Vraci True,
+    pokud klic ve strome byl, jinak False.
+    """
+    leaf, path = _path(tree, key)
+    index = bisect_left(leaf.keys, key)
+    if index == len(leaf.keys) or leaf.keys[index] != key:
+        return False
+    del leaf.keys[index], leaf.values[index]
+    tree.size -= 1
+    _fix_underflow(tree, leaf, path)
+    return True
+
+
+def _chunks(count: int, capacity: int) -> List[int]:
+    """Rozdeli 'count' polozek do nejmensiho poctu uzlu s kapacitou
+    'capacity' co nejrovnomerneji, vraci velikosti uzlu.
+    """
+    nodes = max(1, -(-count // capacity))
+    return [count // nodes + (i < count % nodes) for i in range(nodes)]
+
+
+def from_sorted(keys: Iterable[Any], values: Optional[Iterable[Any]] = None,
+                fanout: int = DEFAULT_FANOUT) -> BPlusTree:
+    """Postavi B+strom z rostouci posloupnosti klicu 'keys' (a hodnot
+    'values', jinak None) v case O(n) bez jedineho deleni uzlu. Uzly se
+    plni co nejrovnomerneji, takze jsou plne a vsechny aspon z poloviny.
+    Pokud klice nejsou ostre rostouci, vyvola ValueError.
+    """
+    tree = BPlusTree(fanout)
+    keys = list(keys)
+    values = list(values) if values is not None else [None] * len(keys)
+    if len(values) != len(keys):
+        raise ValueError("pocet hodnot neodpovida poctu klicu")
+    for previous, key in zip(keys, keys[1:]):
+        if not previous < key:
+            raise ValueError("klice nejsou ostre rostouci ({} po {})"
+                             .format(key, previous))
+    tree.size = len(keys)
+    if not keys:
+        return tree
+
+    level: List[Any] = []
+    start = 0
+    for count in _chunks(len(keys), fanout):
+        leaf = Leaf(keys[start:start + count], values[start:start + count])
+        if level:
+            level[-1].next = leaf
+        level.append(leaf)
+        start += count
+    # nejmensi klic kazdeho podstromu, slouzi jako oddelovac
+    lows = [leaf.keys[0] for leaf in level]
+
+    while len(level) > 1:
+        parents, parent_lows = [], []
+        start = 0
+        for count in _chunks(len(level), fanout):
+            parents.append(Internal(lows[start + 1:start + count],
+                                    level[start:start + count]))
+            parent_lows.append(lows[start])
+            start += count
+        level, lows = parents, parent_lows
+    tree.root = level[0]
+    return tree
+
+
+def _first_leaf(tree: BPlusTree) -> Leaf:
+    node = tree.root
+    while isinstance(node, Internal):
+        node = node.children[0]
+    return node
+
+
+def iter_forward(tree: BPlusTree) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci dvojice (klic, hodnota) v rostoucim poradi klicu
+    pruchodem zretezenych listu.
+    """
+    leaf: Optional[Leaf] = _first_leaf(tree)
+    while leaf is not None:
+        yield from zip(leaf.keys, leaf.values)
+        leaf = leaf.next
+
+
+def iter_range(tree: BPlusTree, low: Any,
+               high: Any) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci dvojice (klic, hodnota) s klici low <= klic < high.
+    Prvni list najde sestupem v case O(log n), dal prochazi zretezene
+    listy.
+    """
+    first = _find_leaf(tree, low)
+    index = bisect_left(first.keys, low)
+    leaf: Optional[Leaf] = first
+    while leaf is not None:
+        end = bisect_left(leaf.keys, high)
+        yield from zip(leaf.keys[index:end], leaf.values[index:end])
+        if end < len(leaf.keys):
+            return
+        leaf, index = leaf.next, 0
+
+
+def height(tree: BPlusTree) -> int:
+    """Vraci vysku stromu (strom s jedinym listem ma vysku 0)."""
+    result = 0
+    node = tree.root
+    while isinstance(node, Internal):
+        node = node.children[0]
+        result += 1
+    return result
+
+
+# Testy implementace
+def is_correct(tree: BPlusTree) -> bool:
+    """Overi usporadani klicu a oddelovacu, zaplneni uzlu, stejnou hloubku
+    listu, jejich zretezeni a pocet klicu.
+    """
+    leaves: List[Leaf] = []
+    depths = set()
+    stack = [(tree.root, 0, None, None)]
+    while stack:
+        node, depth, low, high = stack.pop()
+        if node is not tree.root and _entries(node) < (
+                tree.fanout // 2 if isinstance(node, Leaf)
+                else (tree.fanout + 1) // 2):
+            return False
+        if (any(not a < b for a, b in zip(node.keys, node.keys[1:])) or
+                (node.keys and low is not None and node.keys[0] < low) or
+                (node.keys and high is not None and
+                 not node.keys[-1] < high)):
+            return False
+        if isinstance(node, Leaf):
+            if len(node.keys) != len(node.values) or \
+                    len(node.keys) > tree.fanout:
+                return False
+            depths.add(depth)
+            leaves.append(node)
+            continue
+        if (len(node.children) != len(node.keys) + 1 or
+                len(node.children) > tree.fanout):
+            return False
+        bounds = [low] + node.keys + [high]
+        for i in range(len(node.children) - 1, -1, -1):
+            stack.append((node.children[i], depth + 1,
+                          bounds[i], bounds[i + 1]))
+
+    for leaf, following in zip(leaves, leaves[1:] + [None]):
+        if leaf.next is not following:
+            return False
+    return len(depths) == 1 and \
+        sum(len(leaf.keys) for leaf in leaves) == tree.size
+
+
+def test_insert_search() -> None:
+    print("Test 1. Vkladani a hledani: ", end="")
+
+    for fanout in 3, 4, 7, 64:
+        tree1 = BPlusTree(fanout)
+        keys = [(key * 37) % 1009 for key in range(1009)]
+        for key in keys:
+            insert(tree1, key, key * 2)
+        insert(tree1, 5, 'pet')
+
+        if (not is_correct(tree1) or tree1.size != 1009 or
+                [key for key, _ in iter_forward(tree1)] != list(range(1009))
+                or get(tree1, 5) != 'pet' or get(tree1, 700) != 1400 or
+                search(tree1, 1009) is not None or
+                search(tree1, 13) is None):
+            print("FAIL")
+            return
+
+    print("OK")
+
+
+def test_delete() -> None:
+    print("Test 2. Mazani: ", end="")
+
+    rng = random.Random(2)
+    for fanout in 3, 4, 5, 16:
+        tree2 = BPlusTree(fanout)
+        expected = {}
+        for step in range(4000):
+            key = rng.randrange(500)
+            if rng.random() < 0.55:
+                insert(tree2, key, step)
+                expected[key] = step
+            elif delete(tree2, key) != (expected.pop(key, None) is not None):
+                print("FAIL")
+                return
+        if (not is_correct(tree2) or
+                list(iter_forward(tree2)) != sorted(expected.items())):
+            print("FAIL")
+            return
+
+        for key in list(expected):
+            delete(tree2, key)
+        if not is_correct(tree2) or tree2.size != 0 or height(tree2) != 0:
+            print("FAIL")
+            return
+
+    print("OK")
+
+
+def test_bulk_load_range() -> None:
+    print("Test 3. Hromadne nacteni a rozsahy: ", end="")
+
+    for count in 0, 1, 5, 64, 65, 1000:
+        tree3 = from_sorted(range(0, 2 * count, 2), fanout=8)
+        if (not is_correct(tree3) or
+                list(iter_range(tree3, 3, 41)) !=
+                [(key, None) for key in range(4, min(41, 2 * count), 2)] or
+                list(iter_range(tree3, 50, 10))):
+            print("FAIL")
+            return
+
+    tree3 = from_sorted(range(100), range(100, 200), fanout=5)
+    insert(tree3, 1000, 'x')
+    delete(tree3, 50)
+    if (not is_correct(tree3) or get(tree3, 7) != 107 or
+            [key for key, _ in iter_range(tree3, 48, 53)] != [48, 49, 51, 52]):
+        print("FAIL")
+        return
+
+    try:
+        from_sorted([1, 3, 3])
+    except ValueError:
+        print("OK")
+    else:
+        print("FAIL")
+
+
+if __name__ == '__main__':
+    test_insert_search()
+    test_delete()
+    test_bulk_load_range()
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+import asyncio
+import collections
+import threading
+import time
+from queue import Empty
+from typing import Any, Deque, Iterable, List, Optional
+
+from linked_list import Node
+
+
+# Fronta pro predavani prace mezi vlakny nad uzly modulu linked_list.
+#
+# Jde o frontu se dvema zamky (two-lock queue, Michael & Scott): seznam
+# zacina pomocnym uzlem (dummy), za ktery se odebira, a vklada se za
+# posledni uzel. Vkladani drzi jen zamek konce (tail_lock), odebirani jen
+# zamek zacatku (head_lock), takze producenti a konzumenti se navzajem
+# neblokuji. Diky pomocnemu uzlu se oba konce nikdy nedotykaji stejnych
+# referenci: producent meni jen next posledniho uzlu, konzument jen
+# zacatek seznamu.
+#
+# Blokujici pop() ceka na podminkove promenne svazane se zamkem zacatku.
+# Producent ji budi jen tehdy, kdyz nejaky konzument ceka, v beznem
+# provozu tedy zamek zacatku vubec nebere.
+#
+# AsyncQueue je varianta stejne struktury pro korutiny jedne smycky
+# asyncio, ktera zamky nepotrebuje a ceka na objektech Future.
+
+
+class ConcurrentQueue:
+    """Trida ConcurrentQueue reprezentuje frontu bezpecnou pro vlakna.
+
+    Atributy:
+        head        pomocny uzel, head.next je prvni prvek fronty
+        tail        posledni uzel (pri prazdne fronte pomocny uzel)
+        head_lock   zamek pro odebirani
+        tail_lock   zamek pro vkladani
+        not_empty   podminkova promenna nad head_lock pro cekajici pop()
+        waiting     pocet konzumentu cekajicich v pop()
+        pushed      pocet vlozenych prvku (meni se pod tail_lock)
+        popped      pocet odebranych prvku (meni se pod head_lock)
+    """
+
+    def __init__(self) -> None:
+        self.head: Node = Node()
+        self.tail: Node = self.head
+        self.head_lock: threading.Lock = threading.Lock()
+        self.tail_lock: threading.Lock = threading.Lock()
+        self.not_empty: threading.Condition = threading.Condition(
+            self.head_lock)
+        self.waiting: int = 0
+        self.pushed: int = 0
+        self.popped: int = 0
+
+
+def _chain(values: Iterable[Any]) -> Any:
+    """Spoji hodnoty do retezce uzlu, vraci (prvni, posledni, pocet)."""
+    first = last = Node()
+    count = 0
+    for value in values:
+        last.next = last = Node(value)
+        count += 1
+    return first.next, last, count
+
+
+def push(cqueue: ConcurrentQueue, value: Any) -> None:
+    """Vlozi hodnotu 'value' na konec fronty."""
+    node = Node(value)
+    with cqueue.tail_lock:
+        cqueue.tail.next = node
+        cqueue.tail = node
+        cqueue.pushed += 1
+    if cqueue.waiting:
+        with cqueue.not_empty:
+            cqueue.not_empty.notify()
+
+
+def push_many(cqueue: ConcurrentQueue, values: Iterable[Any]) -> None:
+    """Vlozi vsechny hodnoty 'values' na konec fronty jako jeden souvisly
+    usek (zamek konce se bere jen jednou).
+    """
+    first, last, count = _chain(values)
+    if first is None:
+        return
+    with cqueue.tail_lock:
+        cqueue.tail.next = first
+        cqueue.tail = last
+        cqueue.pushed += count
+    if cqueue.waiting:
+        with cqueue.not_empty:
+            cqueue.not_empty.notify(count)
+
+
+def _take(cqueue: ConcurrentQueue, limit: Optional[int]) -> List[Any]:
+    """Odebere ze zacatku fronty nejvyse 'limit' prvku (None = vsechny).
+    Volajici musi drzet head_lock.
+    """
+    result = []
+    head = cqueue.head
+    while head.next is not None and (limit is None or len(result) < limit):
+        head = head.next
+        result.append(head.value)
+        head.value = None
+    cqueue.head = head
+    cqueue.popped += len(result)
+    return result
+
+
+def _wait(cqueue: ConcurrentQueue, block: bool,
+          timeout: Optional[float]) -> None:
+    """Ceka, dokud fronta neni neprazdna. Pokud se prvek nedockal,
+    vyvola queue.Empty. Volajici musi drzet head_lock.
+    """
+    if cqueue.head.next is not None:
+        return
+    if not block:
+        raise Empty
+    deadline = None if timeout is None else time.monotonic() + timeout
+    cqueue.waiting += 1
+    try:
+        while cqueue.head.next is None:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise Empty
+            cqueue.not_empty.wait(remaining)
+    finally:
+        cqueue.waiting -= 1
+
+
+def pop(cqueue: ConcurrentQueue, block: bool = True,
+        timeout: Optional[float] = None) -> Any:
+    """Odebere a vrati prvni prvek fronty. Je-li fronta prazdna a 'block'
+    je True, ceka nejvyse 'timeout' sekund (None = bez omezeni), jinak
+    vyvola queue.Empty.
+    """
+    with cqueue.not_empty:
+        _wait(cqueue, block, timeout)
+        return _take(cqueue, 1)[0]
+
+
+def drain(cqueue: ConcurrentQueue, limit: Optional[int] = None,
+          block: bool = False, timeout: Optional[float] = None) -> List[Any]:
+    """Odebere najednou nejvyse 'limit' prvku (None = vsechny) a vrati
+    je jako pole. Pri 'block' True nejprve ceka na prvni prvek stejne
+    jako pop(), jinak pro prazdnou frontu vraci prazdne pole.
+    """
+    with cqueue.not_empty:
+        if block:
+            _wait(cqueue, block, timeout)
+        return _take(cqueue, limit)
+
+
+def size(cqueue: ConcurrentQueue) -> int:
+    """Vraci pocet prvku ve fronte. Pri soubeznych zmenach jde jen
+    o priblizny udaj.
+    """
+    return max(0, cqueue.pushed - cqueue.popped)
+
+
+class AsyncQueue:
+    """Trida AsyncQueue reprezentuje frontu pro korutiny asyncio.
+
+    Atributy:
+        head        pomocny uzel, head.next je prvni prvek fronty
+        tail        posledni uzel (pri prazdne fronte pomocny uzel)
+        getters     objekty Future korutin cekajicich v async_pop()
+        size        pocet prvku fronty
+    """
+
+    def __init__(self) -> None:
+        self.head: Node = Node()
+        self.tail: Node = self.head
+        self.getters: Deque[asyncio.Future] = collections.deque()
+        self.size: int = 0
+
+
+def _wake(aqueue: AsyncQueue, count: int = 1) -> None:
+    while count and aqueue.getters:
+        getter = aqueue.getters.popleft()
+        if not getter.done():
+            getter.set_result(None)
+            count -= 1
+
+
+def async_push(aqueue: AsyncQueue, value: Any) -> None:
+    """Vlozi hodnotu 'value' na konec fronty a probudi jednu cekajici
+    korutinu.
+    """
+    aqueue.tail.next = aqueue.tail = Node(value)
+    aqueue.size += 1
+    _wake(aqueue)
+
+
+def async_push_many(aqueue: AsyncQueue, values: Iterable[Any]) -> None:
+    """Vlozi vsechny hodnoty 'values' na konec fronty."""
+    first, last, count = _chain(values)
+    if first is None:
+        return
+    aqueue.tail.next = first
+    aqueue.tail = last
+    aqueue.size += count
+    _wake(aqueue, count)
+
+
+async def _async_wait(aqueue: AsyncQueue, timeout: Optional[float]) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = None if timeout is None else loop.time() + timeout
+    while aqueue.head.next is None:
+        remaining = None if deadline is None else deadline - loop.time()
+        if remaining is not None and remaining <= 0:
+            raise asyncio.TimeoutError
+        getter = loop.create_future()
+        aqueue.getters.append(getter)
+        try:
+            await asyncio.wait_for(getter, remaining)
+        except BaseException:
+            if getter.done() and not getter.cancelled():
+                # probuzeni pripadlo korutine, ktera uz odchazi
+                _wake(aqueue)
+            elif getter in aqueue.getters:
+                aqueue.getters.remove(getter)
+            raise
+
+
+async def async_pop(aqueue: AsyncQueue, timeout: Optional[float] = None) -> Any:
+    """Odebere a vrati prvni prvek fronty. Na prazdnou frontu ceka nejvyse
+    'timeout' sekund (None = bez omezeni), pak vyvola asyncio.TimeoutError.
+    """
+    await _async_wait(aqueue, timeout)
+    return async_drain(aqueue, 1)[0]
+
+
+def async_drain(aqueue: AsyncQueue, limit: Optional[int] = None) -> List[Any]:
+    """Odebere najednou nejvyse 'limit' prvku (None = vsechny) a vrati je
+    jako pole.
+    """
+    result = []
+    head = aqueue.head
+    while head.next is not None and (limit is None or len(result) < limit):
+        head = head.next
+        result.append(head.value)
+        head.value = None
+    aqueue.head = head
+    aqueue.size -= len(result)
+    return result
+
+
+# Testy implementace
+def test_push_pop() -> None:
+    print("Test 1. Vkladani a odebirani: ", end="")
+
+    queue1 = ConcurrentQueue()
+    for value in range(3):
+        push(queue1, value)
+    push_many(queue1, [3, 4, 5])
+
+    if ([pop(queue1) for _ in range(2)] != [0, 1] or
+            drain(queue1, 2) != [2, 3] or drain(queue1) != [4, 5] or
+            size(queue1) != 0 or queue1.head is not queue1.tail):
+        print("FAIL")
+        return
+
+    try:
+        pop(queue1, block=False)
+    except Empty:
+        pass
+    else:
+        print("FAIL")
+        return
+
+    start = time.monotonic()
+    try:
+        pop(queue1, timeout=0.05)
+    except Empty:
+        print("OK" if time.monotonic() - start >= 0.05 else "FAIL")
+    else:
+        print("FAIL")
+
+
+def test_threads() -> None:
+    print("Test 2. Vice producentu a konzumentu: ", end="")
+
+    queue2 = ConcurrentQueue()
+    producers, consumers, count = 4, 3, 5000
+    results: List[List[Any]] = [[] for _ in range(consumers)]
+
+    def produce(start: int) -> None:
+        for value in range(start, start + count):
+            push(queue2, value)
+
+    def consume(result: List[Any]) -> None:
+        while True:
+            try:
+                result.extend(drain(queue2, 100, block=True, timeout=0.01))
+            except Empty:
+                if done.is_set() and queue2.head.next is None:
+                    return
+
+    done = threading.Event()
+    threads = [threading.Thread(target=consume, args=(result,))
+               for result in results]
+    threads += [threading.Thread(target=produce, args=(i * count,))
+                for i in range(producers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads[consumers:]:
+        thread.join()
+    done.set()
+    for thread in threads[:consumers]:
+        thread.join()
+
+    received = sorted(v for result in results for v in result)
+    if received != list(range(producers * count)) or size(queue2) != 0:
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_async() -> None:
+    print("Test 3. Varianta pro asyncio: ", end="")
+
+    async def scenario() -> bool:
+        aqueue = AsyncQueue()
+        consumers = [asyncio.create_task(async_pop(aqueue))
+                     for _ in range(3)]
+        await asyncio.sleep(0)
+        async_push(aqueue, 'a')
+        async_push_many(aqueue, ['b', 'c', 'd'])
+        popped = sorted(await asyncio.gather(*consumers))
+        try:
+            await async_pop(aqueue, timeout=0.01)
+            await async_pop(aqueue, timeout=0.01)
+        except asyncio.TimeoutError:
+            timed_out = True
+        else:
+            timed_out = False
+        return (popped == ['a', 'b', 'c'] and timed_out and
+                aqueue.size == 0 and not aqueue.getters)
+
+    print("OK" if asyncio.run(scenario()) else "FAIL")
+
+
+if __name__ == '__main__':
+    test_push_pop()
+    test_threads()
+    test_async()
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 
 
-from typing import Any, Optional, List
+from typing import Any, Iterator, Optional, List, Tuple, Union
+
+import bloom_filter
+import red_black_tree
+from bloom_filter import BloomFilter
+from red_black_tree import RedBlackTree
 
 
 class HashPair:
@@ -34,15 +39,24 @@ class LinkedList:
     Atributy:
         first   reference na prvni prvek seznamu
         last    reference na posledni prvek seznamu
+        size    pocet prvku seznamu
     """
 
     def __init__(self) -> None:
         self.first: Optional[Node] = None
         self.last: Optional[Node] = None
+        self.size: int = 0
 
 
 SIZE = 10   # velikost hasovaci tabulky
 
+# Prekroci-li delka retezce TREEIFY_THRESHOLD, nahradi se seznam
+# cerveno-cernym stromem (hledani v O(log n) i pri spatnem rozlozeni
+# klicu). Klesne-li pocet prvku stromu na UNTREEIFY_THRESHOLD, vrati se
+# zpet na seznam. Klice v jednom stromu musi byt navzajem porovnatelne.
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
+
 
 class HashTable:
     """Trida HashTable reprezentujici hasovaci tabulku.
@@ -51,10 +65,17 @@ class HashTable:
         table   pole zretezenych seznamu
                 zretezene seznamy obsahuji dvojice HashPair,
                 ktere jsou indexovany podle indexu pole
+        trees   pole stromu RedBlackTree; prilis dlouhy seznam na pozici
+                i je nahrazen stromem trees[i] (table[i] je pak prazdny),
+                None = policko je seznam
+        bloom   volitelny Bloomuv filtr, ktery odfiltruje hledani
+                klicu, jez v tabulce urcite nejsou (None = bez filtru)
     """
 
     def __init__(self) -> None:
         self.table: List[LinkedList] = [LinkedList() for x in range(SIZE)]
+        self.trees: List[Optional[RedBlackTree]] = [None] * SIZE
+        self.bloom: Optional[BloomFilter] = None
 
 
 def insert_linked_list(linked_list: LinkedList, pair: HashPair) -> None:
@@ -69,6 +90,7 @@ def insert_linked_list(linked_list: LinkedList, pair: HashPair) -> None:
         assert linked_list.last is not None
         linked_list.last.next = node
     linked_list.last = node
+    linked_list.size += 1
 
 
 def search_linked_list(linked_list: LinkedList, key: Any) -> Optional[Node]:
@@ -76,7 +98,7 @@ def search_linked_list(linked_list: LinkedList, key: Any) -> Optional[Node]:
     s klicem 'key'. Pokud se hodnota v seznamu nenachazi, vraci None.
     """
     node = linked_list.first
-    while node is not None and node.pair.key is not key:
+    while node is not None and node.pair.key != key:
         node = node.next
     return node
 
@@ -93,6 +115,77 @@ def delete_linked_list(linked_list: LinkedList, node: Optional[Node]) -> None:
         linked_list.last = node.prev
     else:
         node.next.prev = node.prev
+    linked_list.size -= 1
+
+
+def search_tree(tree: RedBlackTree, key: Any) -> Optional[red_black_tree.Node]:
+    """Vraci uzel stromu s klicem 'key', ktery byl vlozen nejdrive
+    (stejne klice lezi v inorder poradi podle poradi vlozeni, hledame tedy
+    nejlevejsi z nich). Pokud se klic ve strome nenachazi, vraci None.
+    """
+    node = tree.root
+    found = None
+    while node is not None:
+        if key < node.key:
+            node = node.left
+        elif node.key < key:
+            node = node.right
+        else:
+            found = node
+            node = node.left
+    return found
+
+
+def list_pairs(linked_list: LinkedList) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci dvojice (klic, data) seznamu v poradi zretezeni."""
+    node = linked_list.first
+    while node:
+        yield node.pair.key, node.pair.data
+        node = node.next
+
+
+def tree_pairs(tree: RedBlackTree) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci dvojice (klic, data) stromu v inorder poradi."""
+    stack: List[red_black_tree.Node] = []
+    tree_node = tree.root
+    while stack or tree_node is not None:
+        while tree_node is not None:
+            stack.append(tree_node)
+            tree_node = tree_node.left
+        tree_node = stack.pop()
+        yield tree_node.key, tree_node.data
+        tree_node = tree_node.right
+
+
+def bucket_pairs(hashtable: HashTable,
+                 index: int) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci dvojice (klic, data) ulozene na pozici 'index'
+    tabulky, at uz je policko seznamem, nebo stromem.
+    """
+    tree = hashtable.trees[index]
+    if tree is not None:
+        return tree_pairs(tree)
+    return list_pairs(hashtable.table[index])
+
+
+def treeify(hashtable: HashTable, index: int) -> None:
+    """Nahradi seznam na pozici 'index' tabulky cerveno-cernym stromem."""
+    tree = RedBlackTree()
+    for key, data in list_pairs(hashtable.table[index]):
+        red_black_tree.insert(tree, key).data = data
+    hashtable.trees[index] = tree
+    hashtable.table[index] = LinkedList()
+
+
+def untreeify(hashtable: HashTable, index: int) -> None:
+    """Nahradi strom na pozici 'index' tabulky zretezenym seznamem."""
+    tree = hashtable.trees[index]
+    assert tree is not None
+    linked_list = LinkedList()
+    for key, data in tree_pairs(tree):
+        insert_linked_list(linked_list, HashPair(key, data))
+    hashtable.table[index] = linked_list
+    hashtable.trees[index] = None
 
 
 def hash(key: Any) -> Any:
@@ -107,15 +200,32 @@ def insert_hashtable(hashtable: HashTable, key: Any, data: Any) -> None:
     """Vytvori dvojici 'HashPair' z hodnot 'key' a 'data'. Pote vlozi
     vytvorenou dvojici do tabulky.
     """
-    pair = HashPair(key, data)
-    insert_linked_list(hashtable.table[hash(key)], pair)
+    hash_k = hash(key)
+    tree = hashtable.trees[hash_k]
+    if tree is not None:
+        red_black_tree.insert(tree, key).data = data
+    else:
+        bucket = hashtable.table[hash_k]
+        insert_linked_list(bucket, HashPair(key, data))
+        if bucket.size > TREEIFY_THRESHOLD:
+            treeify(hashtable, hash_k)
+    if hashtable.bloom is not None:
+        bloom_filter.insert(hashtable.bloom, key)
 
 
 def get_hashtable(hashtable: HashTable, key: Any) -> Optional[Any]:
     """Najde dvojici s klicem 'key' a vrati klici prirazenou
     hodnotu 'data'. Pokud se klic v tabulce nenachazi, vraci None.
     """
-    pair = search_linked_list(hashtable.table[hash(key)], key)
+    if (hashtable.bloom is not None and
+            not bloom_filter.contains(hashtable.bloom, key)):
+        return None
+    hash_k = hash(key)
+    tree = hashtable.trees[hash_k]
+    if tree is not None:
+        tree_node = search_tree(tree, key)
+        return tree_node.data if tree_node is not None else None
+    pair = search_linked_list(hashtable.table[hash_k], key)
     if pair:
         return pair.pair.data
     return None
@@ -124,29 +234,50 @@ def get_hashtable(hashtable: HashTable, key: Any) -> Optional[Any]:
 def remove_hashtable(hashtable: HashTable, key: Any) -> None:
     """Odstrani prvni vyskyt dvojice s klicem 'key'."""
     hash_k = hash(key)
-    delete_linked_list(hashtable.table[hash_k], search_linked_list(hashtable.table[hash_k], key))
+    tree = hashtable.trees[hash_k]
+    node: Union[Node, red_black_tree.Node, None]
+    if tree is not None:
+        node = search_tree(tree, key)
+        if node is not None:
+            red_black_tree.delete(tree, node)
+            if tree.size <= UNTREEIFY_THRESHOLD:
+                untreeify(hashtable, hash_k)
+    else:
+        node = search_linked_list(hashtable.table[hash_k], key)
+        delete_linked_list(hashtable.table[hash_k], node)
+    if node is not None and hashtable.bloom is not None:
+        bloom_filter.remove(hashtable.bloom, key)
+
+
+def set_bloom_filter(hashtable: HashTable,
+                     bloom: Optional[BloomFilter]) -> None:
+    """Nastavi tabulce 'hashtable' Bloomuv filtr 'bloom' a vlozi do nej
+    klice, ktere uz tabulka obsahuje. Hodnota None filtr vypne.
+    Pro tabulky, ze kterych se casto odebira, je vhodny pocitaci filtr
+    (BloomFilter(..., counting=True)).
+    """
+    hashtable.bloom = bloom
+    if bloom is not None:
+        for key in keys_hashtable(hashtable):
+            bloom_filter.insert(bloom, key)
 
 
 def keys_hashtable(hashtable: HashTable) -> List[Any]:
     """Vrati seznam vsech klicu v tabulce."""
     keys = []
-    for lst in hashtable.table:
-        node = lst.first
-        while node:
-            keys.append(node.pair.key)
-            node = node.next
+    for index in range(SIZE):
+        for key, _ in bucket_pairs(hashtable, index):
+            keys.append(key)
     return keys
 
 
 def values_hashtable(hashtable: HashTable) -> List[Any]:
     """Vrati seznam vsech hodnot v tabulce."""
-    keys = []
-    for lst in hashtable.table:
-        node = lst.first
-        while node:
-            keys.append(node.pair.data)
-            node = node.next
-    return keys
+    values = []
+    for index in range(SIZE):
+        for _, data in bucket_pairs(hashtable, index):
+            values.append(data)
+    return values
 
 
 # Testy implementace
@@ -387,6 +518,63 @@ def test_values() -> None:
     print("OK")
 
 
+def test_bloom_filter() -> None:
+    print("Test 7. tabulka s Bloomovym filtrem (bloom):")
+    t = init_table()
+    set_bloom_filter(t, BloomFilter(100, 0.01, counting=True))
+    for key, value in (0, 'A'), (SIZE, 'B'), (2 * SIZE - 2, 'E'):
+        if not check_get(get_hashtable(t, key), value):
+            return
+    if not check_get(get_hashtable(t, 3 * SIZE), None):
+        return
+    insert_hashtable(t, 3 * SIZE, 'F')
+    if not check_get(get_hashtable(t, 3 * SIZE), 'F'):
+        return
+    remove_hashtable(t, 3 * SIZE)
+    if not check_get(get_hashtable(t, 3 * SIZE), None):
+        return
+    assert t.bloom is not None
+    if bloom_filter.contains(t.bloom, 3 * SIZE):
+        print("NOK - odebrany klic {} zustal ve filtru".format(3 * SIZE))
+        return
+    print("OK")
+
+
+def test_treeify() -> None:
+    print("Test 8. stromova policka pro dlouhe retezce (treeify):")
+    t = HashTable()
+    n = 3 * TREEIFY_THRESHOLD
+    for i in range(n):
+        insert_hashtable(t, i * SIZE, i)
+    insert_hashtable(t, 0, 'dup')
+    tree = t.trees[0]
+    if tree is None or t.table[0].first is not None:
+        print("NOK - retezec delky {} nebyl nahrazen stromem".format(n))
+        return
+    if not red_black_tree.is_correct_rb_tree(tree):
+        print("NOK - policko neni korektni cerveno-cerny strom")
+        return
+    for i in range(n):
+        if not check_get(get_hashtable(t, i * SIZE), i):
+            return
+    if not check_get(get_hashtable(t, n * SIZE), None):
+        return
+    remove_hashtable(t, 0)
+    if not check_get(get_hashtable(t, 0), 'dup'):
+        return
+    for i in range(n - UNTREEIFY_THRESHOLD):
+        remove_hashtable(t, i * SIZE)
+    if t.trees[0] is not None:
+        print("NOK - strom se po odebrani nevratil na seznam")
+        return
+    res = [i * SIZE for i in range(n - UNTREEIFY_THRESHOLD, n)]
+    if keys_hashtable(t) != res:
+        print("NOK - nekorektni vypis klicu {}".format(res))
+        print("Vas vystup: {}".format(keys_hashtable(t)))
+        return
+    print("OK")
+
+
 if __name__ == '__main__':
     test_hash()
     print()
@@ -399,4 +587,8 @@ if __name__ == '__main__':
     test_keys()
     print()
     test_values()
-    print()
\ No newline at end of file
+    print()
+    test_bloom_filter()
+    print()
+    test_treeify()
+    print()
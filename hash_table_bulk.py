@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+from itertools import chain
+from multiprocessing import Pool
+from operator import itemgetter
+from typing import Any, List, Optional, Sequence, Tuple
+
+import bloom_filter
+import red_black_tree
+from hash_table import (HashPair, HashTable, LinkedList, Node, SIZE,
+                        TREEIFY_THRESHOLD, bucket_pairs, get_hashtable, hash,
+                        insert_hashtable, keys_hashtable, values_hashtable)
+from red_black_tree import RedBlackTree
+
+
+# Hromadne naplneni hasovaci tabulky HashTable.
+#
+# Vstup se rozdeli na souvisle useky, ktere paralelne zpracuji procesy
+# z multiprocessing.Pool. Kazdy proces spocita hasovaci funkci svych
+# dvojic, roztridi je podle policek tabulky a dvojice kazdeho policka
+# stabilne seradi podle klice. Hlavni proces uz klice nevklada jeden po
+# druhem: serazene useky jednoho policka slije (Timsort pozna hotove
+# behy, slevani je tedy temer linearni) a strom policka postavi najednou
+# funkci red_black_tree.from_sorted() v case O(n), bez hledani mista
+# a bez vyvazovani po kazdem vlozeni. Kratka policka (nejvyse
+# TREEIFY_THRESHOLD dvojic) zustanou seznamy v puvodnim poradi.
+#
+# Stabilni razeni zachova u stejnych klicu poradi vlozeni, vysledek je
+# proto stejny, jako kdyby se dvojice postupne vkladaly pomoci
+# insert_hashtable. Uzly stromu jsou objekty Pythonu, nelze je tedy
+# sestavit ve sdilene pameti jineho procesu; do hlavniho procesu se
+# prenaseji jen ploche serazene seznamy.
+
+
+Pair = Tuple[Any, Any]
+Entry = Tuple[Any, int, Any]   # (klic, poradi ve vstupu, data)
+
+
+def partition_pairs(task: Tuple[int, Sequence[Pair]]) -> List[List[Entry]]:
+    """Roztridi dvojice (klic, data) useku 'task' = (poradi prvni dvojice,
+    dvojice) podle policek tabulky. Vraci seznam delky SIZE, v nemz jsou
+    trojice (klic, poradi, data) kazdeho policka stabilne serazene podle
+    klice.
+    """
+    start, pairs = task
+    buckets: List[List[Entry]] = [[] for _ in range(SIZE)]
+    for position, (key, data) in enumerate(pairs, start):
+        buckets[hash(key)].append((key, position, data))
+    for bucket in buckets:
+        bucket.sort(key=itemgetter(0))
+    return buckets
+
+
+def link_pairs(linked_list: LinkedList, pairs: Sequence[Pair]) -> None:
+    """Pripoji dvojice 'pairs' na konec seznamu 'linked_list'."""
+    last = linked_list.last
+    for key, data in pairs:
+        node = Node(HashPair(key, data))
+        node.prev = last
+        if last is None:
+            linked_list.first = node
+        else:
+            last.next = node
+        last = node
+    linked_list.last = last
+    linked_list.size += len(pairs)
+
+
+def build_tree(pairs: Sequence[Pair]) -> RedBlackTree:
+    """Postavi strom policka z dvojic serazenych podle klice v case O(n)."""
+    tree = red_black_tree.from_sorted([key for key, _ in pairs], len(pairs))
+    for node, (_, data) in zip(red_black_tree.iter_forward(tree), pairs):
+        node.data = data
+    return tree
+
+
+def bulk_load(hashtable: HashTable, pairs: Sequence[Pair],
+              processes: int = 1, chunks: Optional[int] = None) -> None:
+    """Vlozi do tabulky 'hashtable' vsechny dvojice (klic, data) z 'pairs'.
+    Vysledek je stejny, jako kdyby se dvojice postupne vkladaly pomoci
+    insert_hashtable. Pri 'processes' > 1 se trideni a razeni podle
+    policek rozdeli mezi 'processes' procesu ('chunks' useku, implicitne
+    4 useky na proces).
+    """
+    if processes <= 1:
+        parts = [partition_pairs((0, pairs))]
+    else:
+        chunks = chunks or 4 * processes
+        step = max(1, -(-len(pairs) // chunks))
+        with Pool(processes) as pool:
+            parts = pool.map(partition_pairs,
+                             [(i, pairs[i:i + step])
+                              for i in range(0, len(pairs), step)])
+
+    for index in range(SIZE):
+        entries = list(chain.from_iterable(part[index] for part in parts))
+        if not entries:
+            continue
+        bucket = hashtable.table[index]
+        if (hashtable.trees[index] is None and
+                bucket.size + len(entries) <= TREEIFY_THRESHOLD):
+            entries.sort(key=itemgetter(1))
+            link_pairs(bucket, [(key, data) for key, _, data in entries])
+            continue
+        # puvodni obsah policka pred novymi dvojicemi; stabilni razeni
+        # zachova u stejnych klicu poradi vlozeni
+        merged = list(bucket_pairs(hashtable, index))
+        merged += [(key, data) for key, _, data in entries]
+        merged.sort(key=itemgetter(0))
+        hashtable.trees[index] = build_tree(merged)
+        hashtable.table[index] = LinkedList()
+
+    if hashtable.bloom is not None:
+        for pair in pairs:
+            bloom_filter.insert(hashtable.bloom, pair[0])
+
+
+# Testy implementace
+
+def check_table(t: HashTable, pairs: Sequence[Pair]) -> bool:
+    expected = {}
+    for key, data in pairs:
+        expected.setdefault(key, data)
+    if sorted(keys_hashtable(t)) != sorted(key for key, _ in pairs):
+        print("NOK - tabulka neobsahuje vsechny vlozene klice")
+        return False
+    for key, data in expected.items():
+        if get_hashtable(t, key) != data:
+            print("NOK - klic {}: {} != {}"
+                  .format(key, get_hashtable(t, key), data))
+            return False
+    return True
+
+
+def test_bulk_load() -> None:
+    print("Test 1. hromadne vkladani (bulk_load): ", end="")
+    pairs = [(i % 37, i) for i in range(200)]
+    t = HashTable()
+    bulk_load(t, pairs)
+    if not check_table(t, pairs):
+        return
+    bulk_load(t, [(1000, 'A'), (5, 'B')])
+    if not check_table(t, pairs + [(1000, 'A'), (5, 'B')]):
+        return
+    print("OK")
+
+
+def test_bulk_load_parallel() -> None:
+    print("Test 2. paralelni hromadne vkladani: ", end="")
+    pairs = [(i * 7919 % 10007, i) for i in range(5000)]
+    t = HashTable()
+    bulk_load(t, pairs, processes=2)
+    if not check_table(t, pairs):
+        return
+    serial = HashTable()
+    for key, data in pairs:
+        insert_hashtable(serial, key, data)
+    if (keys_hashtable(t) != keys_hashtable(serial) or
+            values_hashtable(t) != values_hashtable(serial)):
+        print("NOK - vysledek se lisi od postupneho vkladani")
+        return
+    print("OK")
+
+
+if __name__ == '__main__':
+    test_bulk_load()
+    test_bulk_load_parallel()
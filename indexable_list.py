@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+import random
+from typing import Any, Iterator, List, Optional
+
+
+# Indexovatelny seznam nad preskakovacim seznamem (indexable skip list).
+#
+# Kazda reference next[i] si pamatuje i svou "sirku" width[i], tedy
+# o kolik pozic na nejnizsi urovni preskakuje. Pri hledani i-teho prvku
+# se tak scitaji sirky a sestupuje se po urovnich stejne jako pri hledani
+# klice, coz trva ocekavane O(log n). Vkladani a mazani na pozici upravi
+# sirky na ceste. Seznam si navic pamatuje posledni uzel kazde urovne
+# (tails) a jeho pozici, takze pripojeni na konec nevyzaduje pruchod
+# od hlavicky a trva ocekavane O(1).
+#
+# Pozice 0 patri hlavicce, prvek s indexem i je na pozici i + 1.
+
+
+MAX_LEVEL = 32
+
+
+class IndexableNode:
+    """Trida IndexableNode reprezentuje uzel indexovatelneho seznamu.
+
+    Atributy:
+        value   ulozena hodnota
+        next    next[i] je reference na nasledujici uzel na urovni i
+        width   width[i] je pocet pozic, o ktere next[i] preskakuje
+                (pro next[i] = None nema vyznam)
+    """
+
+    def __init__(self, value: Any = None, height: int = 0) -> None:
+        self.value: Any = value
+        self.next: List[Optional[IndexableNode]] = [None] * (height + 1)
+        self.width: List[int] = [0] * (height + 1)
+
+
+class IndexableList:
+    """Trida IndexableList reprezentuje indexovatelny seznam.
+
+    Atributy:
+        head        hlavicka (zarazka) s referencemi na vsech urovnich
+        level       nejvyssi pouzivana uroven
+        size        pocet prvku
+        tails       posledni uzel na kazde urovni
+        tail_pos    pozice uzlu z 'tails'
+        rng         generator nahodnych cisel pro vysky uzlu
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.head: IndexableNode = IndexableNode(height=MAX_LEVEL - 1)
+        self.level: int = 0
+        self.size: int = 0
+        self.tails: List[IndexableNode] = [self.head] * MAX_LEVEL
+        self.tail_pos: List[int] = [0] * MAX_LEVEL
+        self.rng: random.Random = random.Random(seed)
+
+
+def _random_height(ilist: IndexableList) -> int:
+    height = 0
+    while height < MAX_LEVEL - 1 and ilist.rng.random() < 0.5:
+        height += 1
+    return height
+
+
+def _check_index(ilist: IndexableList, index: int, size: int) -> None:
+    if not 0 <= index < size:
+        raise IndexError("index {} mimo rozsah seznamu".format(index))
+
+
+def _predecessors(ilist: IndexableList, position: int) -> Any:
+    """Vrati pro kazdou uroven posledni uzel pred pozici 'position'
+    a jeho pozici.
+    """
+    preds = [ilist.head] * (ilist.level + 1)
+    preds_pos = [0] * (ilist.level + 1)
+    node, pos = ilist.head, 0
+    for level in range(ilist.level, -1, -1):
+        following = node.next[level]
+        while following is not None and pos + node.width[level] < position:
+            pos += node.width[level]
+            node = following
+            following = node.next[level]
+        preds[level], preds_pos[level] = node, pos
+    return preds, preds_pos
+
+
+def get(ilist: IndexableList, index: int) -> Any:
+    """Vrati hodnotu prvku s indexem 'index' v case O(log n)."""
+    _check_index(ilist, index, ilist.size)
+    target = index + 1
+    node, pos = ilist.head, 0
+    for level in range(ilist.level, -1, -1):
+        following = node.next[level]
+        while following is not None and pos + node.width[level] <= target:
+            pos += node.width[level]
+            node = following
+            following = node.next[level]
+        if pos == target:
+            break
+    return node.value
+
+
+def append(ilist: IndexableList, value: Any) -> None:
+    """Pripoji hodnotu 'value' na konec seznamu v ocekavanem case O(1)."""
+    height = _random_height(ilist)
+    node = IndexableNode(value, height)
+    pos = ilist.size + 1
+    for level in range(height + 1):
+        tail = ilist.tails[level]
+        tail.next[level] = node
+        tail.width[level] = pos - ilist.tail_pos[level]
+        ilist.tails[level], ilist.tail_pos[level] = node, pos
+    ilist.level = max(ilist.level, height)
+    ilist.size += 1
+
+
+def insert_at(ilist: IndexableList, index: int, value: Any) -> None:
+    """Vlozi hodnotu 'value' na pozici 'index' (0 <= index <= size),
+    nasledujici prvky se posunou. Trva ocekavane O(log n).
+    """
+    _check_index(ilist, index, ilist.size + 1)
+    if index == ilist.size:
+        append(ilist, value)
+        return
+    height = _random_height(ilist)
+    ilist.level = max(ilist.level, height)
+    preds, preds_pos = _predecessors(ilist, index + 1)
+    node = IndexableNode(value, height)
+    for level in range(ilist.level + 1):
+        pred, pred_pos = preds[level], preds_pos[level]
+        if level <= height:
+            following = pred.next[level]
+            node.next[level] = following
+            if following is not None:
+                node.width[level] = pred_pos + pred.width[level] - index
+            pred.next[level] = node
+            pred.width[level] = index + 1 - pred_pos
+            if following is None:
+                ilist.tails[level], ilist.tail_pos[level] = node, index + 1
+                continue
+        elif pred.next[level] is not None:
+            pred.width[level] += 1
+        if ilist.tail_pos[level] > index:
+            ilist.tail_pos[level] += 1
+    ilist.size += 1
+
+
+def delete_at(ilist: IndexableList, index: int) -> Any:
+    """Odstrani prvek s indexem 'index' a vrati jeho hodnotu. Trva
+    ocekavane O(log n).
+    """
+    _check_index(ilist, index, ilist.size)
+    target = index + 1
+    preds, preds_pos = _predecessors(ilist, target)
+    node = preds[0].next[0]
+    assert node is not None
+    for level in range(ilist.level + 1):
+        pred = preds[level]
+        if pred.next[level] is node:
+            pred.next[level] = node.next[level]
+            if node.next[level] is not None:
+                pred.width[level] += node.width[level] - 1
+            if ilist.tails[level] is node:
+                ilist.tails[level] = pred
+                ilist.tail_pos[level] = preds_pos[level]
+                continue
+        elif pred.next[level] is not None:
+            pred.width[level] -= 1
+        if ilist.tail_pos[level] > target:
+            ilist.tail_pos[level] -= 1
+    while ilist.level > 0 and ilist.head.next[ilist.level] is None:
+        ilist.level -= 1
+    ilist.size -= 1
+    return node.value
+
+
+def values(ilist: IndexableList) -> Iterator[Any]:
+    """Postupne vraci hodnoty seznamu od prvni do posledni."""
+    node = ilist.head.next[0]
+    while node is not None:
+        yield node.value
+        node = node.next[0]
+
+
+# Testy implementace
+def test_append_get() -> None:
+    print("Test 1. Pripojovani a pristup podle indexu: ", end="")
+
+    list1 = IndexableList(seed=1)
+    for value in range(200):
+        append(list1, value * 2)
+
+    if ([get(list1, i) for i in range(200)] != list(range(0, 400, 2)) or
+            list(values(list1)) != list(range(0, 400, 2))):
+        print("FAIL")
+        return
+
+    try:
+        get(list1, 200)
+    except IndexError:
+        print("OK")
+    else:
+        print("FAIL")
+
+
+def test_insert_delete() -> None:
+    print("Test 2. Vkladani a mazani na pozici: ", end="")
+
+    rng = random.Random(2)
+    list2 = IndexableList(seed=3)
+    expected: List[Any] = []
+    for step in range(2000):
+        operation = rng.random()
+        if operation < 0.35 or not expected:
+            index = rng.randint(0, len(expected))
+            insert_at(list2, index, step)
+            expected.insert(index, step)
+        elif operation < 0.5:
+            append(list2, step)
+            expected.append(step)
+        else:
+            index = rng.randrange(len(expected))
+            if delete_at(list2, index) != expected.pop(index):
+                print("FAIL")
+                return
+
+    if (list(values(list2)) != expected or list2.size != len(expected) or
+            [get(list2, i) for i in range(len(expected))] != expected):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+if __name__ == '__main__':
+    test_append_get()
+    test_insert_delete()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+from array import array
+from typing import Any, Optional, Sequence
+
+try:
+    import numpy
+except ImportError:  # numpy je volitelny, bez nej se pouzije cisty Python
+    numpy = None
+
+
+# Hasovaci tabulka pro celociselne klice a hodnoty s otevrenym adresovanim
+# (linearni sondovani). Klice, hodnoty i priznaky obsazenosti jsou ulozeny
+# v kompaktnich polich (array.array), takze hromadne operace *_many
+# mohou spocitat indexy vsech klicu najednou. Je-li k dispozici numpy,
+# vypocet indexu i sondovani pri hledani probiha vektorove nad celou davkou.
+
+
+GOLDEN = 0x9E3779B97F4A7C15   # konstanta Fibonacciho hasovani
+MASK = (1 << 64) - 1
+MIN_BITS = 3
+
+
+class IntHashTable:
+    """Trida IntHashTable reprezentuje hasovaci tabulku s otevrenym
+    adresovanim pro 64bitove celociselne klice a hodnoty.
+
+    Atributy:
+        bits        dvojkovy logaritmus kapacity tabulky
+        count       pocet ulozenych klicu
+        keys        pole klicu (typ 'q')
+        values      pole hodnot (typ 'q')
+        used        priznaky obsazenosti jednotlivych pozic
+    """
+
+    def __init__(self, bits: int = MIN_BITS) -> None:
+        self.bits: int = max(MIN_BITS, bits)
+        self.count: int = 0
+        capacity = 1 << self.bits
+        self.keys: array = array('q', bytes(8 * capacity))
+        self.values: array = array('q', bytes(8 * capacity))
+        self.used: bytearray = bytearray(capacity)
+
+
+def index(table: IntHashTable, key: int) -> int:
+    """Vrati vychozi pozici klice 'key' v tabulce 'table'."""
+    return ((key * GOLDEN) & MASK) >> (64 - table.bits)
+
+
+def _indexes(table: IntHashTable, keys: Any) -> Any:
+    """Vrati vychozi pozice vsech klicu z 'keys' jednim pruchodem.
+    S numpy vraci numpy pole, jinak seznam.
+    """
+    shift = 64 - table.bits
+    if numpy is not None:
+        hashed = numpy.asarray(keys, dtype=numpy.int64).view(numpy.uint64)
+        return ((hashed * numpy.uint64(GOLDEN)) >>
+                numpy.uint64(shift)).astype(numpy.int64)
+    return [((key * GOLDEN) & MASK) >> shift for key in keys]
+
+
+def _resize(table: IntHashTable, bits: int) -> None:
+    """Zvetsi tabulku 'table' na kapacitu 2 ** 'bits' a prehasuje
+    vsechny ulozene dvojice.
+    """
+    new = IntHashTable(bits)
+    for i, is_used in enumerate(table.used):
+        if is_used:
+            insert(new, table.keys[i], table.values[i])
+    table.bits, table.count = new.bits, new.count
+    table.keys, table.values, table.used = new.keys, new.values, new.used
+
+
+def _reserve(table: IntHashTable, count: int) -> None:
+    """Zajisti, ze se do tabulky vejde 'count' klicu pri zaplneni
+    nejvyse 50 %.
+    """
+    bits = table.bits
+    while 2 * count > 1 << bits:
+        bits += 1
+    if bits != table.bits:
+        _resize(table, bits)
+
+
+def insert(table: IntHashTable, key: int, value: int) -> None:
+    """Vlozi do tabulky 'table' klic 'key' s hodnotou 'value'. Pokud
+    tabulka klic jiz obsahuje, prepise jeho hodnotu.
+    """
+    _reserve(table, table.count + 1)
+    mask = (1 << table.bits) - 1
+    i = index(table, key)
+    while table.used[i]:
+        if table.keys[i] == key:
+            table.values[i] = value
+            return
+        i = (i + 1) & mask
+    table.used[i] = 1
+    table.keys[i] = key
+    table.values[i] = value
+    table.count += 1
+
+
+def get(table: IntHashTable, key: int,
+        default: Optional[int] = None) -> Optional[int]:
+    """Vrati hodnotu klice 'key' v tabulce 'table'. Pokud se klic
+    v tabulce nenachazi, vraci 'default'.
+    """
+    mask = (1 << table.bits) - 1
+    i = index(table, key)
+    while table.used[i]:
+        if table.keys[i] == key:
+            return table.values[i]
+        i = (i + 1) & mask
+    return default
+
+
+def contains(table: IntHashTable, key: int) -> bool:
+    """Vraci True, pokud tabulka 'table' obsahuje klic 'key'."""
+    return get(table, key) is not None
+
+
+def insert_many(table: IntHashTable, keys: Sequence[int],
+                values: Sequence[int]) -> None:
+    """Vlozi do tabulky 'table' dvojice (keys[i], values[i]). Klice
+    a hodnoty mohou byt numpy pole, array.array nebo libovolne sekvence
+    celych cisel.
+    """
+    if len(keys) != len(values):
+        raise ValueError("keys a values musi mit stejnou delku")
+    _reserve(table, table.count + len(keys))
+    starts = _indexes(table, keys)
+    if numpy is not None:
+        starts = starts.tolist()
+        keys = numpy.asarray(keys, dtype=numpy.int64).tolist()
+        values = numpy.asarray(values, dtype=numpy.int64).tolist()
+    t_keys, t_values, t_used = table.keys, table.values, table.used
+    mask = (1 << table.bits) - 1
+    added = 0
+    for i, key, value in zip(starts, keys, values):
+        while t_used[i] and t_keys[i] != key:
+            i = (i + 1) & mask
+        if not t_used[i]:
+            t_used[i] = 1
+            t_keys[i] = key
+            added += 1
+        t_values[i] = value
+    table.count += added
+
+
+def _lookup_numpy(table: IntHashTable, keys: Any) -> Any:
+    """Vektorove vyhleda klice 'keys'. Vraci dvojici numpy poli (nalezeno,
+    pozice). Sonduje se po vlnach: v kazde vlne se porovnaji vsechny dosud
+    nevyresene klice a posunou se o jednu pozici dal.
+    """
+    keys = numpy.asarray(keys, dtype=numpy.int64)
+    t_keys = numpy.frombuffer(table.keys, dtype=numpy.int64)
+    t_used = numpy.frombuffer(table.used, dtype=numpy.uint8).astype(bool)
+    mask = (1 << table.bits) - 1
+    slots = _indexes(table, keys)
+    found = numpy.zeros(len(keys), dtype=bool)
+    pending = numpy.arange(len(keys))
+    probe = slots.copy()
+    while pending.size:
+        used = t_used[probe]
+        hit = used & (t_keys[probe] == keys[pending])
+        found[pending[hit]] = True
+        slots[pending[hit]] = probe[hit]
+        again = used & ~hit
+        pending = pending[again]
+        probe = (probe[again] + 1) & mask
+    return found, slots
+
+
+def get_many(table: IntHashTable, keys: Sequence[int],
+             default: int = 0) -> Any:
+    """Vrati pole hodnot klicu 'keys' v tabulce 'table'. Na pozicich
+    chybejicich klicu je hodnota 'default'. Pro numpy vstup vraci numpy
+    pole, jinak array.array typu 'q'.
+    """
+    if numpy is not None:
+        found, slots = _lookup_numpy(table, keys)
+        t_values = numpy.frombuffer(table.values, dtype=numpy.int64)
+        result = numpy.where(found, t_values[slots], default)
+        if isinstance(keys, numpy.ndarray):
+            return result
+        return array('q', result.tobytes())
+
+    t_keys, t_values, t_used = table.keys, table.values, table.used
+    mask = (1 << table.bits) - 1
+    result = array('q', bytes(8 * len(keys)))
+    for j, (i, key) in enumerate(zip(_indexes(table, keys), keys)):
+        while t_used[i]:
+            if t_keys[i] == key:
+                result[j] = t_values[i]
+                break
+            i = (i + 1) & mask
+        else:
+            result[j] = default
+    return result
+
+
+def contains_many(table: IntHashTable, keys: Sequence[int]) -> Any:
+    """Vrati pole priznaku (1 = klic je v tabulce, 0 = neni) pro klice
+    'keys'. Pro numpy vstup vraci numpy pole typu bool, jinak array.array
+    typu 'b'.
+    """
+    if numpy is not None:
+        found = _lookup_numpy(table, keys)[0]
+        if isinstance(keys, numpy.ndarray):
+            return found
+        return array('b', found.astype(numpy.int8).tobytes())
+
+    t_keys, t_used = table.keys, table.used
+    mask = (1 << table.bits) - 1
+    result = array('b', bytes(len(keys)))
+    for j, (i, key) in enumerate(zip(_indexes(table, keys), keys)):
+        while t_used[i]:
+            if t_keys[i] == key:
+                result[j] = 1
+                break
+            i = (i + 1) & mask
+    return result
+
+
+# Testy implementace
+
+def test_insert_get() -> None:
+    print("Test 1. vkladani a hledani (insert, get): ", end="")
+    table = IntHashTable()
+    for key in range(-50, 50):
+        insert(table, key * 7, key)
+    insert(table, 0, 100)
+    if table.count != 100:
+        print("NOK - tabulka obsahuje {} != 100 klicu".format(table.count))
+        return
+    for key in range(-50, 50):
+        expected = 100 if key == 0 else key
+        if get(table, key * 7) != expected:
+            print("NOK - klic {}: {} != {}"
+                  .format(key * 7, get(table, key * 7), expected))
+            return
+    if get(table, 1) is not None or contains(table, 8):
+        print("NOK - nalezen klic, ktery v tabulce neni")
+        return
+    print("OK")
+
+
+def test_many() -> None:
+    print("Test 2. hromadne operace (*_many): ", end="")
+    table = IntHashTable()
+    keys = array('q', range(0, 3000, 3))
+    insert_many(table, keys, array('q', (k * 2 for k in keys)))
+    insert_many(table, [0, 3], [-1, -2])
+    queries = array('q', range(-5, 3005))
+    values = get_many(table, queries, default=-100)
+    flags = contains_many(table, queries)
+    for key, value, flag in zip(queries, values, flags):
+        if 0 <= key < 3000 and key % 3 == 0:
+            expected = {0: -1, 3: -2}.get(key, key * 2)
+        else:
+            expected = -100
+        if value != expected or bool(flag) != (expected != -100):
+            print("NOK - klic {}: {} != {}".format(key, value, expected))
+            return
+    if table.count != 1000:
+        print("NOK - tabulka obsahuje {} != 1000 klicu".format(table.count))
+        return
+    if numpy is not None:
+        found = contains_many(table, numpy.array([3, 4, -3]))
+        values = get_many(table, numpy.array([3, 4, -3]), default=7)
+        if found.tolist() != [True, False, False] or \
+                values.tolist() != [-2, 7, 7]:
+            print("NOK - chybne hledani numpy pole")
+            return
+    print("OK")
+
+
+if __name__ == '__main__':
+    test_insert_get()
+    test_many()
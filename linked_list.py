@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 
-from typing import Any, Optional
+import sys
+from typing import (Any, Callable, Dict, Iterable, Iterator, Optional,
+                    TextIO)
 
 
 class Node:
@@ -25,11 +27,14 @@ class LinkedList:
     Atributy:
         first   reference na prvni prvek seznamu
         last    reference na posledni prvek seznamu
+        index   volitelny index hodnota -> uzly s touto hodnotou v poradi
+                seznamu (None = bez indexu), viz enable_index()
     """
 
     def __init__(self) -> None:
         self.first: Optional[Node] = None
         self.last: Optional[Node] = None
+        self.index: Optional[Dict[Any, Dict[Node, None]]] = None
 
 
 def insert(linked_list: LinkedList, value: Any) -> Node:
@@ -42,22 +47,62 @@ def insert(linked_list: LinkedList, value: Any) -> Node:
     else:
         linked_list.last.next = node
     linked_list.last = node
+    if linked_list.index is not None:
+        linked_list.index.setdefault(value, {})[node] = None
     return node
 
 
 def print_list(linked_list: LinkedList) -> None:
     """Metoda print_list() vypise seznam linked_list."""
+    write_to(linked_list, sys.stdout)
+
+
+def write_to(linked_list: LinkedList, stream: TextIO,
+             chunk: int = 1024) -> None:
+    """Metoda write_to() zapise hodnoty seznamu linked_list do proudu
+    stream ve stejnem formatu jako print_list(). Hodnoty se zapisuji po
+    blocich 'chunk' prvku misto jednoho volani print() na prvek.
+    """
+    buffer = []
+    node = linked_list.first
+    while node:
+        buffer.append(str(node.value))
+        if len(buffer) == chunk:
+            stream.write(" ".join(buffer) + " ")
+            buffer.clear()
+        node = node.next
+    if buffer:
+        stream.write(" ".join(buffer) + " ")
+
+
+def iter_forward(linked_list: LinkedList) -> Iterator[Any]:
+    """Metoda iter_forward() postupne vraci hodnoty seznamu od prvniho
+    prvku k poslednimu.
+    """
     node = linked_list.first
     while node:
-        print(node.value, end=" ")
+        yield node.value
         node = node.next
 
 
+def iter_backward(linked_list: LinkedList) -> Iterator[Any]:
+    """Metoda iter_backward() postupne vraci hodnoty seznamu od
+    posledniho prvku k prvnimu.
+    """
+    node = linked_list.last
+    while node:
+        yield node.value
+        node = node.prev
+
+
 def search(linked_list: LinkedList, value: Any) -> Optional[Node]:
     """Metoda search() vraci referenci na prvni vyskyt uzlu s hodnotou
     value v seznamu linked_list. Pokud se hodnota v seznamu nenachazi,
     vraci None.
     """
+    if linked_list.index is not None:
+        nodes = linked_list.index.get(value)
+        return next(iter(nodes)) if nodes else None
     node = linked_list.first
     while node:
         if node.value == value:
@@ -68,6 +113,8 @@ def search(linked_list: LinkedList, value: Any) -> Optional[Node]:
 
 def delete(linked_list: LinkedList, node: Node) -> None:
     """Metoda delete() smaze uzel node v seznamu linked_list."""
+    if linked_list.index is not None:
+        _unindex(linked_list.index, node)
     if not node.prev:
         linked_list.first = node.next
     else:
@@ -79,6 +126,228 @@ def delete(linked_list: LinkedList, node: Node) -> None:
         node.next.prev = node.prev
 
 
+def _unindex(index: Dict[Any, Dict[Node, None]], node: Node) -> None:
+    nodes = index[node.value]
+    del nodes[node]
+    if not nodes:
+        del index[node.value]
+
+
+def enable_index(linked_list: LinkedList) -> None:
+    """Metoda enable_index() zapne pro seznam linked_list index hodnot.
+    S indexem bezi search(), remove_value() a contains() v case O(1),
+    hodnoty v seznamu ale musi byt hashovatelne. Index se udrzuje
+    operacemi insert() a delete(); uzly pripojene primo pres reference
+    next/prev v nem nebudou.
+    """
+    linked_list.index = {}
+    node = linked_list.first
+    while node:
+        linked_list.index.setdefault(node.value, {})[node] = None
+        node = node.next
+
+
+def disable_index(linked_list: LinkedList) -> None:
+    """Metoda disable_index() zrusi index hodnot seznamu linked_list."""
+    linked_list.index = None
+
+
+def contains(linked_list: LinkedList, value: Any) -> bool:
+    """Metoda contains() vraci True, pokud seznam linked_list obsahuje
+    hodnotu value.
+    """
+    return search(linked_list, value) is not None
+
+
+def remove_value(linked_list: LinkedList, value: Any) -> bool:
+    """Metoda remove_value() smaze ze seznamu linked_list prvni uzel
+    s hodnotou value. Vraci True, pokud byl nejaky uzel smazan.
+    """
+    node = search(linked_list, value)
+    if node is None:
+        return False
+    delete(linked_list, node)
+    return True
+
+
+def extend(linked_list: LinkedList, values: Iterable[Any]) -> None:
+    """Metoda extend() vlozi na konec seznamu linked_list postupne
+    vsechny hodnoty z values.
+    """
+    last = linked_list.last
+    index = linked_list.index
+    for value in values:
+        node = Node(value, last)
+        if last is None:
+            linked_list.first = node
+        else:
+            last.next = node
+        last = node
+        if index is not None:
+            index.setdefault(value, {})[node] = None
+    linked_list.last = last
+
+
+def splice(linked_list: LinkedList, after: Optional[Node],
+           other: LinkedList) -> None:
+    """Metoda splice() presune vsechny uzly seznamu other do seznamu
+    linked_list za uzel after (None = na zacatek). Seznam other zustane
+    prazdny. Bez indexu hodnot bezi v case O(1), s indexem se presunute
+    uzly preindexuji.
+    """
+    first, last = other.first, other.last
+    if first is None or last is None:
+        return
+    before = after.next if after is not None else linked_list.first
+    first.prev = after
+    last.next = before
+    if after is None:
+        linked_list.first = first
+    else:
+        after.next = first
+    if before is None:
+        linked_list.last = last
+    else:
+        before.prev = last
+
+    other.first = other.last = None
+    if other.index is not None:
+        other.index = {}
+    if linked_list.index is not None:
+        if before is None:
+            node: Optional[Node] = first
+            while node:
+                linked_list.index.setdefault(node.value, {})[node] = None
+                node = node.next
+        else:
+            enable_index(linked_list)
+
+
+def concat(linked_list: LinkedList, other: LinkedList) -> None:
+    """Metoda concat() pripoji vsechny uzly seznamu other na konec
+    seznamu linked_list. Seznam other zustane prazdny.
+    """
+    splice(linked_list, linked_list.last, other)
+
+
+def split_at(linked_list: LinkedList, node: Node) -> LinkedList:
+    """Metoda split_at() oddeli ze seznamu linked_list uzel node a vsechny
+    uzly za nim. Vraci je jako novy seznam. Bez indexu hodnot bezi
+    v case O(1).
+    """
+    rest = LinkedList()
+    rest.first, rest.last = node, linked_list.last
+    linked_list.last = node.prev
+    if node.prev is None:
+        linked_list.first = None
+    else:
+        node.prev.next = None
+    node.prev = None
+    if linked_list.index is not None:
+        enable_index(linked_list)
+        enable_index(rest)
+    return rest
+
+
+def _cut(node: Optional[Node], count: int) -> Optional[Node]:
+    """Odrizne za 'count' uzly od uzlu node zbytek retezce a vrati jeho
+    zacatek.
+    """
+    for _ in range(count - 1):
+        if node is None:
+            return None
+        node = node.next
+    if node is None:
+        return None
+    rest = node.next
+    node.next = None
+    return rest
+
+
+def _merge(left: Optional[Node], right: Optional[Node], tail: Node,
+           key: Optional[Callable[[Any], Any]]) -> Node:
+    """Slije dva serazene retezce (spojene jen pres next) za uzel tail.
+    Pri shode dava prednost levemu retezci (stabilita). Vraci posledni
+    uzel sliteho retezce.
+    """
+    if key is None:
+        while left is not None and right is not None:
+            if right.value < left.value:
+                tail.next = tail = right
+                right = right.next
+            else:
+                tail.next = tail = left
+                left = left.next
+    else:
+        while left is not None and right is not None:
+            if key(right.value) < key(left.value):
+                tail.next = tail = right
+                right = right.next
+            else:
+                tail.next = tail = left
+                left = left.next
+    tail.next = left if left is not None else right
+    while tail.next is not None:
+        tail = tail.next
+    return tail
+
+
+def _relink(linked_list: LinkedList, head: Node) -> None:
+    """Podle referenci next obnovi reference prev a first/last seznamu.
+    Uzel head je pomocna hlavicka pred prvnim uzlem.
+    """
+    linked_list.first = head.next
+    prev = None
+    node = head.next
+    while node:
+        node.prev = prev
+        prev, node = node, node.next
+    linked_list.last = prev
+
+
+def sort(linked_list: LinkedList,
+         key: Optional[Callable[[Any], Any]] = None) -> None:
+    """Metoda sort() stabilne seradi seznam linked_list mergesortem zdola
+    nahoru. Uzly se jen prepojuji na miste (pomocna pamet O(1)), pripadna
+    funkce key urcuje klic pro porovnani hodnot.
+    """
+    head = Node()
+    head.next = linked_list.first
+    length = 0
+    node = linked_list.first
+    while node:
+        length += 1
+        node = node.next
+
+    width = 1
+    while width < length:
+        tail = head
+        rest = head.next
+        while rest is not None:
+            left = rest
+            right = _cut(left, width)
+            rest = _cut(right, width)
+            tail = _merge(left, right, tail, key)
+        width *= 2
+    _relink(linked_list, head)
+
+
+def merge_sorted(linked_list: LinkedList, other: LinkedList,
+                 key: Optional[Callable[[Any], Any]] = None) -> None:
+    """Metoda merge_sorted() slije serazeny seznam other do serazeneho
+    seznamu linked_list. Pri shode jsou uzly z linked_list pred uzly
+    z other. Seznam other zustane prazdny.
+    """
+    head = Node()
+    _merge(linked_list.first, other.first, head, key)
+    _relink(linked_list, head)
+    other.first = other.last = None
+    if other.index is not None:
+        other.index = {}
+    if linked_list.index is not None:
+        enable_index(linked_list)
+
+
 # Testy implementace
 def test_insert_empty() -> None:
     print("Test 1. Vkladani do prazdneho seznamu: ", end="")
@@ -276,6 +545,128 @@ def test_insert_return() -> None:
         print("OK")
 
 
+def test_index() -> None:
+    print("Test 10. Index hodnot (search, remove_value, contains): ", end="")
+
+    list10 = LinkedList()
+    for value in 1, 2, 3, 2:
+        insert(list10, value)
+    enable_index(list10)
+    node4 = insert(list10, 4)
+
+    if search(list10, 4) != node4 or search(list10, 5) is not None:
+        print("FAIL")
+        return
+
+    assert list10.first and list10.first.next
+    second = list10.first.next
+    if search(list10, 2) != second:
+        print("FAIL")
+        return
+
+    remove_value(list10, 2)
+    assert list10.last and list10.last.prev
+    if search(list10, 2) != list10.last.prev or not contains(list10, 2):
+        print("FAIL")
+        return
+
+    delete(list10, list10.last.prev)
+    if (contains(list10, 2) or remove_value(list10, 2) or
+            list10.index is None or 2 in list10.index):
+        print("FAIL")
+        return
+
+    print("OK")
+
+
+def test_extend_iter() -> None:
+    print("Test 11. Hromadne vkladani a pruchody: ", end="")
+
+    list11 = LinkedList()
+    insert(list11, 0)
+    extend(list11, range(1, 5))
+
+    if (list(iter_forward(list11)) != [0, 1, 2, 3, 4] or
+            list(iter_backward(list11)) != [4, 3, 2, 1, 0]):
+        print("FAIL")
+        return
+
+    import io
+    stream = io.StringIO()
+    write_to(list11, stream, chunk=2)
+    if stream.getvalue() != "0 1 2 3 4 ":
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_splice_split() -> None:
+    print("Test 12. Spojovani a rozdelovani seznamu: ", end="")
+
+    list12 = LinkedList()
+    extend(list12, [1, 2, 5])
+    other = LinkedList()
+    extend(other, [3, 4])
+    assert list12.first and list12.first.next
+    splice(list12, list12.first.next, other)
+
+    if (list(iter_forward(list12)) != [1, 2, 3, 4, 5] or
+            list(iter_backward(list12)) != [5, 4, 3, 2, 1] or
+            other.first is not None or other.last is not None):
+        print("FAIL")
+        return
+
+    rest = split_at(list12, list12.first.next.next)
+    if (list(iter_forward(list12)) != [1, 2] or
+            list(iter_backward(rest)) != [5, 4, 3]):
+        print("FAIL")
+        return
+
+    enable_index(list12)
+    concat(list12, rest)
+    splice(list12, None, LinkedList())
+    if (list(iter_backward(list12)) != [5, 4, 3, 2, 1] or
+            search(list12, 4) is None or rest.first is not None):
+        print("FAIL")
+        return
+
+    print("OK")
+
+
+def test_sort_merge() -> None:
+    print("Test 13. Razeni a slevani seznamu: ", end="")
+
+    list13 = LinkedList()
+    pairs = [(5, 'a'), (1, 'b'), (4, 'c'), (1, 'd'), (3, 'e'), (5, 'f'),
+             (2, 'g')]
+    extend(list13, pairs)
+    sort(list13, key=lambda pair: pair[0])
+
+    expected = sorted(pairs, key=lambda pair: pair[0])
+    if (list(iter_forward(list13)) != expected or
+            list(iter_backward(list13)) != expected[::-1]):
+        print("FAIL")
+        return
+
+    other = LinkedList()
+    extend(other, [(0, 'h'), (1, 'i'), (6, 'j')])
+    merge_sorted(list13, other, key=lambda pair: pair[0])
+    expected = sorted(pairs + [(0, 'h'), (1, 'i'), (6, 'j')],
+                      key=lambda pair: pair[0])
+    if (list(iter_forward(list13)) != expected or
+            list(iter_backward(list13)) != expected[::-1] or
+            other.first is not None):
+        print("FAIL")
+        return
+
+    empty = LinkedList()
+    sort(empty)
+    if empty.first is not None or empty.last is not None:
+        print("FAIL")
+    else:
+        print("OK")
+
+
 if __name__ == '__main__':
     test_insert_empty()
     test_insert_nonempty()
@@ -285,4 +676,8 @@ if __name__ == '__main__':
     test_delete_mid()
     test_delete_last()
     test_delete_solo()
-    test_insert_return()
\ No newline at end of file
+    test_insert_return()
+    test_index()
+    test_extend_iter()
+    test_splice_split()
+    test_sort_merge()
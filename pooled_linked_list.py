@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+from typing import Any, List, Optional
+
+
+# Spojovany seznam, jehoz uzly nejsou samostatne objekty, ale pozice
+# v predem alokovanych paralelnich polich (hodnoty, next, prev). Uzel je
+# tak urcen celym cislem (indexem), ktere slouzi jako odkaz na prvek
+# a je platne az do jeho smazani. Uvolnene pozice tvori volny seznam
+# (free list) zretezeny pres pole 'next' a znovu se pouziji pri dalsim
+# vkladani, takze dvojice insert/delete nic nealokuji a nezatezuji
+# garbage collector.
+
+
+NIL = -1   # index "zadneho" uzlu (obdoba None)
+
+
+class PooledLinkedList:
+    """Trida PooledLinkedList reprezentuje spojovany seznam nad polem
+    uzlu.
+
+    Atributy:
+        first       index prvniho uzlu seznamu (NIL, pokud je prazdny)
+        last        index posledniho uzlu seznamu
+        free        index prvni volne pozice (NIL, pokud zadna neni)
+        size        pocet prvku seznamu
+        values      hodnoty uzlu
+        next        index nasledujiciho uzlu pro kazdou pozici
+        prev        index predchazejiciho uzlu pro kazdou pozici
+        grown       pocet zvetseni poli (realokaci)
+    """
+
+    def __init__(self, capacity: int = 16) -> None:
+        self.first: int = NIL
+        self.last: int = NIL
+        self.free: int = NIL
+        self.size: int = 0
+        self.values: List[Any] = []
+        self.next: List[int] = []
+        self.prev: List[int] = []
+        self.grown: int = 0
+        _grow(self, max(1, capacity))
+
+
+def _grow(linked_list: PooledLinkedList, count: int) -> None:
+    """Prida 'count' novych volnych pozic."""
+    start = len(linked_list.values)
+    linked_list.values.extend([None] * count)
+    linked_list.prev.extend([NIL] * count)
+    linked_list.next.extend(range(start + 1, start + count + 1))
+    linked_list.next[-1] = linked_list.free
+    linked_list.free = start
+    linked_list.grown += 1
+
+
+def insert(linked_list: PooledLinkedList, value: Any) -> int:
+    """Metoda insert() vlozi na konec seznamu (za prvek last) novy uzel
+    s hodnotou value. Vraci index nove vlozeneho uzlu.
+    """
+    if linked_list.free == NIL:
+        _grow(linked_list, len(linked_list.values))
+    node = linked_list.free
+    linked_list.free = linked_list.next[node]
+
+    linked_list.values[node] = value
+    linked_list.next[node] = NIL
+    linked_list.prev[node] = linked_list.last
+    if linked_list.last == NIL:
+        linked_list.first = node
+    else:
+        linked_list.next[linked_list.last] = node
+    linked_list.last = node
+    linked_list.size += 1
+    return node
+
+
+def delete(linked_list: PooledLinkedList, node: int) -> None:
+    """Metoda delete() smaze uzel s indexem node a vrati jeho pozici do
+    volneho seznamu. Index node pak jiz nesmi byt pouzit.
+    """
+    next_, prev = linked_list.next, linked_list.prev
+    if prev[node] == NIL:
+        linked_list.first = next_[node]
+    else:
+        next_[prev[node]] = next_[node]
+    if next_[node] == NIL:
+        linked_list.last = prev[node]
+    else:
+        prev[next_[node]] = prev[node]
+
+    linked_list.values[node] = None
+    prev[node] = NIL
+    next_[node] = linked_list.free
+    linked_list.free = node
+    linked_list.size -= 1
+
+
+def get_value(linked_list: PooledLinkedList, node: int) -> Any:
+    """Metoda get_value() vraci hodnotu uzlu s indexem node."""
+    return linked_list.values[node]
+
+
+def search(linked_list: PooledLinkedList, value: Any) -> Optional[int]:
+    """Metoda search() vraci index prvniho uzlu s hodnotou value. Pokud se
+    hodnota v seznamu nenachazi, vraci None.
+    """
+    values, next_ = linked_list.values, linked_list.next
+    node = linked_list.first
+    while node != NIL:
+        if values[node] == value:
+            return node
+        node = next_[node]
+    return None
+
+
+def print_list(linked_list: PooledLinkedList) -> None:
+    """Metoda print_list() vypise seznam linked_list."""
+    node = linked_list.first
+    while node != NIL:
+        print(linked_list.values[node], end=" ")
+        node = linked_list.next[node]
+
+
+def to_list(linked_list: PooledLinkedList) -> List[Any]:
+    """Metoda to_list() vraci hodnoty seznamu jako pole."""
+    result = []
+    node = linked_list.first
+    while node != NIL:
+        result.append(linked_list.values[node])
+        node = linked_list.next[node]
+    return result
+
+
+# Testy implementace
+def test_insert() -> None:
+    print("Test 1. Vkladani a zvetsovani poli: ", end="")
+
+    list1 = PooledLinkedList(2)
+    nodes = [insert(list1, value) for value in range(5)]
+
+    if (to_list(list1) != list(range(5)) or list1.size != 5 or
+            [get_value(list1, node) for node in nodes] != list(range(5)) or
+            list1.prev[list1.first] != NIL or list1.next[list1.last] != NIL):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_delete_reuse() -> None:
+    print("Test 2. Mazani a znovupouziti pozic: ", end="")
+
+    list2 = PooledLinkedList(4)
+    nodes = [insert(list2, value) for value in range(4)]
+    delete(list2, nodes[0])
+    delete(list2, nodes[2])
+    delete(list2, nodes[3])
+
+    if to_list(list2) != [1] or not list2.first == nodes[1] == list2.last:
+        print("FAIL")
+        return
+
+    grown = list2.grown
+    reused = [insert(list2, value) for value in 'abc']
+    if (to_list(list2) != [1, 'a', 'b', 'c'] or list2.grown != grown or
+            sorted(reused) != sorted([nodes[0], nodes[2], nodes[3]])):
+        print("FAIL")
+        return
+
+    for node in [nodes[1]] + reused:
+        delete(list2, node)
+    if list2.first != NIL or list2.last != NIL or list2.size != 0:
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_search() -> None:
+    print("Test 3. Hledani v seznamu: ", end="")
+
+    list3 = PooledLinkedList()
+    nodes = [insert(list3, value) for value in (5, 7, 5)]
+
+    if search(list3, 5) != nodes[0] or search(list3, 6) is not None:
+        print("FAIL")
+        return
+    delete(list3, nodes[0])
+    if search(list3, 5) != nodes[2]:
+        print("FAIL")
+    else:
+        print("OK")
+
+
+if __name__ == '__main__':
+    test_insert()
+    test_delete_reuse()
+    test_search()
@@ -0,0 +1,418 @@
+#!/usr/bin/env python3
+import random
+from array import array
+from typing import Iterator, List, Optional
+
+
+# Binarni vyhledavaci a cerveno-cerny strom, jehoz uzly nejsou samostatne
+# objekty, ale pozice v paralelnich typovanych polich (array.array):
+# klic, levy a pravy potomek, rodic a barva. Uzel je urcen celym cislem
+# (indexem), ktere je platne az do jeho smazani. Uzel modulu
+# binary_search_tree nebo red_black_tree je objekt se slovnikem atributu
+# a zabira stovky bajtu, zde zabira 21 bajtu (klic 8, tri odkazy po 4
+# a barva 1) plus volne misto poli. Uvolnene pozice tvori volny seznam
+# zretezeny pres pole 'right' (jako v modulu pooled_linked_list), takze
+# dvojice insert/delete nic nealokuji.
+#
+# Klice jsou 64bitova cela cisla. Pozice 0 je zarazka NIL (jako
+# v Cormenove ucebnici): je vzdy cerna a stoji misto chybejiciho
+# potomka, takze vyvazovani po mazani nemusi chybejici uzly rozlisovat.
+#
+# Strom s red_black=True se chova jako red_black_tree.RedBlackTree (stejne
+# klice jdou doprava), s red_black=False jako nevyvazeny
+# binary_search_tree.BinarySearchTree (stejne klice jdou doleva).
+
+
+NIL = 0   # index zarazky, obdoba None
+
+
+class PooledTree:
+    """Trida PooledTree reprezentuje vyhledavaci strom nad poli uzlu.
+
+    Atributy:
+        red_black   True pro cerveno-cerny strom, False pro nevyvazeny
+                    binarni vyhledavaci strom
+        root        index korene (NIL, pokud je strom prazdny)
+        free        index prvni volne pozice (NIL, pokud zadna neni)
+        size        pocet uzlu stromu
+        keys        klice uzlu (typ 'q')
+        left        index leveho potomka pro kazdou pozici (typ 'i')
+        right       index praveho potomka, u volnych pozic dalsi volna
+                    pozice (typ 'i')
+        parent      index rodice pro kazdou pozici (typ 'i')
+        red         1 pro cerveny uzel, 0 pro cerny
+        grown       pocet zvetseni poli (realokaci)
+    """
+
+    def __init__(self, red_black: bool = True, capacity: int = 16) -> None:
+        self.red_black: bool = red_black
+        self.root: int = NIL
+        self.free: int = NIL
+        self.size: int = 0
+        self.keys: array = array('q', [0])
+        self.left: array = array('i', [NIL])
+        self.right: array = array('i', [NIL])
+        self.parent: array = array('i', [NIL])
+        self.red: bytearray = bytearray(1)
+        self.grown: int = 0
+        _grow(self, max(1, capacity))
+
+
+def _grow(tree: PooledTree, count: int) -> None:
+    """Prida 'count' novych volnych pozic."""
+    start = len(tree.keys)
+    tree.keys.frombytes(bytes(8 * count))
+    tree.left.frombytes(bytes(4 * count))
+    tree.parent.frombytes(bytes(4 * count))
+    tree.right.extend(range(start + 1, start + count + 1))
+    tree.right[-1] = tree.free
+    tree.red.extend(bytes(count))
+    tree.free = start
+    tree.grown += 1
+
+
+def _allocate(tree: PooledTree, key: int, parent: int) -> int:
+    if tree.free == NIL:
+        _grow(tree, len(tree.keys))
+    node = tree.free
+    tree.free = tree.right[node]
+    tree.keys[node] = key
+    tree.left[node] = tree.right[node] = NIL
+    tree.parent[node] = parent
+    tree.size += 1
+    return node
+
+
+def _release(tree: PooledTree, node: int) -> None:
+    tree.left[node] = tree.parent[node] = NIL
+    tree.red[node] = 0
+    tree.right[node] = tree.free
+    tree.free = node
+    tree.size -= 1
+
+
+def get_key(tree: PooledTree, node: int) -> int:
+    """Vraci klic uzlu s indexem 'node'."""
+    return tree.keys[node]
+
+
+def _rotate_left(tree: PooledTree, x: int) -> None:
+    left, right, parent = tree.left, tree.right, tree.parent
+    y = right[x]
+    right[x] = left[y]
+    if left[y] != NIL:
+        parent[left[y]] = x
+    parent[y] = parent[x]
+    if parent[x] == NIL:
+        tree.root = y
+    elif x == left[parent[x]]:
+        left[parent[x]] = y
+    else:
+        right[parent[x]] = y
+    left[y] = x
+    parent[x] = y
+
+
+def _rotate_right(tree: PooledTree, x: int) -> None:
+    left, right, parent = tree.left, tree.right, tree.parent
+    y = left[x]
+    left[x] = right[y]
+    if right[y] != NIL:
+        parent[right[y]] = x
+    parent[y] = parent[x]
+    if parent[x] == NIL:
+        tree.root = y
+    elif x == right[parent[x]]:
+        right[parent[x]] = y
+    else:
+        left[parent[x]] = y
+    right[y] = x
+    parent[x] = y
+
+
+def _insert_fix_up(tree: PooledTree, node: int) -> None:
+    left, parent, red = tree.left, tree.parent, tree.red
+    while red[parent[node]]:
+        p = parent[node]
+        pp = parent[p]
+        if p == left[pp]:
+            d = tree.right[pp]
+            if red[d]:
+                red[p] = red[d] = 0
+                red[pp] = 1
+                node = pp
+                continue
+            if node == tree.right[p]:
+                node, p = p, node
+                _rotate_left(tree, node)
+            red[p], red[pp] = 0, 1
+            _rotate_right(tree, pp)
+        else:
+            d = left[pp]
+            if red[d]:
+                red[p] = red[d] = 0
+                red[pp] = 1
+                node = pp
+                continue
+            if node == left[p]:
+                node, p = p, node
+                _rotate_right(tree, node)
+            red[p], red[pp] = 0, 1
+            _rotate_left(tree, pp)
+    red[tree.root] = 0
+
+
+def insert(tree: PooledTree, key: int) -> int:
+    """Vlozi novy uzel s klicem 'key' do stromu 'tree'. Cerveno-cerny
+    strom zustane vyvazeny. Vraci index nove vlozeneho uzlu.
+    """
+    keys, left, right = tree.keys, tree.left, tree.right
+    parent = NIL
+    node = tree.root
+    go_left = False
+    while node != NIL:
+        parent = node
+        if tree.red_black:
+            go_left = key < keys[node]
+        else:
+            go_left = not keys[node] < key
+        node = left[node] if go_left else right[node]
+
+    node = _allocate(tree, key, parent)
+    if parent == NIL:
+        tree.root = node
+    elif go_left:
+        tree.left[parent] = node
+    else:
+        tree.right[parent] = node
+    if tree.red_black:
+        tree.red[node] = 1
+        _insert_fix_up(tree, node)
+    return node
+
+
+def search(tree: PooledTree, key: int) -> Optional[int]:
+    """Vyhleda uzel s klicem 'key' a vrati jeho index. Pokud se klic ve
+    strome nenachazi, vraci None.
+    """
+    keys, left, right = tree.keys, tree.left, tree.right
+    node = tree.root
+    while node != NIL:
+        node_key = keys[node]
+        if node_key == key:
+            return node
+        node = right[node] if node_key < key else left[node]
+    return None
+
+
+def minimum(tree: PooledTree, node: int) -> int:
+    """Vraci index uzlu s nejmensim klicem v podstromu s korenem 'node'."""
+    left = tree.left
+    while left[node] != NIL:
+        node = left[node]
+    return node
+
+
+def _transplant(tree: PooledTree, u: int, v: int) -> None:
+    """Nahradi podstrom 'u' podstromem 'v'. Rodic se nastavi i zarazce,
+    aby ho vyvazovani po mazani mohlo precist.
+    """
+    parent = tree.parent
+    if parent[u] == NIL:
+        tree.root = v
+    elif u == tree.left[parent[u]]:
+        tree.left[parent[u]] = v
+    else:
+        tree.right[parent[u]] = v
+    parent[v] = parent[u]
+
+
+def _delete_fix_up(tree: PooledTree, x: int) -> None:
+    left, right, parent, red = tree.left, tree.right, tree.parent, tree.red
+    while x != tree.root and not red[x]:
+        p = parent[x]
+        if x == left[p]:
+            w = right[p]
+            if red[w]:
+                red[w], red[p] = 0, 1
+                _rotate_left(tree, p)
+                w = right[p]
+            if not red[left[w]] and not red[right[w]]:
+                red[w] = 1
+                x = p
+                continue
+            if not red[right[w]]:
+                red[left[w]], red[w] = 0, 1
+                _rotate_right(tree, w)
+                w = right[p]
+            red[w], red[p], red[right[w]] = red[p], 0, 0
+            _rotate_left(tree, p)
+        else:
+            w = left[p]
+            if red[w]:
+                red[w], red[p] = 0, 1
+                _rotate_right(tree, p)
+                w = left[p]
+            if not red[left[w]] and not red[right[w]]:
+                red[w] = 1
+                x = p
+                continue
+            if not red[left[w]]:
+                red[right[w]], red[w] = 0, 1
+                _rotate_left(tree, w)
+                w = left[p]
+            red[w], red[p], red[left[w]] = red[p], 0, 0
+            _rotate_right(tree, p)
+        x = tree.root
+    red[x] = 0
+
+
+def delete(tree: PooledTree, node: int) -> None:
+    """Smaze uzel s indexem 'node' a vrati jeho pozici do volneho
+    seznamu. Index 'node' pak jiz nesmi byt pouzit. Cerveno-cerny strom
+    zustane vyvazeny.
+    """
+    left, right, parent, red = tree.left, tree.right, tree.parent, tree.red
+    removed_red = red[node]
+    if left[node] == NIL:
+        x = right[node]
+        _transplant(tree, node, x)
+    elif right[node] == NIL:
+        x = left[node]
+        _transplant(tree, node, x)
+    else:
+        y = minimum(tree, right[node])
+        removed_red = red[y]
+        x = right[y]
+        if parent[y] == node:
+            parent[x] = y
+        else:
+            _transplant(tree, y, x)
+            right[y] = right[node]
+            parent[right[y]] = y
+        _transplant(tree, node, y)
+        left[y] = left[node]
+        parent[left[y]] = y
+        red[y] = red[node]
+    if tree.red_black and not removed_red:
+        _delete_fix_up(tree, x)
+    parent[NIL] = NIL
+    _release(tree, node)
+
+
+def keys_in_order(tree: PooledTree) -> Iterator[int]:
+    """Postupne vraci klice stromu v rostoucim poradi."""
+    keys, left, right = tree.keys, tree.left, tree.right
+    stack: List[int] = []
+    node = tree.root
+    while stack or node != NIL:
+        while node != NIL:
+            stack.append(node)
+            node = left[node]
+        node = stack.pop()
+        yield keys[node]
+        node = right[node]
+
+
+def height(tree: PooledTree) -> int:
+    """Vraci vysku stromu (prazdny strom ma vysku -1)."""
+    result = -1
+    level = [tree.root] if tree.root != NIL else []
+    while level:
+        result += 1
+        level = [child for node in level
+                 for child in (tree.left[node], tree.right[node])
+                 if child != NIL]
+    return result
+
+
+# Testy implementace
+def is_correct(tree: PooledTree) -> bool:
+    """Overi usporadani klicu, odkazy na rodice, pocet uzlu a u
+    cerveno-cerneho stromu i jeho vlastnosti (cerny koren, zadny cerveny
+    uzel s cervenym potomkem, stejna cerna vyska vsech cest).
+    """
+    keys, left, right = tree.keys, tree.left, tree.right
+    parent, red = tree.parent, tree.red
+    if tree.root != NIL and (parent[tree.root] != NIL or red[tree.root]):
+        return False
+    if red[NIL]:
+        return False
+    black_heights = set()
+    count = 0
+    stack = [(tree.root, 0)] if tree.root != NIL else []
+    while stack:
+        node, blacks = stack.pop()
+        count += 1
+        blacks += not red[node]
+        for child, is_left in (left[node], True), (right[node], False):
+            if child == NIL:
+                black_heights.add(blacks)
+                continue
+            if (parent[child] != node or (red[node] and red[child]) or
+                    (is_left and keys[node] < keys[child]) or
+                    (not is_left and keys[child] < keys[node])):
+                return False
+            stack.append((child, blacks))
+    return (count == tree.size and
+            (not tree.red_black or len(black_heights) <= 1))
+
+
+def test_insert_search() -> None:
+    print("Test 1. Vkladani a hledani: ", end="")
+
+    for red_black in True, False:
+        tree1 = PooledTree(red_black, capacity=2)
+        keys = [(key * 37) % 101 for key in range(101)]
+        nodes = [insert(tree1, key) for key in keys]
+
+        if (list(keys_in_order(tree1)) != list(range(101)) or
+                not is_correct(tree1) or tree1.grown < 2 or
+                [get_key(tree1, node) for node in nodes] != keys or
+                search(tree1, 50) != nodes[keys.index(50)] or
+                search(tree1, 101) is not None):
+            print("FAIL")
+            return
+
+    tree1 = PooledTree()
+    for key in range(1000):
+        insert(tree1, key)
+    print("OK" if is_correct(tree1) and height(tree1) <= 18 else "FAIL")
+
+
+def test_delete_reuse() -> None:
+    print("Test 2. Mazani a znovupouziti pozic: ", end="")
+
+    rng = random.Random(2)
+    for red_black in True, False:
+        tree2 = PooledTree(red_black)
+        expected: List[int] = []
+        for _ in range(3000):
+            key = rng.randrange(200)
+            node = search(tree2, key)
+            if node is None or rng.random() < 0.3:
+                insert(tree2, key)
+                expected.append(key)
+            else:
+                delete(tree2, node)
+                expected.remove(key)
+            if not is_correct(tree2):
+                print("FAIL")
+                return
+
+        grown = tree2.grown
+        for _ in range(tree2.size):
+            delete(tree2, tree2.root)
+        for key in range(len(expected)):
+            insert(tree2, key)
+        if (list(keys_in_order(tree2)) != list(range(len(expected))) or
+                tree2.grown != grown or not is_correct(tree2)):
+            print("FAIL")
+            return
+
+    print("OK")
+
+
+if __name__ == '__main__':
+    test_insert_search()
+    test_delete_reuse()
@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 import math
 from enum import Enum
-from typing import Any, Optional, TextIO, Tuple
+from typing import Any, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import binary_search_tree
 
 
 class Colors(Enum):
@@ -14,6 +16,7 @@ class Node:
 
     Atributy:
         key     klic daneho uzlu
+        data    data prirazena klici (volitelne, napr. pro hasovaci tabulku)
         color   muze nabyvat hodnoty 'red' a 'black'
         parent  reference na rodice uzlu
         left    reference na leveho potomka
@@ -22,6 +25,7 @@ class Node:
 
     def __init__(self) -> None:
         self.key: Any = 0
+        self.data: Any = None
         self.color: Colors = Colors.black
         self.parent: Optional[Node] = None
         self.left: Optional[Node] = None
@@ -34,10 +38,13 @@ class RedBlackTree:
 
     Atributy:
         root    reference na korenovy uzel typu Node
+        size    pocet uzlu vlozenych operaci insert a neodebranych
+                operaci delete
     """
 
     def __init__(self) -> None:
         self.root: Optional[Node] = None
+        self.size: int = 0
 
 
 def rotate_left(tree: RedBlackTree, rotation_root: Node) -> None:
@@ -122,9 +129,9 @@ def insert_fix_up(tree: RedBlackTree, node: Node) -> None:
     tree.root.color = Colors.black
 
 
-def insert(tree: RedBlackTree, key: Any) -> None:
+def insert(tree: RedBlackTree, key: Any) -> Node:
     """Vlozi novy uzel s klicem 'key' do stromu 'tree'. Operace zachova
-    korektni cerveno-cerny strom.
+    korektni cerveno-cerny strom. Vraci nove vlozeny uzel.
     """
     node = Node()
     node.key = key
@@ -148,6 +155,203 @@ def insert(tree: RedBlackTree, key: Any) -> None:
 
     node.color = Colors.red
     insert_fix_up(tree, node)
+    tree.size += 1
+    return node
+
+
+def _make_node(key: Any, size: int = 1) -> Node:
+    node = Node()
+    node.key = key
+    return node
+
+
+def from_sorted(keys: Iterable[Any], size: Optional[int] = None) -> RedBlackTree:
+    """Vytvori cerveno-cerny strom z rostouci posloupnosti klicu 'keys'
+    v case O(n), bez porovnavani klicu a bez ukladani posloupnosti do pole.
+
+    Je-li znamy pocet klicu (parametr 'size' nebo len(keys)), postavi se
+    dokonale vyvazeny strom funkci binary_search_tree.build_balanced().
+    Jeho listy lezi v poslednich dvou patrech, staci tedy obarvit uzly
+    nejhlubsiho patra cervene a ostatni cerne.
+
+    U obecneho iteratoru se strom postavi funkci
+    binary_search_tree.build_sorted() a vsechny uzly jsou cerne, takze
+    dokonale podstromy na prave hrane jsou korektni cerveno-cerne stromy
+    s cernou vyskou rovnou jejich vysce. Ty se pak od nejmensiho spoji
+    s uzly hrany: pri stejne cerne vysce se uzel hrany stane cernym
+    korenem obou stromu, jinak se jako cerveny uzel vlozi do prave hrany
+    vetsiho stromu nad cerny uzel se stejnou cernou vyskou, jakou ma
+    mensi strom. Vysledek je korektni cerveno-cerny strom, jen ne vzdy
+    dokonale vyvazeny.
+    """
+    tree = RedBlackTree()
+    size = binary_search_tree.sorted_size(keys, size)
+    if size is not None:
+        deepest = size.bit_length() - 1
+
+        def make_colored(key: Any, depth: int, count: int) -> Node:
+            node = _make_node(key)
+            if depth == deepest > 0:
+                node.color = Colors.red
+            return node
+
+        tree.root = binary_search_tree.build_balanced(
+            iter(keys), size, make_colored)
+        tree.size = size
+        return tree
+
+    spine, tree.size = binary_search_tree.build_sorted(keys, _make_node)
+    right, right_height = None, 0   # uz spojena cast a jeji cerna vyska
+    for node, level in reversed(spine):
+        left, left_height = node.left, level
+        node.right = None
+        if left_height == right_height:
+            node.right = right
+            if right is not None:
+                right.parent = node
+            right, right_height = node, right_height + 1
+            continue
+
+        assert left is not None
+        node.parent = left.parent = None
+        parent, below = left, left.right
+        for _ in range(left_height - right_height - 1):
+            parent, below = below, below.right  # type: ignore[union-attr]
+        node.color = Colors.red
+        node.left, node.right = below, right
+        for child in below, right:
+            if child is not None:
+                child.parent = node
+        parent.right = node
+        node.parent = parent
+        right, right_height = left, left_height
+
+    tree.root = right
+    if right is not None:
+        right.parent = None
+    return tree
+
+
+def transplant(tree: RedBlackTree, u: Node, v: Optional[Node]) -> None:
+    """Nahradi podstrom s korenem 'u' podstromem s korenem 'v'."""
+    if u.parent is None:
+        tree.root = v
+    elif u == u.parent.left:
+        u.parent.left = v
+    else:
+        u.parent.right = v
+    if v is not None:
+        v.parent = u.parent
+
+
+def minimum(node: Node) -> Node:
+    """Vraci uzel s nejmensim klicem v podstromu s korenem 'node'."""
+    while node.left is not None:
+        node = node.left
+    return node
+
+
+def _is_black(node: Optional[Node]) -> bool:
+    return node is None or node.color == Colors.black
+
+
+def delete_fix_up(tree: RedBlackTree, node: Optional[Node],
+                  parent: Optional[Node]) -> None:
+    """Obnovi vlastnosti cerveno-cerneho stromu po odebrani cerneho uzlu.
+    Uzel 'node' (muze byt None) nese prebytecnou cernou, 'parent' je jeho
+    rodic.
+    """
+    while node is not tree.root and _is_black(node):
+        assert parent is not None
+        if node is parent.left:
+            d = parent.right
+            assert d is not None
+            if d.color == Colors.red:
+                d.color = Colors.black
+                parent.color = Colors.red
+                rotate_left(tree, parent)
+                d = parent.right
+                assert d is not None
+            if _is_black(d.left) and _is_black(d.right):
+                d.color = Colors.red
+                node = parent
+                parent = node.parent
+            else:
+                if _is_black(d.right):
+                    assert d.left is not None
+                    d.left.color = Colors.black
+                    d.color = Colors.red
+                    rotate_right(tree, d)
+                    d = parent.right
+                    assert d is not None
+                d.color = parent.color
+                parent.color = Colors.black
+                assert d.right is not None
+                d.right.color = Colors.black
+                rotate_left(tree, parent)
+                node, parent = tree.root, None
+        else:
+            d = parent.left
+            assert d is not None
+            if d.color == Colors.red:
+                d.color = Colors.black
+                parent.color = Colors.red
+                rotate_right(tree, parent)
+                d = parent.left
+                assert d is not None
+            if _is_black(d.left) and _is_black(d.right):
+                d.color = Colors.red
+                node = parent
+                parent = node.parent
+            else:
+                if _is_black(d.left):
+                    assert d.right is not None
+                    d.right.color = Colors.black
+                    d.color = Colors.red
+                    rotate_left(tree, d)
+                    d = parent.left
+                    assert d is not None
+                d.color = parent.color
+                parent.color = Colors.black
+                assert d.left is not None
+                d.left.color = Colors.black
+                rotate_right(tree, parent)
+                node, parent = tree.root, None
+
+    if node is not None:
+        node.color = Colors.black
+
+
+def delete(tree: RedBlackTree, node: Node) -> None:
+    """Smaze uzel 'node' ze stromu 'tree'. Operace zachova korektni
+    cerveno-cerny strom.
+    """
+    removed_color = node.color
+    if node.left is None:
+        child, parent = node.right, node.parent
+        transplant(tree, node, node.right)
+    elif node.right is None:
+        child, parent = node.left, node.parent
+        transplant(tree, node, node.left)
+    else:
+        y = minimum(node.right)
+        removed_color = y.color
+        child = y.right
+        if y.parent is node:
+            parent = y
+        else:
+            parent = y.parent
+            transplant(tree, y, y.right)
+            y.right = node.right
+            y.right.parent = y
+        transplant(tree, node, y)
+        y.left = node.left
+        y.left.parent = y
+        y.color = node.color
+
+    if removed_color == Colors.black:
+        delete_fix_up(tree, child, parent)
+    tree.size -= 1
 
 
 def search_rec(node: Optional[Node], key: Any) -> Optional[Node]:
@@ -167,6 +371,46 @@ def search(tree: RedBlackTree, key: Any) -> Optional[Node]:
     return search_rec(tree.root, key)
 
 
+def successor(node: Node) -> Optional[Node]:
+    """Vraci uzel s nejblizsim vetsim klicem (None pro posledni uzel)."""
+    return binary_search_tree.successor(node)  # type: ignore
+
+
+def predecessor(node: Node) -> Optional[Node]:
+    """Vraci uzel s nejblizsim mensim klicem (None pro prvni uzel)."""
+    return binary_search_tree.predecessor(node)  # type: ignore
+
+
+def iter_forward(tree: RedBlackTree) -> Iterator[Node]:
+    """Postupne vraci uzly stromu od nejmensiho klice k nejvetsimu,
+    amortizovane O(1) na krok. Prave vydany uzel lze smazat funkci
+    delete().
+    """
+    return binary_search_tree.iter_forward(tree)  # type: ignore
+
+
+def iter_backward(tree: RedBlackTree) -> Iterator[Node]:
+    """Postupne vraci uzly stromu od nejvetsiho klice k nejmensimu."""
+    return binary_search_tree.iter_backward(tree)  # type: ignore
+
+
+def iter_range(tree: RedBlackTree, low: Any, high: Any) -> Iterator[Node]:
+    """Postupne vraci uzly s klici low <= klic < high v rostoucim poradi
+    v case O(log n + k) pro k vracenych uzlu.
+    """
+    return binary_search_tree.iter_range(tree, low, high)  # type: ignore
+
+
+def search_many(tree: RedBlackTree, keys: Iterable[Any]) -> List[Optional[Node]]:
+    """Vyhleda najednou vsechny klice neklesajici posloupnosti 'keys'
+    a vrati pole nalezenych uzlu (None pro klice, ktere ve strome
+    nejsou) ve stejnem poradi jako klice. Podle velikosti davky hleda
+    od korene, od mista predchoziho nalezu nebo slevanim s pruchodem
+    stromu (viz binary_search_tree.search_sorted()).
+    """
+    return binary_search_tree.search_sorted(tree.root, keys, tree.size)
+
+
 def black_height(node: Optional[Node]) -> int:
     if node is None:
         return 0
@@ -656,9 +900,142 @@ def test_is_correct_rb_tree() -> None:
         make_graph(tree, "correct.dot")
 
 
+def helper_test_delete(tree: RedBlackTree) -> bool:
+    keys = list(range(50))
+    for key in keys:
+        insert(tree, key)
+
+    for key in keys[::3] + keys[1::3] + keys[2::3]:
+        node = search(tree, key)
+        if node is None:
+            print("NOK - klic {} nebyl pred smazanim nalezen".format(key))
+            return False
+        delete(tree, node)
+        if search(tree, key) is not None:
+            print("NOK - klic {} zustal po smazani ve strome".format(key))
+            return False
+        if not is_correct_rb_tree(tree):
+            print("NOK - po smazani klice {} neni strom korektni"
+                  .format(key))
+            return False
+
+    if tree.root is not None or tree.size != 0:
+        print("NOK - po smazani vsech klicu neni strom prazdny")
+        return False
+
+    print("OK")
+    return True
+
+
+def test_delete() -> None:
+    print("Test 6. delete: ")
+
+    tree = RedBlackTree()
+
+    if not helper_test_delete(tree):
+        make_graph(tree, "delete.dot")
+
+
+def helper_test_from_sorted() -> bool:
+    for count in range(130):
+        for keys in iter(range(count)), range(count):
+            tree = from_sorted(keys)
+            if not is_correct_rb_tree(tree) or tree.size != count:
+                print("NOK - chybny cerveno-cerny strom z {} klicu"
+                      .format(count))
+                return False
+            for key in range(count):
+                node = search(tree, key)
+                if node is None or \
+                        (node.parent is None) != (node is tree.root):
+                    print("NOK - klic {} chybi nebo nema rodice".format(key))
+                    return False
+
+    print("OK")
+    return True
+
+
+def test_from_sorted() -> None:
+    print("Test 7. from_sorted: ", end='')
+
+    helper_test_from_sorted()
+
+
+def helper_test_iterators() -> bool:
+    tree = RedBlackTree()
+    keys = [(key * 37) % 101 for key in range(101)]
+    for key in keys:
+        insert(tree, key)
+
+    if ([node.key for node in iter_forward(tree)] != list(range(101)) or
+            [node.key for node in iter_backward(tree)] !=
+            list(range(100, -1, -1)) or
+            [node.key for node in iter_range(tree, 40, 45)] !=
+            list(range(40, 45))):
+        print("NOK - chybny pruchod v poradi klicu")
+        return False
+
+    node = search(tree, 50)
+    assert node is not None
+    after, before = successor(node), predecessor(node)
+    if after is None or after.key != 51 or before is None or before.key != 49:
+        print("NOK - chybny naslednik nebo predchudce")
+        return False
+
+    for node in iter_range(tree, 10, 90):
+        delete(tree, node)
+    if (not is_correct_rb_tree(tree) or
+            [node.key for node in iter_forward(tree)] !=
+            list(range(10)) + list(range(90, 101))):
+        print("NOK - chybne mazani behem pruchodu")
+        return False
+
+    print("OK")
+    return True
+
+
+def test_iterators() -> None:
+    print("Test 8. iteratory a rozsahy: ", end='')
+
+    helper_test_iterators()
+
+
+def helper_test_search_many() -> bool:
+    tree = RedBlackTree()
+    for key in range(0, 3000, 3):
+        insert(tree, key)
+
+    for keys in ([], [-1, 0, 3, 4, 2997, 3000], list(range(-10, 3010, 31)),
+                 list(range(-10, 3010, 7))):
+        nodes = search_many(tree, keys)
+        if [None if node is None else node.key for node in nodes] != \
+                [key if 0 <= key < 3000 and key % 3 == 0 else None
+                 for key in keys]:
+            print("NOK - chybne hromadne hledani {} klicu".format(len(keys)))
+            return False
+
+    try:
+        search_many(tree, [6, 3])
+    except ValueError:
+        print("OK")
+        return True
+    print("NOK - neserazene klice nevyvolaly ValueError")
+    return False
+
+
+def test_search_many() -> None:
+    print("Test 9. search_many: ", end='')
+
+    helper_test_search_many()
+
+
 if __name__ == '__main__':
     test_rotate_left()
     test_rotate_right()
     test_insert()
     test_search()
-    test_is_correct_rb_tree()
\ No newline at end of file
+    test_is_correct_rb_tree()
+    test_delete()
+    test_from_sorted()
+    test_iterators()
+    test_search_many()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+from typing import Any, List, Optional
+
+import linked_list
+
+
+# Samoorganizujici se spojovany seznam. Pri kazdem uspesnem hledani se
+# nalezeny uzel posune blize k zacatku seznamu podle zvolene strategie:
+#
+#   MOVE_TO_FRONT   presun na zacatek seznamu
+#   TRANSPOSE       vymena s predchudcem
+#   COUNT           razeni podle poctu pristupu (nejcastejsi vpredu)
+#   None            bez preusporadani (obycejny seznam)
+#
+# Pri nerovnomernem rozlozeni dotazu (napr. Zipfove) se casto hledane
+# hodnoty drzi u zacatku a prumerna delka prohledavani klesa. Seznam
+# pocita pristupy a prohledane uzly, aby bylo mozne strategie porovnat.
+# Index hodnot z modulu linked_list se s preusporadanim nekombinuje.
+
+
+MOVE_TO_FRONT = 'move_to_front'
+TRANSPOSE = 'transpose'
+COUNT = 'count'
+
+
+class CountedNode(linked_list.Node):
+    """Trida CountedNode rozsiruje uzel spojovaneho seznamu o pocet
+    pristupu.
+
+    Atributy:
+        value   reprezentuje ulozenou hodnotu/objekt
+        next    reference na nasledujici prvek v seznamu
+        prev    reference na predchazejici prvek v seznamu
+        count   pocet uspesnych hledani tohoto uzlu
+    """
+
+    def __init__(self, value: Any = None,
+                 prev: Optional[linked_list.Node] = None) -> None:
+        super().__init__(value, prev)
+        self.count: int = 0
+
+
+class SelfOrganizingList(linked_list.LinkedList):
+    """Trida SelfOrganizingList reprezentuje samoorganizujici se seznam.
+
+    Atributy:
+        first       reference na prvni prvek seznamu
+        last        reference na posledni prvek seznamu
+        policy      strategie preusporadani (MOVE_TO_FRONT, TRANSPOSE,
+                    COUNT nebo None)
+        accesses    pocet volani search()
+        cost        celkovy pocet uzlu prohledanych funkci search()
+    """
+
+    def __init__(self, policy: Optional[str] = MOVE_TO_FRONT) -> None:
+        super().__init__()
+        if policy not in (MOVE_TO_FRONT, TRANSPOSE, COUNT, None):
+            raise ValueError("neznama strategie {}".format(policy))
+        self.policy: Optional[str] = policy
+        self.accesses: int = 0
+        self.cost: int = 0
+
+
+def _unlink(slist: SelfOrganizingList, node: linked_list.Node) -> None:
+    if node.prev is None:
+        slist.first = node.next
+    else:
+        node.prev.next = node.next
+    if node.next is None:
+        slist.last = node.prev
+    else:
+        node.next.prev = node.prev
+
+
+def _link_before(slist: SelfOrganizingList, before: linked_list.Node,
+                 node: linked_list.Node) -> None:
+    node.prev = before.prev
+    node.next = before
+    if before.prev is None:
+        slist.first = node
+    else:
+        before.prev.next = node
+    before.prev = node
+
+
+def insert(slist: SelfOrganizingList, value: Any) -> CountedNode:
+    """Metoda insert() vlozi na konec seznamu novy uzel s hodnotou value.
+    Vraci nove vlozeny uzel.
+    """
+    node = CountedNode(value, slist.last)
+    if slist.last is None:
+        slist.first = node
+    else:
+        slist.last.next = node
+    slist.last = node
+    return node
+
+
+def delete(slist: SelfOrganizingList, node: CountedNode) -> None:
+    """Metoda delete() smaze uzel node ze seznamu."""
+    _unlink(slist, node)
+
+
+def search(slist: SelfOrganizingList, value: Any) -> Optional[CountedNode]:
+    """Metoda search() vraci prvni uzel s hodnotou value (None, pokud se
+    hodnota v seznamu nenachazi). Nalezeny uzel posune podle strategie
+    seznamu a zapocita pocet prohledanych uzlu.
+    """
+    slist.accesses += 1
+    steps = 0
+    node = slist.first
+    while node is not None:
+        steps += 1
+        if node.value == value:
+            break
+        node = node.next
+    slist.cost += steps
+    if node is None:
+        return None
+
+    assert isinstance(node, CountedNode)
+    node.count += 1
+    if slist.policy == MOVE_TO_FRONT and node.prev is not None:
+        assert slist.first is not None
+        _unlink(slist, node)
+        _link_before(slist, slist.first, node)
+    elif slist.policy == TRANSPOSE and node.prev is not None:
+        prev = node.prev
+        _unlink(slist, node)
+        _link_before(slist, prev, node)
+    elif slist.policy == COUNT:
+        before = node.prev
+        while (before is not None and
+               before.count < node.count):  # type: ignore[attr-defined]
+            before = before.prev
+        target = before.next if before is not None else slist.first
+        if target is not node:
+            assert target is not None
+            _unlink(slist, node)
+            _link_before(slist, target, node)
+    return node
+
+
+def average_cost(slist: SelfOrganizingList) -> float:
+    """Metoda average_cost() vraci prumerny pocet prohledanych uzlu na
+    jedno hledani.
+    """
+    return slist.cost / slist.accesses if slist.accesses else 0.0
+
+
+# Testy implementace
+def values(slist: SelfOrganizingList) -> List[Any]:
+    return list(linked_list.iter_forward(slist))
+
+
+def test_move_to_front() -> None:
+    print("Test 1. Presun na zacatek: ", end="")
+
+    list1 = SelfOrganizingList(MOVE_TO_FRONT)
+    for value in range(5):
+        insert(list1, value)
+    search(list1, 3)
+    search(list1, 4)
+
+    if (values(list1) != [4, 3, 0, 1, 2] or
+            list(linked_list.iter_backward(list1)) != [2, 1, 0, 3, 4] or
+            list1.cost != 9 or list1.accesses != 2):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_transpose() -> None:
+    print("Test 2. Vymena s predchudcem: ", end="")
+
+    list2 = SelfOrganizingList(TRANSPOSE)
+    for value in range(5):
+        insert(list2, value)
+    search(list2, 3)
+    search(list2, 3)
+    search(list2, 0)
+    search(list2, 7)
+
+    if (values(list2) != [0, 3, 1, 2, 4] or
+            list(linked_list.iter_backward(list2)) != [4, 2, 1, 3, 0] or
+            list2.cost != 4 + 3 + 1 + 5):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_count() -> None:
+    print("Test 3. Razeni podle poctu pristupu: ", end="")
+
+    list3 = SelfOrganizingList(COUNT)
+    for value in range(5):
+        insert(list3, value)
+    for value in 4, 2, 4, 2, 2, 1:
+        search(list3, value)
+
+    if (values(list3) != [2, 4, 1, 0, 3] or
+            list(linked_list.iter_backward(list3)) != [3, 0, 1, 4, 2]):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+if __name__ == '__main__':
+    test_move_to_front()
+    test_transpose()
+    test_count()
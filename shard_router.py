@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+import bisect
+import hashlib
+from multiprocessing import Pipe, Process
+from multiprocessing.connection import Connection
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from hash_table import (HashTable, get_hashtable, insert_hashtable,
+                        keys_hashtable, remove_hashtable, values_hashtable)
+from hash_table_bulk import bulk_load
+
+
+# Jedna logicka hasovaci tabulka rozdelena na nekolik shardu (HashTable),
+# z nichz kazdy bezi ve vlastnim procesu a komunikuje rourou (Pipe).
+#
+# Klice se na shardy rozdeluji konzistentnim hasovanim: kazdy shard ma na
+# kruhu 'replicas' virtualnich bodu a klic patri shardu, jehoz bod je na
+# kruhu nejblize za hashem klice. Po pridani ci odebrani shardu se tak
+# presouvaji jen klice z dotcenych useku kruhu (prumerne 1/N vsech klicu),
+# nikoli vsechny jako u rozdeleni key % N.
+
+
+Pair = Tuple[Any, Any]
+
+
+def ring_hash(value: Any) -> int:
+    """Vrati 64bitovy hash hodnoty 'value', ktery je stejny ve vsech
+    procesech (vestavena funkce hash() retezcu se mezi procesy lisi).
+    """
+    digest = hashlib.blake2b(repr(value).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def owner(points: Sequence[int], owners: Sequence[str], key: Any) -> str:
+    """Vrati jmeno shardu, kteremu na kruhu ('points', 'owners')
+    patri klic 'key'.
+    """
+    i = bisect.bisect(points, ring_hash(key))
+    return owners[i % len(owners)]
+
+
+def _serve(conn: Connection, name: str) -> None:
+    """Hlavni smycka procesu shardu. Prijima prikazy (nazev, argumenty...)
+    a na kazdy odpovi jednou zpravou ('ok', vysledek). Vyjimku vyvolanou
+    prikazem posle zpet jako ('error', vyjimka) a bezi dal.
+    """
+    table = HashTable()
+    while True:
+        command, *args = conn.recv()
+        try:
+            result, table = _execute(table, name, command, args)
+        except Exception as error:
+            try:
+                conn.send(('error', error))
+            except Exception:   # vyjimku nelze serializovat
+                conn.send(('error', RuntimeError(repr(error))))
+            continue
+        conn.send(('ok', result))
+        if command == 'stop':
+            conn.close()
+            return
+
+
+def _execute(table: HashTable, name: str, command: str,
+             args: List[Any]) -> Tuple[Any, HashTable]:
+    """Provede jeden prikaz shardu nad tabulkou 'table'. Vraci dvojici
+    (odpoved, tabulka shardu po provedeni prikazu).
+    """
+    if command == 'insert':
+        for key, data in args[0]:
+            insert_hashtable(table, key, data)
+        return None, table
+    if command == 'get':
+        return [get_hashtable(table, key) for key in args[0]], table
+    if command == 'remove':
+        for key in args[0]:
+            remove_hashtable(table, key)
+        return None, table
+    if command == 'split':
+        points, owners = args
+        kept: List[Pair] = []
+        moved: List[Pair] = []
+        for pair in zip(keys_hashtable(table), values_hashtable(table)):
+            if owner(points, owners, pair[0]) == name:
+                kept.append(pair)
+            else:
+                moved.append(pair)
+        if moved:
+            table = HashTable()
+            bulk_load(table, kept)
+        return moved, table
+    if command == 'items':
+        return list(zip(keys_hashtable(table), values_hashtable(table))), table
+    if command == 'stop':
+        return None, table
+    raise ValueError("neznamy prikaz {}".format(command))
+
+
+class Shard:
+    """Trida Shard reprezentuje proces s jednou hasovaci tabulkou.
+
+    Atributy:
+        name        jmeno shardu
+        process     proces, ve kterem shard bezi
+        conn        konec roury pro komunikaci s procesem
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.conn, child = Pipe()
+        self.process: Process = Process(target=_serve, args=(child, name),
+                                        daemon=True)
+        self.process.start()
+        child.close()
+
+
+class ShardRouter:
+    """Trida ShardRouter smeruje klice na shardy pomoci konzistentniho
+    hasovani.
+
+    Atributy:
+        replicas    pocet virtualnich bodu kazdeho shardu na kruhu
+        points      serazene body kruhu
+        owners      jmena shardu vlastnicich jednotlive body kruhu
+        shards      slovnik shardu podle jmena
+    """
+
+    def __init__(self, replicas: int = 64) -> None:
+        self.replicas: int = replicas
+        self.points: List[int] = []
+        self.owners: List[str] = []
+        self.shards: Dict[str, Shard] = {}
+
+
+def _reply(status: str, value: Any) -> Any:
+    if status == 'error':
+        raise value
+    return value
+
+
+def _call(shard: Shard, *message: Any) -> Any:
+    shard.conn.send(message)
+    return _reply(*shard.conn.recv())
+
+
+def _gather(router: ShardRouter, names: Iterable[str]) -> Dict[str, Any]:
+    """Prijme odpovedi shardu 'names' na prikazy odeslane najednou.
+    Chybu shardu vyvola az po prijeti vsech odpovedi, aby zadna nezustala
+    v roure.
+    """
+    replies = {name: router.shards[name].conn.recv() for name in names}
+    return {name: _reply(*reply) for name, reply in replies.items()}
+
+
+def _build_ring(router: ShardRouter) -> None:
+    ring = sorted((ring_hash("{}#{}".format(name, i)), name)
+                  for name in router.shards for i in range(router.replicas))
+    router.points = [point for point, _ in ring]
+    router.owners = [name for _, name in ring]
+
+
+def shard_for(router: ShardRouter, key: Any) -> Shard:
+    """Vrati shard, kteremu patri klic 'key'."""
+    if not router.shards:
+        raise KeyError("router nema zadny shard")
+    return router.shards[owner(router.points, router.owners, key)]
+
+
+def _group(router: ShardRouter,
+           items: Sequence[Any], key_of: Any) -> Dict[str, List[Any]]:
+    groups: Dict[str, List[Any]] = {}
+    for item in items:
+        groups.setdefault(shard_for(router, key_of(item)).name,
+                          []).append(item)
+    return groups
+
+
+def insert_many(router: ShardRouter, pairs: Sequence[Pair]) -> None:
+    """Vlozi dvojice (klic, data); kazdy shard dostane jednu zpravu."""
+    groups = _group(router, pairs, lambda pair: pair[0])
+    for name, group in groups.items():
+        router.shards[name].conn.send(('insert', group))
+    _gather(router, groups)
+
+
+def get_many(router: ShardRouter, keys: Sequence[Any]) -> List[Any]:
+    """Vrati hodnoty klicu 'keys' (None pro chybejici klice). Dotazy na
+    jednotlive shardy se odeslou najednou a zpracuji se soubezne.
+    """
+    groups = _group(router, list(enumerate(keys)), lambda item: item[1])
+    for name, group in groups.items():
+        router.shards[name].conn.send(('get', [key for _, key in group]))
+    replies = _gather(router, groups)
+    result: List[Any] = [None] * len(keys)
+    for name, group in groups.items():
+        for (i, _), value in zip(group, replies[name]):
+            result[i] = value
+    return result
+
+
+def insert(router: ShardRouter, key: Any, data: Any) -> None:
+    """Vlozi dvojici (key, data) do shardu, kteremu klic patri."""
+    _call(shard_for(router, key), 'insert', [(key, data)])
+
+
+def get(router: ShardRouter, key: Any) -> Optional[Any]:
+    """Vrati hodnotu klice 'key', nebo None, pokud se klic nenachazi."""
+    return _call(shard_for(router, key), 'get', [key])[0]
+
+
+def remove(router: ShardRouter, key: Any) -> None:
+    """Odstrani prvni vyskyt dvojice s klicem 'key'."""
+    _call(shard_for(router, key), 'remove', [key])
+
+
+def add_shard(router: ShardRouter, name: str) -> int:
+    """Spusti novy shard 'name' a presune na nej klice z useku kruhu,
+    ktere nove vlastni. Vraci pocet presunutych dvojic.
+    """
+    if name in router.shards:
+        raise ValueError("shard {} jiz existuje".format(name))
+    router.shards[name] = Shard(name)
+    if len(router.shards) == 1:
+        _build_ring(router)
+        return 0
+    old_owners = set(router.owners)
+    _build_ring(router)
+    for other in old_owners:
+        router.shards[other].conn.send(('split', router.points,
+                                        router.owners))
+    moved: List[Pair] = []
+    for part in _gather(router, old_owners).values():
+        moved.extend(part)
+    insert_many(router, moved)
+    return len(moved)
+
+
+def remove_shard(router: ShardRouter, name: str) -> int:
+    """Zastavi shard 'name' a jeho klice rozdeli mezi zbyvajici shardy.
+    Vraci pocet presunutych dvojic. Posledni neprazdny shard odebrat nelze,
+    router v tom pripade zustane beze zmeny.
+    """
+    shard = router.shards[name]
+    moved = _call(shard, 'items')
+    if moved and len(router.shards) == 1:
+        raise ValueError("nelze odebrat posledni neprazdny shard")
+    del router.shards[name]
+    _call(shard, 'stop')
+    shard.process.join()
+    _build_ring(router)
+    insert_many(router, moved)
+    return len(moved)
+
+
+def close(router: ShardRouter) -> None:
+    """Zastavi vsechny shardy routeru."""
+    for shard in router.shards.values():
+        _call(shard, 'stop')
+        shard.process.join()
+    router.shards.clear()
+    _build_ring(router)
+
+
+# Testy implementace
+
+def check_router(router: ShardRouter, keys: Sequence[int]) -> bool:
+    values = get_many(router, keys)
+    for key, value in zip(keys, values):
+        if value != -key:
+            print("NOK - klic {}: {} != {}".format(key, value, -key))
+            return False
+    for name, shard in router.shards.items():
+        for key, _ in _call(shard, 'items'):
+            if shard_for(router, key).name != name:
+                print("NOK - klic {} je na spatnem shardu {}"
+                      .format(key, name))
+                return False
+    return True
+
+
+def test_router() -> None:
+    print("Test 1. vkladani a hledani pres router: ", end="")
+    router = ShardRouter(replicas=32)
+    try:
+        for name in 'abc':
+            add_shard(router, name)
+        keys = list(range(0, 3000, 3))
+        insert_many(router, [(key, -key) for key in keys[1:]])
+        insert(router, keys[0], -keys[0])
+        if not check_router(router, keys):
+            return
+        if get(router, 1) is not None:
+            print("NOK - nalezen klic, ktery v tabulce neni")
+            return
+        remove(router, 3)
+        if get(router, 3) is not None:
+            print("NOK - odebrany klic 3 je stale v tabulce")
+            return
+        print("OK")
+    finally:
+        close(router)
+
+
+def test_large_keys() -> None:
+    print("Test 2. velke klice v jedinem shardu: ", end="")
+    router = ShardRouter(replicas=32)
+    try:
+        add_shard(router, 'a')
+        keys = [1000, 100000, 2 ** 40, 2 ** 70]
+        for key in keys:
+            insert(router, key, -key)
+        for key in keys:
+            if get(router, key) != -key:
+                print("NOK - klic {} nebyl nalezen".format(key))
+                return
+        if not check_router(router, keys):
+            return
+        try:
+            remove_shard(router, 'a')
+            print("NOK - odebran posledni neprazdny shard")
+            return
+        except ValueError:
+            pass
+        if not check_router(router, keys):
+            return
+        remove(router, 1000)
+        if get(router, 1000) is not None:
+            print("NOK - odebrany klic 1000 je stale v tabulce")
+            return
+        print("OK")
+    finally:
+        close(router)
+
+
+def test_errors() -> None:
+    print("Test 3. chyba prikazu v shardu: ", end="")
+    router = ShardRouter(replicas=32)
+    try:
+        add_shard(router, 'a')
+        keys = list(range(0, 300, 3))
+        insert_many(router, [(key, -key) for key in keys])
+        try:
+            insert(router, 'x', 1)
+            print("NOK - vlozeni klice 'x' nevyvolalo vyjimku")
+            return
+        except TypeError:
+            pass
+        try:
+            get_many(router, [0, 'x'])
+            print("NOK - hledani klice 'x' nevyvolalo vyjimku")
+            return
+        except TypeError:
+            pass
+        if not check_router(router, keys):
+            return
+        print("OK")
+    finally:
+        close(router)
+
+
+def test_rebalance() -> None:
+    print("Test 4. pridani a odebrani shardu: ", end="")
+    router = ShardRouter(replicas=32)
+    try:
+        for name in 'abc':
+            add_shard(router, name)
+        keys = list(range(3000))
+        insert_many(router, [(key, -key) for key in keys])
+        moved = add_shard(router, 'd')
+        if not 0 < moved < len(keys) / 2:
+            print("NOK - pri pridani shardu se presunulo {} z {} klicu"
+                  .format(moved, len(keys)))
+            return
+        if not check_router(router, keys):
+            return
+        moved = remove_shard(router, 'b')
+        if not 0 < moved < len(keys) / 2:
+            print("NOK - pri odebrani shardu se presunulo {} z {} klicu"
+                  .format(moved, len(keys)))
+            return
+        if not check_router(router, keys):
+            return
+        print("OK")
+    finally:
+        close(router)
+
+
+if __name__ == '__main__':
+    test_router()
+    test_large_keys()
+    test_errors()
+    test_rebalance()
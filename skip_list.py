@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+import random
+from typing import Any, Iterator, List, Optional, Tuple
+
+import linked_list
+
+
+# Preskakovaci seznam (skip list) jako serazena mapa klic -> hodnota.
+#
+# Nejnizsi uroven je obycejny obousmerne spojovany seznam z modulu
+# linked_list (reference next/prev, hodnota ve 'value'), takze na nej lze
+# pouzit napr. linked_list.print_list(). Kazdy uzel ma navic nahodne
+# vysokou "vez" doprednych referenci 'tower' pro vyssi urovne, uzel je na
+# urovni i s pravdepodobnosti 1/2 ** i. Hledani, vkladani i mazani tak
+# trvaji ocekavane O(log n). Zmena struktury se tyka jen sousedu na
+# jednotlivych urovnich (zadne rotace), proto se skip list snaze
+# upravuje pro soubezny pristup nez vyvazovany strom.
+
+
+MAX_LEVEL = 32
+
+
+class SkipNode(linked_list.Node):
+    """Trida SkipNode rozsiruje uzel spojovaneho seznamu o klic a vez
+    doprednych referenci.
+
+    Atributy:
+        key     klic uzlu, podle ktereho je seznam serazen
+        value   hodnota prirazena klici
+        next    reference na nasledujici uzel (uroven 0)
+        prev    reference na predchazejici uzel (uroven 0)
+        tower   tower[i] je reference na nasledujici uzel na urovni i + 1
+    """
+
+    def __init__(self, key: Any = None, value: Any = None,
+                 height: int = 0) -> None:
+        super().__init__(value)
+        self.key: Any = key
+        self.tower: List[Optional[SkipNode]] = [None] * height
+
+
+class SkipList:
+    """Trida SkipList reprezentuje preskakovaci seznam.
+
+    Atributy:
+        head    hlavicka (zarazka) s vezi plne vysky, head.next je prvni
+                uzel seznamu
+        first   reference na prvni uzel seznamu
+        last    reference na posledni uzel seznamu
+        level   nejvyssi pouzivana uroven
+        size    pocet uzlu
+        rng     generator nahodnych cisel pro vysky uzlu
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        self.head: SkipNode = SkipNode(height=MAX_LEVEL - 1)
+        self.first: Optional[SkipNode] = None
+        self.last: Optional[SkipNode] = None
+        self.level: int = 0
+        self.size: int = 0
+        self.rng: random.Random = random.Random(seed)
+
+
+def _forward(node: SkipNode, level: int) -> Optional[SkipNode]:
+    if level == 0:
+        return node.next  # type: ignore[return-value]
+    return node.tower[level - 1]
+
+
+def _set_forward(node: SkipNode, level: int,
+                 target: Optional[SkipNode]) -> None:
+    if level == 0:
+        node.next = target
+    else:
+        node.tower[level - 1] = target
+
+
+def _predecessors(skip_list: SkipList, key: Any) -> List[SkipNode]:
+    """Vrati pro kazdou uroven posledni uzel s klicem mensim nez 'key'
+    (pripadne hlavicku).
+    """
+    update = [skip_list.head] * (skip_list.level + 1)
+    node = skip_list.head
+    for level in range(skip_list.level, -1, -1):
+        following = _forward(node, level)
+        while following is not None and following.key < key:
+            node = following
+            following = _forward(node, level)
+        update[level] = node
+    return update
+
+
+def _random_height(skip_list: SkipList) -> int:
+    height = 0
+    while height < MAX_LEVEL - 1 and skip_list.rng.random() < 0.5:
+        height += 1
+    return height
+
+
+def search(skip_list: SkipList, key: Any) -> Optional[SkipNode]:
+    """Vyhleda uzel s klicem 'key'. Pokud se klic v seznamu nenachazi,
+    vraci None.
+    """
+    node = skip_list.head
+    for level in range(skip_list.level, -1, -1):
+        following = _forward(node, level)
+        while following is not None and following.key < key:
+            node = following
+            following = _forward(node, level)
+    candidate = node.next
+    if candidate is not None and candidate.key == key:  # type: ignore
+        return candidate  # type: ignore[return-value]
+    return None
+
+
+def insert(skip_list: SkipList, key: Any, value: Any = None) -> SkipNode:
+    """Vlozi do seznamu klic 'key' s hodnotou 'value'. Pokud seznam klic
+    jiz obsahuje, prepise jeho hodnotu. Vraci uzel s klicem 'key'.
+    """
+    update = _predecessors(skip_list, key)
+    candidate = _forward(update[0], 0)
+    if candidate is not None and candidate.key == key:
+        candidate.value = value
+        return candidate
+
+    height = _random_height(skip_list)
+    if height > skip_list.level:
+        update.extend([skip_list.head] * (height - skip_list.level))
+        skip_list.level = height
+
+    node = SkipNode(key, value, height)
+    prev = update[0]
+    node.prev = prev if prev is not skip_list.head else None
+    node.next = prev.next
+    prev.next = node
+    if node.next is None:
+        skip_list.last = node
+    else:
+        node.next.prev = node
+    skip_list.first = skip_list.head.next  # type: ignore[assignment]
+
+    for level in range(1, height + 1):
+        node.tower[level - 1] = _forward(update[level], level)
+        _set_forward(update[level], level, node)
+    skip_list.size += 1
+    return node
+
+
+def delete(skip_list: SkipList, key: Any) -> bool:
+    """Smaze uzel s klicem 'key'. Vraci True, pokud byl uzel smazan."""
+    update = _predecessors(skip_list, key)
+    node = _forward(update[0], 0)
+    if node is None or node.key != key:
+        return False
+
+    for level in range(len(node.tower) + 1):
+        _set_forward(update[level], level, _forward(node, level))
+    if node.next is None:
+        skip_list.last = node.prev  # type: ignore[assignment]
+    else:
+        node.next.prev = node.prev
+    skip_list.first = skip_list.head.next  # type: ignore[assignment]
+
+    while skip_list.level > 0 and skip_list.head.tower[skip_list.level - 1] \
+            is None:
+        skip_list.level -= 1
+    skip_list.size -= 1
+    return True
+
+
+def range_items(skip_list: SkipList, low: Any,
+                high: Any) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci dvojice (klic, hodnota) s klici low <= klic < high
+    v rostoucim poradi. Zacatek rozsahu najde v case O(log n).
+    """
+    node = _forward(_predecessors(skip_list, low)[0], 0)
+    while node is not None and node.key < high:
+        yield node.key, node.value
+        node = node.next  # type: ignore[assignment]
+
+
+def items(skip_list: SkipList) -> Iterator[Tuple[Any, Any]]:
+    """Postupne vraci vsechny dvojice (klic, hodnota) podle klicu."""
+    node = skip_list.first
+    while node is not None:
+        yield node.key, node.value
+        node = node.next  # type: ignore[assignment]
+
+
+# Testy implementace
+def test_insert_search() -> None:
+    print("Test 1. Vkladani a hledani: ", end="")
+
+    list1 = SkipList(seed=1)
+    keys = list(range(0, 1000, 2))
+    random.Random(2).shuffle(keys)
+    for key in keys:
+        insert(list1, key, -key)
+    insert(list1, 10, 'x')
+
+    if ([key for key, _ in items(list1)] != sorted(keys) or
+            list1.size != len(keys)):
+        print("FAIL")
+        return
+
+    node = search(list1, 10)
+    if (node is None or node.value != 'x' or search(list1, 11) is not None or
+            search(list1, 998) is not list1.last):
+        print("FAIL")
+        return
+
+    print("OK")
+
+
+def test_delete() -> None:
+    print("Test 2. Mazani: ", end="")
+
+    list2 = SkipList(seed=3)
+    for key in range(100):
+        insert(list2, key)
+    for key in range(0, 100, 3):
+        delete(list2, key)
+
+    expected = [key for key in range(100) if key % 3]
+    if ([key for key, _ in items(list2)] != expected or
+            delete(list2, 3) or search(list2, 3) is not None or
+            list2.first is None or list2.first.key != 1 or
+            list2.first.prev is not None):
+        print("FAIL")
+        return
+
+    for key in expected:
+        delete(list2, key)
+    if list2.first is not None or list2.last is not None or list2.level:
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_range() -> None:
+    print("Test 3. Rozsahovy dotaz: ", end="")
+
+    list3 = SkipList(seed=4)
+    for key in range(0, 100, 5):
+        insert(list3, key, str(key))
+
+    if (list(range_items(list3, 12, 31)) !=
+            [(15, '15'), (20, '20'), (25, '25'), (30, '30')] or
+            list(range_items(list3, 200, 300)) != [] or
+            list(range_items(list3, -5, 1)) != [(0, '0')]):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+if __name__ == '__main__':
+    test_insert_search()
+    test_delete()
+    test_range()
@@ -0,0 +1,416 @@
+#!/usr/bin/env python3
+import io
+import pickle
+import struct
+from typing import Any, BinaryIO, Iterator, List, Optional, Tuple, Union
+
+import binary_heap
+import binary_search_tree
+import red_black_tree
+from binary_heap import MinHeap
+from binary_search_tree import BinarySearchTree
+from bloom_filter import BloomFilter
+from hash_table import HashTable, SIZE
+from hash_table_bulk import link_pairs
+from red_black_tree import Colors, RedBlackTree
+
+
+# Binarni snimky datovych struktur pro rychle ulozeni a obnoveni.
+#
+# Snimek zacina hlavickou MAGIC, znackou struktury a poctem prvku. Prvky
+# nasleduji po blocich (nejvyse CHUNK prvku), kazdy blok je ntice sloupcu
+# (napr. klice, data) zapsana jednim volanim pickle a uvozena svou delkou;
+# prazdny blok delky 0 oznacuje konec. Diky tomu se zapisuji jen ploche
+# seznamy (zadna rekurze pres reference uzlu) a cteni muze probihat
+# proudove.
+#
+# Stromy se ukladaji v preorder poradi spolu s priznaky (ma leveho
+# potomka, ma praveho potomka, cerveny uzel), takze je lze obnovit
+# v linearnim case bez porovnavani klicu a bez vyvazovani. Halda se uklada
+# jako pole, hasovaci tabulka po polickach ve stejnem poradi retezcu.
+
+
+MAGIC = b'ADS1'
+CHUNK = 1 << 16
+
+KIND_HASHTABLE = 1
+KIND_RB_TREE = 2
+KIND_BST = 3
+KIND_HEAP = 4
+
+# verze rozlozeni pozic Bloomova filtru (1 = velikost libovolna, pozice
+# modulo velikost; 2 = velikost mocnina dvou, pozice maskou)
+BLOOM_VERSION = 2
+
+HAS_LEFT = 1
+HAS_RIGHT = 2
+IS_RED = 4
+
+BUCKET_LIST = 0
+BUCKET_TREE = 1
+
+TreeNode = Union[binary_search_tree.Node, red_black_tree.Node]
+
+
+def _write_header(stream: BinaryIO, kind: int, count: int) -> None:
+    stream.write(MAGIC + struct.pack('<BQ', kind, count))
+
+
+def _read_header(stream: BinaryIO, kind: int) -> int:
+    """Precte hlavicku snimku a vrati pocet prvku. Pokud snimek neni
+    ocekavaneho druhu 'kind', vyvola ValueError.
+    """
+    header = stream.read(len(MAGIC) + 9)
+    if len(header) != len(MAGIC) + 9 or header[:len(MAGIC)] != MAGIC:
+        raise ValueError("neplatny snimek")
+    stored_kind, count = struct.unpack('<BQ', header[len(MAGIC):])
+    if stored_kind != kind:
+        raise ValueError("snimek obsahuje jinou strukturu ({} != {})"
+                         .format(stored_kind, kind))
+    return count
+
+
+def _write_block(stream: BinaryIO, block: Tuple[Any, ...]) -> None:
+    data = pickle.dumps(block, pickle.HIGHEST_PROTOCOL)
+    stream.write(struct.pack('<I', len(data)))
+    stream.write(data)
+
+
+def _write_end(stream: BinaryIO) -> None:
+    stream.write(struct.pack('<I', 0))
+
+
+def _read_blocks(stream: BinaryIO) -> Iterator[Tuple[Any, ...]]:
+    """Postupne vraci bloky sloupcu az po koncovy prazdny blok."""
+    while True:
+        length = struct.unpack('<I', stream.read(4))[0]
+        if length == 0:
+            return
+        yield pickle.loads(stream.read(length))
+
+
+def _preorder(root: Optional[TreeNode]) -> Iterator[TreeNode]:
+    stack = [root] if root is not None else []
+    while stack:
+        node = stack.pop()
+        yield node
+        if node.right is not None:
+            stack.append(node.right)
+        if node.left is not None:
+            stack.append(node.left)
+
+
+def _write_tree(stream: BinaryIO, root: Optional[TreeNode],
+                with_data: bool) -> None:
+    """Zapise strom s korenem 'root' po blocich (priznaky, klice[, data])
+    v preorder poradi.
+    """
+    flags = bytearray()
+    keys: List[Any] = []
+    datas: List[Any] = []
+    for node in _preorder(root):
+        flag = 0
+        if node.left is not None:
+            flag |= HAS_LEFT
+        if node.right is not None:
+            flag |= HAS_RIGHT
+        if getattr(node, 'color', None) == Colors.red:
+            flag |= IS_RED
+        flags.append(flag)
+        keys.append(node.key)
+        if with_data:
+            datas.append(node.data)  # type: ignore[union-attr]
+        if len(keys) == CHUNK:
+            _write_block(stream, (bytes(flags), keys, datas))
+            flags, keys, datas = bytearray(), [], []
+    if keys:
+        _write_block(stream, (bytes(flags), keys, datas))
+    _write_end(stream)
+
+
+def _read_tree(stream: BinaryIO, make_node: Any) -> Optional[Any]:
+    """Obnovi strom z bloku zapsanych funkci _write_tree. Funkce
+    'make_node(flag, key, data)' vytvori novy uzel. Vraci koren stromu.
+    """
+    root = None
+    pending: List[Tuple[Any, bool]] = []   # (rodic, je levy potomek)
+    for flags, keys, datas in _read_blocks(stream):
+        for i, (flag, key) in enumerate(zip(flags, keys)):
+            node = make_node(flag, key, datas[i] if datas else None)
+            if root is None:
+                root = node
+            else:
+                parent, is_left = pending.pop()
+                node.parent = parent
+                if is_left:
+                    parent.left = node
+                else:
+                    parent.right = node
+            if flag & HAS_RIGHT:
+                pending.append((node, False))
+            if flag & HAS_LEFT:
+                pending.append((node, True))
+    return root
+
+
+def _make_rb_node(flag: int, key: Any, data: Any) -> red_black_tree.Node:
+    node = red_black_tree.Node()
+    node.key = key
+    node.data = data
+    node.color = Colors.red if flag & IS_RED else Colors.black
+    return node
+
+
+def _make_bst_node(flag: int, key: Any, data: Any) -> binary_search_tree.Node:
+    return binary_search_tree.Node(key)
+
+
+def _tree_size(root: Optional[TreeNode]) -> int:
+    return sum(1 for _ in _preorder(root))
+
+
+def dump_rb_tree(tree: RedBlackTree, stream: BinaryIO) -> None:
+    """Zapise cerveno-cerny strom 'tree' do binarniho proudu 'stream'."""
+    _write_header(stream, KIND_RB_TREE, _tree_size(tree.root))
+    _write_tree(stream, tree.root, with_data=True)
+
+
+def load_rb_tree(stream: BinaryIO) -> RedBlackTree:
+    """Nacte cerveno-cerny strom ze snimku v proudu 'stream'."""
+    tree = RedBlackTree()
+    tree.size = _read_header(stream, KIND_RB_TREE)
+    tree.root = _read_tree(stream, _make_rb_node)
+    return tree
+
+
+def dump_bst(tree: BinarySearchTree, stream: BinaryIO) -> None:
+    """Zapise binarni vyhledavaci strom 'tree' do proudu 'stream'.
+    Bloomuv filtr stromu se neuklada.
+    """
+    _write_header(stream, KIND_BST, _tree_size(tree.root))
+    _write_tree(stream, tree.root, with_data=False)
+
+
+def load_bst(stream: BinaryIO, avl: bool = False) -> BinarySearchTree:
+    """Nacte binarni vyhledavaci strom ze snimku v proudu 'stream'
+    a dopocita velikosti podstromu. Pri 'avl' True vrati strom v rezimu
+    AVL a dopocita i vysky uzlu (snimek AVL stromu zachovava jeho tvar,
+    takze zustava vyvazeny).
+    """
+    tree = BinarySearchTree(avl)
+    _read_header(stream, KIND_BST)
+    tree.root = _read_tree(stream, _make_bst_node)
+    # v obracenem preorder poradi jsou potomci pred rodici
+    for node in reversed(list(_preorder(tree.root))):
+        binary_search_tree.update_size(node)
+        if avl:
+            binary_search_tree.update_height(node)
+    return tree
+
+
+def dump_heap(heap: MinHeap, stream: BinaryIO) -> None:
+    """Zapise haldu 'heap' (cele pole 'array') do proudu 'stream'."""
+    _write_header(stream, KIND_HEAP, heap.size)
+    for i in range(0, len(heap.array), CHUNK):
+        _write_block(stream, (heap.array[i:i + CHUNK],))
+    _write_end(stream)
+
+
+def load_heap(stream: BinaryIO) -> MinHeap:
+    """Nacte haldu ze snimku v proudu 'stream'."""
+    heap = MinHeap()
+    heap.size = _read_header(stream, KIND_HEAP)
+    for block in _read_blocks(stream):
+        heap.array.extend(block[0])
+    return heap
+
+
+def _write_bloom(stream: BinaryIO, bloom: Optional[BloomFilter]) -> None:
+    if bloom is None:
+        stream.write(struct.pack('<B', 0))
+        return
+    counting = bloom.counters is not None
+    raw = bloom.counters if bloom.counters is not None else bloom.bits
+    assert raw is not None
+    stream.write(struct.pack('<BBQQQ', BLOOM_VERSION, counting, bloom.size,
+                             bloom.hash_count, len(raw)))
+    stream.write(raw)
+
+
+def _read_bloom(stream: BinaryIO) -> Optional[BloomFilter]:
+    version = struct.unpack('<B', stream.read(1))[0]
+    if not version:
+        return None
+    if version != BLOOM_VERSION:
+        raise ValueError("snimek obsahuje Bloomuv filtr jine verze ({} != {})"
+                         .format(version, BLOOM_VERSION))
+    counting, size, hash_count, length = struct.unpack('<BQQQ',
+                                                       stream.read(25))
+    bloom = BloomFilter(1, counting=bool(counting))
+    bloom.size = size
+    bloom.hash_count = hash_count
+    if counting:
+        bloom.counters = bytearray(stream.read(length))
+    else:
+        bloom.bits = bytearray(stream.read(length))
+    return bloom
+
+
+def dump_hashtable(hashtable: HashTable, stream: BinaryIO) -> None:
+    """Zapise hasovaci tabulku 'hashtable' do proudu 'stream'. Dvojice se
+    ukladaji po polickach tabulky ve stejnem poradi, v jakem jsou
+    zretezeny, stromova policka v preorder poradi.
+    """
+    _write_header(stream, KIND_HASHTABLE, SIZE)
+    for bucket, tree in zip(hashtable.table, hashtable.trees):
+        if tree is None:
+            stream.write(struct.pack('<BQ', BUCKET_LIST, bucket.size))
+            keys: List[Any] = []
+            datas: List[Any] = []
+            node = bucket.first
+            while node:
+                keys.append(node.pair.key)
+                datas.append(node.pair.data)
+                node = node.next
+                if len(keys) == CHUNK:
+                    _write_block(stream, (keys, datas))
+                    keys, datas = [], []
+            if keys:
+                _write_block(stream, (keys, datas))
+            _write_end(stream)
+        else:
+            stream.write(struct.pack('<BQ', BUCKET_TREE, tree.size))
+            _write_tree(stream, tree.root, with_data=True)
+    _write_bloom(stream, hashtable.bloom)
+
+
+def load_hashtable(stream: BinaryIO) -> HashTable:
+    """Nacte hasovaci tabulku ze snimku v proudu 'stream'. Klice se znovu
+    nehasuji, dvojice se jen zretezi do svych policek. Snimek musi
+    pochazet z tabulky stejne velikosti SIZE, jinak vyvola ValueError.
+    """
+    size = _read_header(stream, KIND_HASHTABLE)
+    if size != SIZE:
+        raise ValueError("snimek ma jinou velikost tabulky ({} != {})"
+                         .format(size, SIZE))
+    hashtable = HashTable()
+    for index in range(SIZE):
+        kind, count = struct.unpack('<BQ', stream.read(9))
+        if kind == BUCKET_LIST:
+            for keys, datas in _read_blocks(stream):
+                link_pairs(hashtable.table[index], list(zip(keys, datas)))
+        else:
+            tree = RedBlackTree()
+            tree.size = count
+            tree.root = _read_tree(stream, _make_rb_node)
+            hashtable.trees[index] = tree
+    hashtable.bloom = _read_bloom(stream)
+    return hashtable
+
+
+# Testy implementace
+
+def round_trip(dump: Any, load: Any, structure: Any) -> Any:
+    stream = io.BytesIO()
+    dump(structure, stream)
+    stream.seek(0)
+    return load(stream)
+
+
+def same_tree(a: Optional[TreeNode], b: Optional[TreeNode]) -> bool:
+    for x, y in zip(_preorder(a), _preorder(b)):
+        if (x.key != y.key or getattr(x, 'color', None) !=
+                getattr(y, 'color', None) or
+                (x.left is None) != (y.left is None) or
+                (x.right is None) != (y.right is None) or
+                (x.parent is None) != (y.parent is None)):
+            return False
+    return _tree_size(a) == _tree_size(b)
+
+
+def test_rb_tree() -> None:
+    print("Test 1. snimek cerveno-cerneho stromu: ", end="")
+    tree = RedBlackTree()
+    for key in range(1000):
+        red_black_tree.insert(tree, key * 7 % 1000).data = str(key)
+    loaded = round_trip(dump_rb_tree, load_rb_tree, tree)
+    if not same_tree(tree.root, loaded.root) or loaded.size != tree.size:
+        print("NOK - obnoveny strom se lisi od puvodniho")
+        return
+    if not red_black_tree.is_correct_rb_tree(loaded):
+        print("NOK - obnoveny strom neni korektni cerveno-cerny strom")
+        return
+    node = red_black_tree.search(loaded, 14)
+    if node is None or node.data != '2':
+        print("NOK - obnoveny strom ztratil data uzlu")
+        return
+    empty = round_trip(dump_rb_tree, load_rb_tree, RedBlackTree())
+    if empty.root is not None:
+        print("NOK - obnoveny prazdny strom neni prazdny")
+        return
+    print("OK")
+
+
+def test_bst() -> None:
+    print("Test 2. snimek binarniho vyhledavaciho stromu: ", end="")
+    tree = binary_search_tree.init_test_tree()
+    loaded = round_trip(dump_bst, load_bst, tree)
+    if (not same_tree(tree.root, loaded.root) or
+            not binary_search_tree.is_correct_bst(loaded)):
+        print("NOK - obnoveny strom se lisi od puvodniho")
+        return
+    avl_tree = BinarySearchTree(avl=True)
+    for key in range(100):
+        binary_search_tree.insert(avl_tree, key)
+    loaded = round_trip(dump_bst, lambda s: load_bst(s, avl=True), avl_tree)
+    if (not same_tree(avl_tree.root, loaded.root) or not loaded.avl or
+            not binary_search_tree.is_avl_balanced(loaded)):
+        print("NOK - obnoveny AVL strom nema spravne vysky")
+        return
+    print("OK")
+
+
+def test_heap() -> None:
+    print("Test 3. snimek haldy: ", end="")
+    heap = binary_heap.build_heap([8, 4, 9, 3, 2, 7, 5, 0, 6, 1])
+    loaded = round_trip(dump_heap, load_heap, heap)
+    if loaded.size != heap.size or loaded.array != heap.array:
+        print("NOK - obnovena halda {} != {}".format(loaded.array,
+                                                       heap.array))
+        return
+    print("OK")
+
+
+def test_hashtable() -> None:
+    import hash_table
+
+    print("Test 4. snimek hasovaci tabulky: ", end="")
+    t = HashTable()
+    hash_table.set_bloom_filter(t, BloomFilter(100, 0.01, counting=True))
+    for key in list(range(20)) + [SIZE * i for i in range(30)]:
+        hash_table.insert_hashtable(t, key, -key)
+    loaded = round_trip(dump_hashtable, load_hashtable, t)
+    if (hash_table.keys_hashtable(loaded) != hash_table.keys_hashtable(t) or
+            hash_table.values_hashtable(loaded) !=
+            hash_table.values_hashtable(t)):
+        print("NOK - obnovena tabulka se lisi od puvodni")
+        return
+    if (loaded.trees[0] is None or
+            hash_table.get_hashtable(loaded, SIZE * 29) != -SIZE * 29):
+        print("NOK - chybne obnovene stromove policko")
+        return
+    if loaded.bloom is None or hash_table.get_hashtable(loaded, 21) is not None:
+        print("NOK - chybne obnoveny Bloomuv filtr")
+        return
+    hash_table.remove_hashtable(loaded, 5)
+    if hash_table.get_hashtable(loaded, 5) is not None:
+        print("NOK - z obnovene tabulky nelze odebirat")
+        return
+    print("OK")
+
+
+if __name__ == '__main__':
+    test_rb_tree()
+    test_bst()
+    test_heap()
+    test_hashtable()
@@ -0,0 +1,392 @@
+#!/usr/bin/env python3
+import random
+from typing import Any, Iterator, List, Optional, Tuple
+
+import binary_search_tree
+from binary_search_tree import BinarySearchTree
+
+
+# Treap: binarni vyhledavaci strom, jehoz uzly maji navic nahodnou
+# prioritu a podle priorit tvori haldu (rodic ma vyssi prioritu nez jeho
+# potomci). Tvar stromu je pak stejny, jako kdyby se klice vkladaly
+# v nahodnem poradi, takze ocekavana hloubka je O(log n) bez ohledu na
+# poradi vkladani.
+#
+# Zakladem jsou dve operace s ocekavanou slozitosti O(log n):
+#   split(klic)   rozdeli strom na klice < klic a klice >= klic
+#   join(a, b)    spoji stromy, pokud jsou vsechny klice a mensi nez b
+# Nad nimi jsou postaveny vkladani, mazani, mazani rozsahu a hromadne
+# mnozinove operace sjednoceni a rozdil. Treap je mnozina, kazdy klic je
+# v nem nejvyse jednou. Operace prevezmou uzly vstupnich stromu, vstupni
+# stromy tedy po operaci uz nepouzivejte.
+#
+# Treap je potomkem BinarySearchTree, takze na nej lze pouzit funkce
+# search(), height(), select(), rank(), iter_range(), is_correct_bst()
+# nebo make_graph() z modulu binary_search_tree (vsechny operace
+# udrzuji velikosti podstromu). Vkladat a mazat je ale treba funkcemi tohoto modulu.
+
+
+class TreapNode(binary_search_tree.Node):
+    """Trida TreapNode rozsiruje uzel binarniho vyhledavaciho stromu
+    o prioritu.
+
+    Atributy:
+        key         klic daneho uzlu
+        priority    nahodna priorita, rodic ma vzdy vyssi prioritu
+        size        pocet uzlu podstromu s korenem v uzlu
+        parent      reference na rodice uzlu (None, pokud neexistuje)
+        left        reference na leveho potomka (None, pokud neexistuje)
+        right       reference na praveho potomka (None, pokud neexistuje)
+    """
+
+    def __init__(self, key: Any = None, priority: float = 0.0) -> None:
+        super().__init__(key)
+        self.priority: float = priority
+
+
+class Treap(BinarySearchTree):
+    """Trida Treap reprezentuje treap (mnozinu klicu).
+
+    Atributy:
+        root    reference na korenovy uzel typu TreapNode
+        rng     generator nahodnych priorit
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        super().__init__()
+        self.rng: random.Random = random.Random(seed)
+
+
+def _with_root(treap: Treap, root: Optional[TreapNode]) -> Treap:
+    """Vytvori novy treap s korenem 'root' sdilejici generator priorit."""
+    result = Treap()
+    result.rng = treap.rng
+    result.root = root
+    if root is not None:
+        root.parent = None
+    return result
+
+
+def _set_children(node: TreapNode, left: Optional[TreapNode],
+                  right: Optional[TreapNode]) -> TreapNode:
+    node.left, node.right = left, right
+    if left is not None:
+        left.parent = node
+    if right is not None:
+        right.parent = node
+    binary_search_tree.update_size(node)
+    return node
+
+
+def _update_sizes(path: List[TreapNode]) -> None:
+    """Prepocita velikosti podstromu uzlu cesty 'path' zadane od korene."""
+    for node in reversed(path):
+        binary_search_tree.update_size(node)
+
+
+def _split3(node: Optional[TreapNode], key: Any) -> Tuple[
+        Optional[TreapNode], Optional[TreapNode], Optional[TreapNode]]:
+    """Rozdeli podstrom na (klice < key, uzel s klicem key, klice > key).
+    Uzel s klicem key je vracen bez potomku (None, pokud neexistuje).
+    Prochazi jedinou cestu od korene, bez rekurze.
+    """
+    less_head, greater_head = TreapNode(), TreapNode()
+    less, greater = less_head, greater_head   # kam se pripojuje dal
+    less_path: List[TreapNode] = []
+    greater_path: List[TreapNode] = []
+    equal = None
+    while node is not None:
+        if node.key < key:
+            less.right = node
+            node.parent = less
+            less = node
+            less_path.append(node)
+            node = node.right  # type: ignore[assignment]
+        elif key < node.key:
+            greater.left = node
+            node.parent = greater
+            greater = node
+            greater_path.append(node)
+            node = node.left  # type: ignore[assignment]
+        else:
+            equal = node
+            node = None
+    less.right = equal.left if equal is not None else None
+    greater.left = equal.right if equal is not None else None
+    if less.right is not None:
+        less.right.parent = less
+    if greater.left is not None:
+        greater.left.parent = greater
+    if equal is not None:
+        equal.left = equal.right = equal.parent = None
+        equal.size = 1
+    _update_sizes(less_path)
+    _update_sizes(greater_path)
+
+    roots = less_head.right, greater_head.left
+    for root in roots:
+        if root is not None:
+            root.parent = None
+    return roots[0], equal, roots[1]  # type: ignore[return-value]
+
+
+def _join(left: Optional[TreapNode],
+          right: Optional[TreapNode]) -> Optional[TreapNode]:
+    """Spoji dva podstromy, vsechny klice 'left' musi byt mensi nez
+    klice 'right'. Prochazi pravou hranu 'left' a levou hranu 'right'.
+    """
+    head = TreapNode()
+    parent, to_left = head, True
+    path: List[TreapNode] = []
+    while left is not None and right is not None:
+        if left.priority > right.priority:
+            node, left = left, left.right  # type: ignore[assignment]
+            next_left = False
+        else:
+            node, right = right, right.left  # type: ignore[assignment]
+            next_left = True
+        if to_left:
+            parent.left = node
+        else:
+            parent.right = node
+        node.parent = parent
+        parent, to_left = node, next_left
+        path.append(node)
+    rest = left if left is not None else right
+    if to_left:
+        parent.left = rest
+    else:
+        parent.right = rest
+    if rest is not None:
+        rest.parent = parent
+    _update_sizes(path)
+
+    root = head.left
+    if root is not None:
+        root.parent = None
+    return root  # type: ignore[return-value]
+
+
+def split(treap: Treap, key: Any) -> Tuple[Treap, Treap]:
+    """Rozdeli treap na dva: s klici mensimi nez 'key' a s klici vetsimi
+    nebo rovnymi 'key'. Ocekavana slozitost je O(log n).
+    """
+    less, equal, greater = _split3(treap.root, key)  # type: ignore[arg-type]
+    treap.root = None
+    return _with_root(treap, less), _with_root(treap, _join(equal, greater))
+
+
+def join(left: Treap, right: Treap) -> Treap:
+    """Spoji dva treapy, vsechny klice 'left' musi byt mensi nez klice
+    'right'. Ocekavana slozitost je O(log n).
+    """
+    root = _join(left.root, right.root)  # type: ignore[arg-type]
+    left.root = right.root = None
+    return _with_root(left, root)
+
+
+def search(treap: Treap, key: Any) -> Optional[TreapNode]:
+    """Vyhleda uzel s klicem 'key'. Pokud se klic v treapu nenachazi,
+    vraci None.
+    """
+    return binary_search_tree.search(treap, key)  # type: ignore[return-value]
+
+
+def insert(treap: Treap, key: Any) -> TreapNode:
+    """Vlozi klic 'key' do treapu. Pokud jiz v treapu je, nic nemeni.
+    Vraci uzel s klicem 'key'.
+    """
+    priority = treap.rng.random()
+    parent = None
+    node = treap.root
+    # sestup az k mistu, kam novy uzel patri podle priority; rozdeluje
+    # se pak jen podstrom pod nim
+    while node is not None and node.priority > priority:  # type: ignore
+        if node.key == key:
+            return node  # type: ignore[return-value]
+        parent = node
+        node = node.left if key < node.key else node.right
+
+    less, equal, greater = _split3(node, key)  # type: ignore[arg-type]
+    if equal is None:
+        equal = _set_children(TreapNode(key, priority), less, greater)
+        subtree = equal
+        ancestor = parent
+        while ancestor is not None:
+            ancestor.size += 1
+            ancestor = ancestor.parent
+    else:
+        subtree = _join(_join(less, equal), greater)  # type: ignore
+    if parent is None:
+        treap.root = subtree
+    elif key < parent.key:
+        parent.left = subtree
+    else:
+        parent.right = subtree
+    subtree.parent = parent
+    return equal
+
+
+def delete(treap: Treap, node: TreapNode) -> None:
+    """Smaze uzel 'node' z treapu tak, ze ho nahradi spojenim jeho
+    podstromu.
+    """
+    merged = _join(node.left, node.right)  # type: ignore[arg-type]
+    binary_search_tree.transplant(treap, node, merged)
+    ancestor = node.parent
+    while ancestor is not None:
+        ancestor.size -= 1
+        ancestor = ancestor.parent
+    node.left = node.right = node.parent = None
+    node.size = 1
+
+
+def delete_range(treap: Treap, low: Any, high: Any) -> Treap:
+    """Odebere z treapu vsechny klice low <= klic < high a vrati je jako
+    novy treap. Ocekavana slozitost je O(log n) nezavisle na poctu
+    odebranych klicu.
+    """
+    left, rest = split(treap, low)
+    middle, right = split(rest, high)
+    treap.root = join(left, right).root
+    return middle
+
+
+def _union(a: Optional[TreapNode],
+           b: Optional[TreapNode]) -> Optional[TreapNode]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority < b.priority:
+        a, b = b, a
+    less, _, greater = _split3(b, a.key)
+    return _set_children(a, _union(a.left, less),  # type: ignore[arg-type]
+                         _union(a.right, greater))  # type: ignore[arg-type]
+
+
+def _difference(a: Optional[TreapNode],
+                b: Optional[TreapNode]) -> Optional[TreapNode]:
+    if a is None or b is None:
+        return a
+    less, _, greater = _split3(a, b.key)
+    return _join(_difference(less, b.left),  # type: ignore[arg-type]
+                 _difference(greater, b.right))  # type: ignore[arg-type]
+
+
+def union(a: Treap, b: Treap) -> Treap:
+    """Vrati sjednoceni treapu 'a' a 'b'. Pro velikosti m <= n trva
+    ocekavane O(m log(n / m + 1)), tedy mnohem mene nez vkladani prvku
+    jednoho po druhem.
+    """
+    root = _union(a.root, b.root)  # type: ignore[arg-type]
+    a.root = b.root = None
+    return _with_root(a, root)
+
+
+def difference(a: Treap, b: Treap) -> Treap:
+    """Vrati treap s klici 'a', ktere nejsou v 'b'."""
+    root = _difference(a.root, b.root)  # type: ignore[arg-type]
+    a.root = b.root = None
+    return _with_root(a, root)
+
+
+def keys(treap: Treap) -> Iterator[Any]:
+    """Postupne vraci klice treapu v rostoucim poradi."""
+    for node in binary_search_tree.iter_forward(treap):
+        yield node.key
+
+
+def from_keys(key_iterable: Any, seed: Optional[int] = None) -> Treap:
+    """Vytvori treap vlozenim vsech klicu z 'key_iterable'."""
+    treap = Treap(seed)
+    for key in key_iterable:
+        insert(treap, key)
+    return treap
+
+
+# Testy implementace
+def is_correct_treap(treap: Treap) -> bool:
+    """Overi vlastnost vyhledavaciho stromu, haldy priorit, rodicu
+    a velikosti podstromu.
+    """
+    if not binary_search_tree.is_correct_bst(treap) or \
+            not binary_search_tree.has_correct_sizes(treap):
+        return False
+    stack = [treap.root] if treap.root is not None else []
+    if stack and treap.root.parent is not None:
+        return False
+    while stack:
+        node = stack.pop()
+        for child in node.left, node.right:
+            if child is not None:
+                if child.parent is not node or \
+                        child.priority > node.priority:
+                    return False
+                stack.append(child)
+    return True
+
+
+def test_insert_delete() -> None:
+    print("Test 1. Vkladani a mazani: ", end="")
+
+    treap1 = from_keys(range(1000), seed=1)
+    insert(treap1, 500)
+    if (list(keys(treap1)) != list(range(1000)) or
+            not is_correct_treap(treap1) or
+            binary_search_tree.height(treap1) > 40):
+        print("FAIL")
+        return
+
+    for key in range(0, 1000, 2):
+        node = search(treap1, key)
+        assert node is not None
+        delete(treap1, node)
+    if (list(keys(treap1)) != list(range(1, 1000, 2)) or
+            not is_correct_treap(treap1) or search(treap1, 2) is not None):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_split_join() -> None:
+    print("Test 2. Rozdeleni, spojeni a mazani rozsahu: ", end="")
+
+    left, right = split(from_keys(range(100), seed=2), 40)
+    if (list(keys(left)) != list(range(40)) or
+            list(keys(right)) != list(range(40, 100)) or
+            not is_correct_treap(left) or not is_correct_treap(right)):
+        print("FAIL")
+        return
+
+    joined = join(left, right)
+    removed = delete_range(joined, 10, 90)
+    if (list(keys(joined)) != list(range(10)) + list(range(90, 100)) or
+            list(keys(removed)) != list(range(10, 90)) or
+            not is_correct_treap(joined) or not is_correct_treap(removed)):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_union_difference() -> None:
+    print("Test 3. Sjednoceni a rozdil: ", end="")
+
+    rng = random.Random(3)
+    a_keys = set(rng.sample(range(2000), 700))
+    b_keys = set(rng.sample(range(2000), 900))
+    both = union(from_keys(a_keys, 4), from_keys(b_keys, 5))
+    rest = difference(from_keys(a_keys, 6), from_keys(b_keys, 7))
+
+    if (list(keys(both)) != sorted(a_keys | b_keys) or
+            list(keys(rest)) != sorted(a_keys - b_keys) or
+            not is_correct_treap(both) or not is_correct_treap(rest)):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+if __name__ == '__main__':
+    test_insert_delete()
+    test_split_join()
+    test_union_difference()
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+
+from typing import Any, List, Optional
+
+
+# Rozbaleny (unrolled) spojovany seznam: kazdy uzel nese misto jedne
+# hodnoty cely usek (pole) az 'capacity' hodnot. Pruchod seznamem tak
+# misto jednoho skoku po referenci na prvek prochazi souvisla pole
+# a hledani v useku probiha vestavenou operaci nad polem.
+#
+# Uzly se pri vkladani doprostred plneho useku rozdeli napul a pri
+# poklesu pod polovinu kapacity se slouci se sousedem (nebo si od nej
+# prvky vypujci). Protoze se pritom hodnoty presouvaji mezi useky,
+# odkazuje se na konkretni prvek pres objekt Handle, ktery zustava
+# platny az do smazani prvku.
+
+
+CAPACITY = 64
+
+
+class Chunk:
+    """Trida Chunk reprezentuje jeden uzel rozbaleneho seznamu.
+
+    Atributy:
+        values      pole hodnot useku
+        handles     pole odkazu Handle k hodnotam (None, pokud k hodnote
+                    zatim nikdo odkaz nepotreboval)
+        next        reference na nasledujici usek
+        prev        reference na predchazejici usek
+    """
+
+    def __init__(self) -> None:
+        self.values: List[Any] = []
+        self.handles: List[Optional[Handle]] = []
+        self.next: Optional[Chunk] = None
+        self.prev: Optional[Chunk] = None
+
+
+class Handle:
+    """Trida Handle je stabilni odkaz na jeden prvek seznamu.
+
+    Atributy:
+        chunk       usek, ve kterem prvek prave lezi (None po smazani)
+    """
+
+    def __init__(self, chunk: Chunk) -> None:
+        self.chunk: Optional[Chunk] = chunk
+
+
+class UnrolledLinkedList:
+    """Trida UnrolledLinkedList reprezentuje rozbaleny spojovany seznam.
+
+    Atributy:
+        first       reference na prvni usek seznamu
+        last        reference na posledni usek seznamu
+        size        pocet prvku seznamu
+        capacity    maximalni pocet hodnot v jednom useku
+    """
+
+    def __init__(self, capacity: int = CAPACITY) -> None:
+        self.first: Optional[Chunk] = None
+        self.last: Optional[Chunk] = None
+        self.size: int = 0
+        self.capacity: int = max(2, capacity)
+
+
+def _link_after(linked_list: UnrolledLinkedList,
+                chunk: Optional[Chunk]) -> Chunk:
+    """Vlozi za usek 'chunk' (None = na zacatek) novy prazdny usek."""
+    new = Chunk()
+    new.prev = chunk
+    new.next = chunk.next if chunk is not None else linked_list.first
+    if new.prev is None:
+        linked_list.first = new
+    else:
+        new.prev.next = new
+    if new.next is None:
+        linked_list.last = new
+    else:
+        new.next.prev = new
+    return new
+
+
+def _unlink(linked_list: UnrolledLinkedList, chunk: Chunk) -> None:
+    if chunk.prev is None:
+        linked_list.first = chunk.next
+    else:
+        chunk.prev.next = chunk.next
+    if chunk.next is None:
+        linked_list.last = chunk.prev
+    else:
+        chunk.next.prev = chunk.prev
+
+
+def _move(source: Chunk, start: int, stop: int, target: Chunk) -> None:
+    """Presune hodnoty source[start:stop] na konec useku 'target'."""
+    for handle in source.handles[start:stop]:
+        if handle is not None:
+            handle.chunk = target
+    target.values.extend(source.values[start:stop])
+    target.handles.extend(source.handles[start:stop])
+    del source.values[start:stop]
+    del source.handles[start:stop]
+
+
+def _handle_at(chunk: Chunk, i: int) -> Handle:
+    handle = chunk.handles[i]
+    if handle is None:
+        handle = chunk.handles[i] = Handle(chunk)
+    return handle
+
+
+def _position(handle: Handle) -> int:
+    if handle.chunk is None:
+        raise ValueError("prvek byl ze seznamu smazan")
+    return handle.chunk.handles.index(handle)
+
+
+def append(linked_list: UnrolledLinkedList, value: Any) -> None:
+    """Metoda append() vlozi hodnotu value na konec seznamu v case O(1)."""
+    chunk = linked_list.last
+    if chunk is None or len(chunk.values) >= linked_list.capacity:
+        chunk = _link_after(linked_list, linked_list.last)
+    chunk.values.append(value)
+    chunk.handles.append(None)
+    linked_list.size += 1
+
+
+def insert(linked_list: UnrolledLinkedList, value: Any) -> Handle:
+    """Metoda insert() vlozi hodnotu value na konec seznamu. Vraci odkaz
+    na nove vlozeny prvek.
+    """
+    append(linked_list, value)
+    assert linked_list.last is not None
+    return _handle_at(linked_list.last, len(linked_list.last.values) - 1)
+
+
+def insert_after(linked_list: UnrolledLinkedList, handle: Handle,
+                 value: Any) -> Handle:
+    """Metoda insert_after() vlozi hodnotu value za prvek 'handle'.
+    Plny usek se pritom rozdeli na dve poloviny. Vraci odkaz na nove
+    vlozeny prvek.
+    """
+    chunk = handle.chunk
+    i = _position(handle) + 1
+    assert chunk is not None
+    if len(chunk.values) >= linked_list.capacity:
+        half = len(chunk.values) // 2
+        new = _link_after(linked_list, chunk)
+        _move(chunk, half, len(chunk.values), new)
+        if i > half:
+            chunk, i = new, i - half
+    chunk.values.insert(i, value)
+    chunk.handles.insert(i, None)
+    linked_list.size += 1
+    return _handle_at(chunk, i)
+
+
+def get_value(handle: Handle) -> Any:
+    """Metoda get_value() vraci hodnotu prvku 'handle'."""
+    assert handle.chunk is not None
+    return handle.chunk.values[_position(handle)]
+
+
+def delete(linked_list: UnrolledLinkedList, handle: Handle) -> None:
+    """Metoda delete() smaze prvek 'handle' ze seznamu. Klesne-li pocet
+    hodnot useku pod polovinu kapacity, slouci se usek s naslednikem,
+    nebo si od nej prvky vypujci.
+    """
+    chunk = handle.chunk
+    i = _position(handle)
+    assert chunk is not None
+    del chunk.values[i]
+    del chunk.handles[i]
+    handle.chunk = None
+    linked_list.size -= 1
+
+    half = linked_list.capacity // 2
+    if not chunk.values:
+        _unlink(linked_list, chunk)
+        return
+    following = chunk.next
+    if len(chunk.values) >= half or following is None:
+        return
+    if len(chunk.values) + len(following.values) <= linked_list.capacity:
+        _move(following, 0, len(following.values), chunk)
+        _unlink(linked_list, following)
+    else:
+        _move(following, 0, half - len(chunk.values), chunk)
+
+
+def search(linked_list: UnrolledLinkedList, value: Any) -> Optional[Handle]:
+    """Metoda search() vraci odkaz na prvni vyskyt hodnoty value
+    v seznamu. Pokud se hodnota v seznamu nenachazi, vraci None.
+    """
+    chunk = linked_list.first
+    while chunk:
+        if value in chunk.values:
+            return _handle_at(chunk, chunk.values.index(value))
+        chunk = chunk.next
+    return None
+
+
+def print_list(linked_list: UnrolledLinkedList) -> None:
+    """Metoda print_list() vypise seznam linked_list."""
+    chunk = linked_list.first
+    while chunk:
+        if chunk.values:
+            print(" ".join(map(str, chunk.values)), end=" ")
+        chunk = chunk.next
+
+
+def to_list(linked_list: UnrolledLinkedList) -> List[Any]:
+    """Metoda to_list() vraci hodnoty seznamu jako pole."""
+    result: List[Any] = []
+    chunk = linked_list.first
+    while chunk:
+        result.extend(chunk.values)
+        chunk = chunk.next
+    return result
+
+
+# Testy implementace
+def test_append() -> None:
+    print("Test 1. Vkladani na konec seznamu: ", end="")
+
+    list1 = UnrolledLinkedList(4)
+    for value in range(10):
+        append(list1, value)
+
+    if (to_list(list1) != list(range(10)) or list1.size != 10 or
+            list1.first is None or len(list1.first.values) != 4):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_insert_after() -> None:
+    print("Test 2. Vkladani za prvek s rozdelenim useku: ", end="")
+
+    list2 = UnrolledLinkedList(4)
+    handles = [insert(list2, value) for value in range(4)]
+    new = insert_after(list2, handles[0], 'a')
+    insert_after(list2, handles[3], 'b')
+
+    if (to_list(list2) != [0, 'a', 1, 2, 3, 'b'] or
+            get_value(new) != 'a' or
+            [get_value(h) for h in handles] != [0, 1, 2, 3] or
+            list2.first is list2.last):
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_delete() -> None:
+    print("Test 3. Mazani pres odkaz se sloucenim useku: ", end="")
+
+    list3 = UnrolledLinkedList(4)
+    handles = [insert(list3, value) for value in range(12)]
+    for i in 1, 2, 5, 6, 0, 11:
+        delete(list3, handles[i])
+
+    expected = [3, 4, 7, 8, 9, 10]
+    chunk = list3.first
+    while chunk and chunk.next:
+        if len(chunk.values) < list3.capacity // 2:
+            print("FAIL")
+            return
+        chunk = chunk.next
+
+    if (to_list(list3) != expected or list3.size != len(expected) or
+            [get_value(handles[v]) for v in expected] != expected):
+        print("FAIL")
+        return
+
+    for value in expected:
+        delete(list3, handles[value])
+
+    if list3.first is not None or list3.last is not None:
+        print("FAIL")
+    else:
+        print("OK")
+
+
+def test_search() -> None:
+    print("Test 4. Hledani v seznamu: ", end="")
+
+    list4 = UnrolledLinkedList(4)
+    for value in range(10):
+        append(list4, value)
+
+    handle = search(list4, 6)
+    if (handle is None or get_value(handle) != 6 or
+            search(list4, 10) is not None):
+        print("FAIL")
+        return
+
+    delete(list4, handle)
+    if search(list4, 6) is not None or to_list(list4)[6] != 7:
+        print("FAIL")
+    else:
+        print("OK")
+
+
+if __name__ == '__main__':
+    test_append()
+    test_insert_after()
+    test_delete()
+    test_search()